@@ -598,6 +598,7 @@ INSTALLED_APPS = (
     'course_creators',
     'student',  # misleading name due to sharing with lms
     'openedx.core.djangoapps.course_groups',  # not used in cms (yet), but tests run
+    'openedx.core.djangoapps.course_overviews',  # invalidated by course_published in cms
     'xblock_config',
 
     # Tracking
@@ -4,6 +4,9 @@ Middleware to serve assets.
 
 import logging
 
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden
 )
@@ -22,6 +25,62 @@ from xmodule.exceptions import NotFoundError
 
 log = logging.getLogger(__name__)
 
+# Whether a user may see a course's locked assets, cached per (user, course) so
+# that a page with many locked assets checks enrollment once. A course id
+# partial (no run) gets an entry of its own. Entries are deleted when any of the
+# user's enrollments in the course change; the timeout bounds how long bulk
+# updates, which send no signals, can go unnoticed.
+ENROLLMENT_CHECK_CACHE_KEY = u"contentserver.enrolled.{user_id}.{org}.{course}.{run}"
+ENROLLMENT_CHECK_CACHE_TIMEOUT = 5 * 60
+
+
+def _enrollment_check_cache_key(user_id, course_key, partial=False):
+    """
+    Returns the enrollment check cache key for the user and course key, or for
+    the course key's partial (all runs of the course) if partial is True.
+
+    The key is built from the course key's parts, so that deprecated and new-style
+    keys for the same course share it.
+    """
+    return ENROLLMENT_CHECK_CACHE_KEY.format(
+        user_id=user_id,
+        org=course_key.org,
+        course=course_key.course,
+        run='' if partial else course_key.run,
+    )
+
+
+def is_enrolled_for_assets(user, course_key):
+    """
+    Returns whether the user is enrolled in the course that owns course_key's
+    assets, consulting the enrollment check cache first.
+
+    Deprecated (run-less) course keys match an enrollment in any run of the course.
+    """
+    partial = not course_key.run
+    cache_key = _enrollment_check_cache_key(user.id, course_key, partial)
+    is_enrolled = cache.get(cache_key)
+    if is_enrolled is None:
+        if partial:
+            is_enrolled = CourseEnrollment.is_enrolled_by_partial(user, course_key)
+        else:
+            is_enrolled = CourseEnrollment.is_enrolled(user, course_key)
+        cache.set(cache_key, is_enrolled, ENROLLMENT_CHECK_CACHE_TIMEOUT)
+    return is_enrolled
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_enrollment_check(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the cached enrollment checks covering a saved or deleted enrollment.
+    """
+    course_key = instance.course_id
+    cache.delete_many([
+        _enrollment_check_cache_key(instance.user_id, course_key),
+        _enrollment_check_cache_key(instance.user_id, course_key, partial=True),
+    ])
+
 
 class StaticContentServer(object):
     def process_request(self, request):
@@ -64,15 +123,8 @@ class StaticContentServer(object):
             if getattr(content, "locked", False):
                 if not hasattr(request, "user") or not request.user.is_authenticated():
                     return HttpResponseForbidden('Unauthorized')
-                if not request.user.is_staff:
-                    if getattr(loc, 'deprecated', False) and not CourseEnrollment.is_enrolled_by_partial(
-                        request.user, loc.course_key
-                    ):
-                        return HttpResponseForbidden('Unauthorized')
-                    if not getattr(loc, 'deprecated', False) and not CourseEnrollment.is_enrolled(
-                        request.user, loc.course_key
-                    ):
-                        return HttpResponseForbidden('Unauthorized')
+                if not request.user.is_staff and not is_enrolled_for_assets(request.user, loc.course_key):
+                    return HttpResponseForbidden('Unauthorized')
 
             # convert over the DB persistent last modified timestamp to a HTTP compatible
             # timestamp, so we can simply compare the strings
@@ -5,9 +5,11 @@ import copy
 import ddt
 import logging
 import unittest
+from mock import patch
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import Client
 from django.test.utils import override_settings
 
@@ -42,6 +44,7 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         self.staff_pwd = super(ContentStoreToyCourseTest, self).setUp()
         self.staff_usr = self.user
         self.non_staff_usr, self.non_staff_pwd = self.create_non_staff_user()
+        cache.clear()
 
         self.client = Client()
         self.contentstore = contentstore()
@@ -101,6 +104,27 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         resp = self.client.get(self.url_locked)
         self.assertEqual(resp.status_code, 200)
 
+    def test_locked_asset_enrollment_check_cached(self):
+        """
+        Test that the enrollment check for locked assets is made once per course,
+        and made again when the user's enrollment changes.
+        """
+        CourseEnrollment.enroll(self.non_staff_usr, self.course_key)
+        self.client.login(username=self.non_staff_usr, password=self.non_staff_pwd)
+
+        with patch.object(
+            CourseEnrollment, 'is_enrolled_by_partial', wraps=CourseEnrollment.is_enrolled_by_partial
+        ) as mock_check:
+            for _ in range(2):
+                resp = self.client.get(self.url_locked)
+                self.assertEqual(resp.status_code, 200)
+            self.assertEqual(mock_check.call_count, 1)
+
+            CourseEnrollment.unenroll(self.non_staff_usr, self.course_key)
+            resp = self.client.get(self.url_locked)
+            self.assertEqual(resp.status_code, 403)
+            self.assertEqual(mock_check.call_count, 2)
+
     def test_locked_asset_staff(self):
         """
         Test that locked assets behave appropriately in case user is staff.
@@ -15,6 +15,7 @@ import hashlib
 import json
 import logging
 from pytz import UTC
+import threading
 import uuid
 from collections import defaultdict
 import dogstats_wrapper as dog_stats_api
@@ -28,6 +29,7 @@ from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db import models, IntegrityError, transaction
 from django.db.models import Count
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
@@ -51,6 +53,7 @@ from functools import total_ordering
 
 from certificates.models import GeneratedCertificate
 from course_modes.models import CourseMode
+from openedx.core.djangoapps.course_overviews.models import CourseOverview
 
 from ratelimitbackend import admin
 
@@ -1061,11 +1064,8 @@ class CourseEnrollment(models.Model):
 
         `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_key)
-            return record.is_active
-        except cls.DoesNotExist:
-            return False
+        record = UserAccessContext.for_user(user).enrollment(course_key)
+        return record is not None and record.is_active
 
     @classmethod
     def is_enrolled_by_partial(cls, user, course_id_partial):
@@ -1107,11 +1107,10 @@ class CourseEnrollment(models.Model):
             and is_active is whether the enrollment is active.
         Returns (None, None) if the courseenrollment record does not exist.
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_id)
-            return (record.mode, record.is_active)
-        except cls.DoesNotExist:
+        record = UserAccessContext.for_user(user).enrollment(course_id)
+        if record is None:
             return (None, None)
+        return (record.mode, record.is_active)
 
     @classmethod
     def enrollments_for_user(cls, user):
@@ -1199,6 +1198,16 @@ class CourseEnrollment(models.Model):
     def course(self):
         return modulestore().get_course(self.course_id)
 
+    @property
+    def course_overview(self):
+        """
+        Returns a CourseOverview of this enrollment's course (None if the course
+        no longer exists), fetched once per enrollment object.
+        """
+        if not hasattr(self, '_course_overview'):
+            self._course_overview = CourseOverview.get_from_id(self.course_id)
+        return self._course_overview
+
 
 class CourseEnrollmentAllowed(models.Model):
     """
@@ -1267,6 +1276,108 @@ class CourseAccessRole(models.Model):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
 
+# Number of slots in _ACCESS_CONTEXT_GENERATIONS.
+ACCESS_CONTEXT_GENERATION_SLOTS = 4096
+
+# Generations of the CourseAccessRole and CourseEnrollment rows of users, by
+# user id modulo ACCESS_CONTEXT_GENERATION_SLOTS.  A slot is bumped whenever a
+# row of one of its users is written, through whichever user object, which makes
+# every UserAccessContext built for those users stale.  Users that share a slot
+# only cost each other extra reloads.
+_ACCESS_CONTEXT_GENERATIONS = [0] * ACCESS_CONTEXT_GENERATION_SLOTS
+_ACCESS_CONTEXT_GENERATIONS_LOCK = threading.Lock()
+
+
+def _access_context_generation(user_id):
+    """
+    Return the current generation of the access rows of the user with user_id.
+    """
+    if user_id is None:
+        return 0
+    return _ACCESS_CONTEXT_GENERATIONS[user_id % ACCESS_CONTEXT_GENERATION_SLOTS]
+
+
+class UserAccessContext(object):
+    """
+    The CourseAccessRole and CourseEnrollment rows of one user, each loaded with
+    a single query the first time they are needed.
+
+    The context is attached to the user object it was built for (normally
+    request.user), so every role and enrollment check made with that object
+    during a request shares it. Writes to either table in this process make it
+    stale, whichever user object they are made with: see
+    invalidate_user_access_context below.
+    """
+    def __init__(self, user):
+        self.user = user
+        self.generation = _access_context_generation(user.id)
+        self._roles = None
+        self._enrollments = None
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Return the context attached to user, creating it if needed or if the
+        user's roles or enrollments have been written since it was created.
+        """
+        # pylint: disable=protected-access
+        context = getattr(user, '_access_context', None)
+        if context is None or context.generation != _access_context_generation(user.id):
+            context = user._access_context = cls(user)
+        return context
+
+    @classmethod
+    def invalidate(cls, user):
+        """
+        Drop the context attached to user, so the next check reloads it.
+        """
+        if hasattr(user, '_access_context'):
+            del user._access_context  # pylint: disable=protected-access
+
+    def has_role(self, role, course_id, org):
+        """
+        Return whether the user holds the role with the specified role, course_id, and org
+        """
+        if self._roles is None:
+            # Stored as tuples, rather than django models, to make membership checks cheap
+            self._roles = frozenset(
+                (access_role.role, access_role.course_id, access_role.org)
+                for access_role in CourseAccessRole.objects.filter(user=self.user)
+            ) if self.user.id is not None else frozenset()
+        return (role, course_id, org) in self._roles
+
+    def enrollment(self, course_key):
+        """
+        Return the user's CourseEnrollment (active or not) in course_key, or None.
+        """
+        if self._enrollments is None:
+            self._enrollments = dict(
+                (_course_id_db_value(enrollment.course_id), enrollment)
+                for enrollment in CourseEnrollment.objects.filter(user=self.user)
+            ) if self.user.id is not None else {}
+        return self._enrollments.get(_course_id_db_value(course_key))
+
+
+def _course_id_db_value(course_key):
+    """
+    Return the string a course_id lookup for course_key compares against in the database.
+    """
+    return CourseEnrollment._meta.get_field('course_id').get_prep_value(course_key)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_user_access_context(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Make the access contexts of the user a saved or deleted row belongs to stale.
+    """
+    if instance.user_id is not None:
+        with _ACCESS_CONTEXT_GENERATIONS_LOCK:
+            _ACCESS_CONTEXT_GENERATIONS[instance.user_id % ACCESS_CONTEXT_GENERATION_SLOTS] += 1
+
+
 class CourseAccessRoleAdmin(admin.ModelAdmin):
     raw_id_fields = ("user",)
 
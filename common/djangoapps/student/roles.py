@@ -7,31 +7,10 @@ from abc import ABCMeta, abstractmethod
 
 from django.contrib.auth.models import User
 
-from student.models import CourseAccessRole
+from student.models import CourseAccessRole, UserAccessContext
 from xmodule_django.models import CourseKeyField
 
 
-class RoleCache(object):
-    """
-    A cache of the CourseAccessRoles held by a particular user
-    """
-    def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
-        )
-
-    def has_role(self, role, course_id, org):
-        """
-        Return whether this RoleCache contains a role with the specified role, course_id, and org
-        """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
-
-
 class AccessRole(object):
     """
     Object representing a role with particular access to a resource
@@ -114,13 +93,7 @@ class RoleBase(AccessRole):
         if not (user.is_authenticated() and user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(user, '_roles'):
-            # Cache a list of tuples identifying the particular roles that a user has
-            # Stored as tuples, rather than django models, to make it cheaper to construct objects for comparison
-            user._roles = RoleCache(user)
-
-        return user._roles.has_role(self._role_name, self.course_key, self.org)
+        return UserAccessContext.for_user(user).has_role(self._role_name, self.course_key, self.org)
 
     def add_users(self, *users):
         """
@@ -133,8 +106,7 @@ class RoleBase(AccessRole):
             if user.is_authenticated and user.is_active and not self.has_user(user):
                 entry = CourseAccessRole(user=user, role=self._role_name, course_id=self.course_key, org=self.org)
                 entry.save()
-                if hasattr(user, '_roles'):
-                    del user._roles
+                UserAccessContext.invalidate(user)
 
     def remove_users(self, *users):
         """
@@ -145,8 +117,7 @@ class RoleBase(AccessRole):
         )
         entries.delete()
         for user in users:
-            if hasattr(user, '_roles'):
-                del user._roles
+            UserAccessContext.invalidate(user)
 
     def users_with_role(self):
         """
@@ -260,11 +231,7 @@ class UserBasedRole(object):
         if not (self.user.is_authenticated() and self.user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(self.user, '_roles'):
-            self.user._roles = RoleCache(self.user)
-
-        return self.user._roles.has_role(self.role, course_key, course_key.org)
+        return UserAccessContext.for_user(self.user).has_role(self.role, course_key, course_key.org)
 
     def add_course(self, *course_keys):
         """
@@ -274,8 +241,7 @@ class UserBasedRole(object):
             for course_key in course_keys:
                 entry = CourseAccessRole(user=self.user, role=self.role, course_id=course_key, org=course_key.org)
                 entry.save()
-            if hasattr(self.user, '_roles'):
-                del self.user._roles
+            UserAccessContext.invalidate(self.user)
         else:
             raise ValueError("user is not active. Cannot grant access to courses")
 
@@ -285,8 +251,7 @@ class UserBasedRole(object):
         """
         entries = CourseAccessRole.objects.filter(user=self.user, role=self.role, course_id__in=course_keys)
         entries.delete()
-        if hasattr(self.user, '_roles'):
-            del self.user._roles
+        UserAccessContext.invalidate(self.user)
 
     def courses_with_role(self):
         """
@@ -2,14 +2,16 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
 from django.test import TestCase
 
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
+from student.models import CourseEnrollment, UserAccessContext
 from student.tests.factories import AnonymousUserFactory
 
 from student.roles import (
     GlobalStaff, CourseRole, CourseStaffRole, CourseInstructorRole,
-    OrgStaffRole, OrgInstructorRole, RoleCache, CourseBetaTesterRole
+    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole
 )
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
@@ -89,8 +91,6 @@ class RolesTestCase(TestCase):
 
         # remove access and confirm
         OrgStaffRole(self.course_key.org).remove_users(self.student)
-        if hasattr(self.student, '_roles'):
-            del self.student._roles
         self.assertFalse(
             OrgStaffRole(self.course_key.org).has_user(self.student),
             "Student still has access to {}".format(self.course_key.org)
@@ -157,7 +157,7 @@ class RolesTestCase(TestCase):
 
 
 @ddt.ddt
-class RoleCacheTestCase(TestCase):
+class UserAccessContextTestCase(TestCase):
 
     IN_KEY = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
     NOT_IN_KEY = SlashSeparatedCourseKey('edX', 'toy', '2013_Fall')
@@ -177,7 +177,7 @@ class RoleCacheTestCase(TestCase):
     @ddt.unpack
     def test_only_in_role(self, role, target):
         role.add_users(self.user)
-        cache = RoleCache(self.user)
+        cache = UserAccessContext(self.user)
         self.assertTrue(cache.has_role(*target))
 
         for other_role, other_target in self.ROLES:
@@ -189,5 +189,28 @@ class RoleCacheTestCase(TestCase):
     @ddt.data(*ROLES)
     @ddt.unpack
     def test_empty_cache(self, role, target):
-        cache = RoleCache(self.user)
+        cache = UserAccessContext(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_role_checks_share_one_query(self):
+        CourseStaffRole(self.IN_KEY).add_users(self.user)
+        with self.assertNumQueries(1):
+            for role, __ in self.ROLES:
+                role.has_user(self.user)
+        self.assertTrue(CourseStaffRole(self.IN_KEY).has_user(self.user))
+        self.assertFalse(CourseStaffRole(self.NOT_IN_KEY).has_user(self.user))
+
+        # Writes through the roles drop the loaded context
+        CourseStaffRole(self.IN_KEY).remove_users(self.user)
+        self.assertFalse(CourseStaffRole(self.IN_KEY).has_user(self.user))
+
+    def test_writes_through_other_user_objects(self):
+        self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.IN_KEY))
+        self.assertFalse(CourseStaffRole(self.IN_KEY).has_user(self.user))
+
+        # Rows written through another object for the same user make the loaded context stale
+        other_user = User.objects.get(id=self.user.id)
+        CourseEnrollment.enroll(other_user, self.IN_KEY)
+        CourseStaffRole(self.IN_KEY).add_users(other_user)
+        self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.IN_KEY))
+        self.assertTrue(CourseStaffRole(self.IN_KEY).has_user(self.user))
@@ -232,6 +232,42 @@ class DashboardTest(ModuleStoreTestCase):
         self.check_verification_status_off('honor', 'You\'re enrolled as an honor code student')
         self.check_verification_status_off('audit', 'You\'re auditing this course')
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    @patch.dict("django.conf.settings.FEATURES", {'DISABLE_START_DATES': False})
+    def test_course_not_started(self):
+        """
+        Test that the dashboard renders for a student enrolled in a course that has not started yet.
+        """
+        course = CourseFactory.create(
+            start=datetime.now(pytz.UTC) + timedelta(days=7), display_name="Upcoming Course"
+        )
+        CourseEnrollment.enroll(self.user, course.id)
+        self.client.login(username="jack", password="test")
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, "Upcoming Course")
+
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_notpassing_certificate(self):
+        """
+        Test that the dashboard shows the grade required for a certificate to a student who did not pass.
+        """
+        course = CourseFactory.create(
+            end=datetime.now(pytz.UTC) - timedelta(days=7),
+            grade_cutoffs={'Pass': 0.65},
+        )
+        CourseEnrollment.enroll(self.user, course.id, mode='honor')
+        GeneratedCertificateFactory.create(
+            user=self.user,
+            course_id=course.id,
+            status=CertificateStatuses.notpassing,
+            grade='0.3',
+            mode='honor'
+        )
+        self.client.login(username="jack", password="test")
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, "Grade required for a")
+        self.assertContains(response, "65%")
+
     def test_course_mode_info(self):
         verified_mode = CourseModeFactory.create(
             course_id=self.course.id,
@@ -571,6 +607,24 @@ class EnrollInCourseTest(TestCase):
         self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
         self.assert_enrollment_event_was_emitted(user, course_id)
 
+    def test_enrollment_checks_share_one_query(self):
+        user = User.objects.create(username="jill", email="jill@fake.edx.org")
+        course_ids = [SlashSeparatedCourseKey("edX", "Test10{}".format(num), "2013") for num in range(3)]
+        for course_id in course_ids[:2]:
+            CourseEnrollment.enroll(user, course_id, "verified")
+
+        with self.assertNumQueries(1):
+            for course_id in course_ids:
+                CourseEnrollment.is_enrolled(user, course_id)
+                CourseEnrollment.enrollment_mode_for_user(user, course_id)
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_ids[0]), ("verified", True))
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_ids[2]), (None, None))
+
+        # Unenrolling drops the loaded enrollments
+        CourseEnrollment.unenroll(user, course_ids[0])
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_ids[0]))
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_ids[0]), ("verified", False))
+
     def test_change_enrollment_modes(self):
         user = User.objects.create(username="justin", email="jh@fake.edx.org")
         course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
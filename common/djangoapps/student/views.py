@@ -58,7 +58,9 @@ from student.models import (
 from student.forms import PasswordResetFormNoActive
 
 from verify_student.models import SoftwareSecurePhotoVerification, MidcourseReverificationWindow
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses, certificate_status_for_student, certificate_statuses_for_student
+)
 from dark_lang.models import DarkLangConfig
 
 from xmodule.modulestore.django import modulestore
@@ -80,6 +82,7 @@ import external_auth.views
 from bulk_email.models import Optout, CourseAuthorization
 import shoppingcart
 from openedx.core.djangoapps.user_api.models import UserPreference
+from openedx.core.djangoapps.course_overviews.models import CourseOverview
 from lang_pref import LANGUAGE_KEY
 
 import track.views
@@ -103,7 +106,6 @@ from student.helpers import (
     auth_pipeline_urls, set_logged_in_cookie,
     check_verify_status_by_course
 )
-from xmodule.error_module import ErrorDescriptor
 from shoppingcart.models import DonationConfiguration, CourseRegistrationCode
 from openedx.core.djangoapps.user_api.api import profile as profile_api
 
@@ -181,10 +183,11 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course):
+def cert_info(user, course, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
-    student and course.  Returns a dictionary with keys:
+    student and course.  `cert_status` is what certificate_status_for_student
+    returns for them, and is looked up if not given.  Returns a dictionary with keys:
 
     'status': one of 'generating', 'ready', 'notpassing', 'processing', 'restricted'
     'show_download_url': bool
@@ -197,7 +200,9 @@ def cert_info(user, course):
     if not course.may_certify():
         return {}
 
-    return _cert_info(user, course, certificate_status_for_student(user, course.id))
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course.id)
+    return _cert_info(user, course, cert_status)
 
 
 def reverification_info(course_enrollment_pairs, user, statuses):
@@ -259,29 +264,29 @@ def single_course_reverification_info(user, course, enrollment):  # pylint: disa
 
 def get_course_enrollment_pairs(user, course_org_filter, org_filter_out_set):
     """
-    Get the relevant set of (Course, CourseEnrollment) pairs to be displayed on
+    Get the relevant set of (CourseOverview, CourseEnrollment) pairs to be displayed on
     a student's dashboard.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
-        store = modulestore()
-        with store.bulk_operations(enrollment.course_id):
-            course = store.get_course(enrollment.course_id)
-            if course and not isinstance(course, ErrorDescriptor):
-
-                # if we are in a Microsite, then filter out anything that is not
-                # attributed (by ORG) to that Microsite
-                if course_org_filter and course_org_filter != course.location.org:
-                    continue
-                # Conversely, if we are not in a Microsite, then let's filter out any enrollments
-                # with courses attributed (by ORG) to Microsites
-                elif course.location.org in org_filter_out_set:
-                    continue
-
-                yield (course, enrollment)
-            else:
-                log.error("User {0} enrolled in {2} course {1}".format(
-                    user.username, enrollment.course_id, "broken" if course else "non-existent"
-                ))
+    enrollments = list(CourseEnrollment.enrollments_for_user(user))
+    overviews = CourseOverview.get_from_ids(enrollment.course_id for enrollment in enrollments)
+    for enrollment in enrollments:
+        course = overviews[enrollment.course_id]
+        if course:
+
+            # if we are in a Microsite, then filter out anything that is not
+            # attributed (by ORG) to that Microsite
+            if course_org_filter and course_org_filter != course.id.org:
+                continue
+            # Conversely, if we are not in a Microsite, then let's filter out any enrollments
+            # with courses attributed (by ORG) to Microsites
+            elif course.id.org in org_filter_out_set:
+                continue
+
+            yield (course, enrollment)
+        else:
+            log.error("User {0} enrolled in broken or non-existent course {1}".format(
+                user.username, enrollment.course_id
+            ))
 
 
 def _cert_info(user, course, cert_status):
@@ -585,8 +590,11 @@ def dashboard(request):
             del request.session['separate-verified']
         verify_status_by_course = {}
 
+    certificate_statuses = certificate_statuses_for_student(
+        request.user, [course.id for course, _enrollment in course_enrollment_pairs]
+    )
     cert_statuses = {
-        course.id: cert_info(request.user, course)
+        course.id: cert_info(request.user, course, certificate_statuses[course.id])
         for course, _enrollment in course_enrollment_pairs
     }
 
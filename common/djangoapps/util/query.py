@@ -1,9 +1,137 @@
 """ Utility functions related to database queries """
+from contextlib import contextmanager
+from functools import wraps
+import logging
+import threading
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, DatabaseError, DEFAULT_DB_ALIAS
+
+log = logging.getLogger(__name__)
+
+READ_REPLICA = "read_replica"
+
+# Number of seconds for which a measurement of the read replica's lag is reused.
+READ_REPLICA_LAG_CHECK_INTERVAL = 30
+READ_REPLICA_LAG_CACHE_KEY = "util.query.read_replica_lag"
+
+_ROUTING = threading.local()
+
+
+def _get_read_replica_lag():
+    """
+    Returns the number of seconds the read replica is behind the primary
+    database, or None if that cannot be told (e.g. replication has stopped).
+
+    Only MySQL replicas report their lag; any other database is assumed to be current.
+    """
+    connection = connections[READ_REPLICA]
+    if connection.vendor != 'mysql':
+        return 0
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SHOW SLAVE STATUS")
+        row = cursor.fetchone()
+        columns = [column[0] for column in cursor.description or []]
+    except DatabaseError:
+        log.exception("Could not get the replication status of the read replica")
+        return None
+    if row is None:
+        # The replica is not replicating from anything, so it is the primary itself.
+        return 0
+    return dict(zip(columns, row)).get('Seconds_Behind_Master')
+
+
+def read_replica_is_available():
+    """
+    Returns True if there is a database called 'read_replica', and it is no
+    further behind the primary than settings.READ_REPLICA_MAX_LAG seconds.
+
+    The lag is only checked if READ_REPLICA_MAX_LAG is set, which it is not by default.
+    """
+    if READ_REPLICA not in settings.DATABASES:
+        return False
+    max_lag = getattr(settings, 'READ_REPLICA_MAX_LAG', None)
+    if max_lag is None:
+        return True
+
+    lag = cache.get(READ_REPLICA_LAG_CACHE_KEY)
+    if lag is None:
+        lag = _get_read_replica_lag()
+        # An unknown lag is cached as -1, since None can't be told apart from a cache miss.
+        cache.set(READ_REPLICA_LAG_CACHE_KEY, -1 if lag is None else lag, READ_REPLICA_LAG_CHECK_INTERVAL)
+    elif lag == -1:
+        lag = None
+
+    if lag is None or lag > max_lag:
+        log.warning("Not using the read replica, which is %s seconds behind", lag)
+        return False
+    return True
 
 
 def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+    return queryset.using(READ_REPLICA) if read_replica_is_available() else queryset
+
+
+@contextmanager
+def read_replica_if_available():
+    """
+    Context manager that sends all read queries made within it to the read
+    replica, when read_replica_is_available().  Writes still go to the primary.
+
+    Only wrap code that does not need to read back its own writes, such as the
+    generation of reports, since the replica may not have them yet.
+    """
+    previous = getattr(_ROUTING, 'use_read_replica', False)
+    _ROUTING.use_read_replica = previous or read_replica_is_available()
+    try:
+        yield
+    finally:
+        _ROUTING.use_read_replica = previous
+
+
+def uses_read_replica_if_available(func):
+    """
+    Decorator that runs `func` within read_replica_if_available().
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):  # pylint: disable=missing-docstring
+        with read_replica_if_available():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaRouter(object):
+    """
+    Database router that sends reads to the read replica within read_replica_if_available(),
+    and that keeps writes of objects read from the replica on the primary.
+    """
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        """ Use the read replica for reads within read_replica_if_available(). """
+        if getattr(_ROUTING, 'use_read_replica', False):
+            return READ_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        """ Never write to the read replica, even objects that were read from it. """
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == READ_REPLICA:  # pylint: disable=protected-access
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        """ Objects from the read replica may be related to those from the primary. """
+        databases = set([DEFAULT_DB_ALIAS, READ_REPLICA])
+        if obj1._state.db in databases and obj2._state.db in databases:  # pylint: disable=protected-access
+            return True
+        return None
+
+    def allow_syncdb(self, db, model):  # pylint: disable=unused-argument
+        """ Never create tables in the read replica. """
+        if db == READ_REPLICA:
+            return False
+        return None
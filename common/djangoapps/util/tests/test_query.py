@@ -0,0 +1,49 @@
+"""Tests for util.query module."""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from util.query import (
+    READ_REPLICA, ReadReplicaRouter, read_replica_if_available, read_replica_is_available,
+)
+
+DATABASES_WITH_READ_REPLICA = dict(settings.DATABASES, **{READ_REPLICA: settings.DATABASES[DEFAULT_DB_ALIAS]})
+
+
+class ReadReplicaTestCase(TestCase):
+    """
+    Tests for routing queries to the read replica.
+    """
+    def setUp(self):
+        cache.clear()
+        self.router = ReadReplicaRouter()
+
+    def test_no_read_replica(self):
+        self.assertFalse(read_replica_is_available())
+        with read_replica_if_available():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    @override_settings(DATABASES=DATABASES_WITH_READ_REPLICA)
+    def test_reads_routed_within_block(self):
+        self.assertIsNone(self.router.db_for_read(User))
+        with read_replica_if_available():
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    @override_settings(DATABASES=DATABASES_WITH_READ_REPLICA, READ_REPLICA_MAX_LAG=60)
+    def test_lagging_read_replica_not_used(self):
+        with patch('util.query._get_read_replica_lag', return_value=120) as mock_get_lag:
+            self.assertFalse(read_replica_is_available())
+            self.assertFalse(read_replica_is_available())
+        # The lag is only measured once in a while.
+        self.assertEqual(mock_get_lag.call_count, 1)
+
+    def test_writes_of_read_replica_objects_go_to_primary(self):
+        user = User(username='replicated')
+        user._state.db = READ_REPLICA  # pylint: disable=protected-access
+        self.assertEqual(self.router.db_for_write(User, instance=user), DEFAULT_DB_ALIAS)
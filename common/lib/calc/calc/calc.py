@@ -238,6 +238,16 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     # ...and check them
     math_interpreter.check_variables(all_variables, all_functions)
 
+    return evaluate_tree(math_interpreter, all_variables, all_functions, case_sensitive)
+
+
+def evaluate_tree(math_interpreter, all_variables, all_functions, case_sensitive=False):
+    """
+    Evaluate the parse tree held by `math_interpreter`, a parsed `ParseAugmenter`.
+
+    `all_variables` and `all_functions` should already include the defaults
+    (see `add_defaults`).
+    """
     # Create a recursion to evaluate the tree.
     if case_sensitive:
         casify = lambda x: x
@@ -258,6 +268,143 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+# The following evaluation actions are used when every variable is bound to a
+# numpy array holding one value per sample, rather than to a single number.
+# Operators are recognized as the string tokens; everything else is an operand.
+
+def _is_operand(token):
+    """
+    Return whether a token is an operand (number or array) rather than an operator.
+    """
+    return not isinstance(token, basestring)
+
+
+def eval_atom_array(parse_result):
+    """
+    Like `eval_atom`, for arrays of samples.
+    """
+    return next(k for k in parse_result if _is_operand(k))
+
+
+def eval_power_array(parse_result):
+    """
+    Like `eval_power`, for arrays of samples.
+    """
+    parse_result = reversed([k for k in parse_result if _is_operand(k)])
+    return reduce(lambda a, b: b ** a, parse_result)
+
+
+def eval_parallel_array(parse_result):
+    """
+    Like `eval_parallel`, for arrays of samples.
+
+    A zero among the inputs makes the reciprocal fail with a FloatingPointError
+    (see `evaluate_samples`), so that the samples are evaluated one at a time.
+    """
+    operands = [k for k in parse_result if _is_operand(k)]
+    if len(operands) == 1:
+        return operands[0]
+    return 1. / sum(1. / operand for operand in operands)
+
+
+def eval_sum_array(parse_result):
+    """
+    Like `eval_sum`, for arrays of samples.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if not _is_operand(token):
+            current_op = operator.sub if token == '-' else operator.add
+        else:
+            total = current_op(total, token)
+    return total
+
+
+def eval_product_array(parse_result):
+    """
+    Like `eval_product`, for arrays of samples.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if not _is_operand(token):
+            current_op = operator.truediv if token == '/' else operator.mul
+        else:
+            prod = current_op(prod, token)
+    return prod
+
+
+def evaluate_samples(variables_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression once for each dictionary of variables in `variables_list`.
+
+    Returns the same list of results as calling `evaluator` for each
+    dictionary in turn, but the expression is parsed only once. When every
+    dictionary binds the same variables, the tree is evaluated a single time
+    over numpy arrays holding all of the samples. If that fails for any
+    reason--e.g. a function such as `fact` that does not accept arrays, or a
+    floating point error in any sample--the samples are evaluated one at a
+    time, so that results and errors match those of `evaluator`.
+    """
+    if not variables_list:
+        return []
+
+    # No need to go further.
+    if math_expr.strip() == "":
+        return [float('nan')] * len(variables_list)
+
+    # Parse the tree, once for all of the samples.
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    all_variables_list = []
+    for variables in variables_list:
+        all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+        math_interpreter.check_variables(all_variables, all_functions)
+        all_variables_list.append(all_variables)
+
+    num_samples = len(variables_list)
+    sample_names = set(variables_list[0])
+    if num_samples > 1 and all(set(variables) == sample_names for variables in variables_list):
+        # Bind each sampled variable to an array of its values; defaults stay scalars.
+        array_variables, all_functions = add_defaults(
+            dict((name, numpy.array([variables[name] for variables in variables_list])) for name in sample_names),
+            functions,
+            case_sensitive
+        )
+        if case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        evaluate_actions = {
+            'number': eval_number,
+            'variable': lambda x: array_variables[casify(x[0])],
+            'function': lambda x: all_functions[casify(x[0])](x[1]),
+            'atom': eval_atom_array,
+            'power': eval_power_array,
+            'parallel': eval_parallel_array,
+            'product': eval_product_array,
+            'sum': eval_sum_array
+        }
+        try:
+            with numpy.errstate(divide='raise', over='raise', invalid='raise', under='ignore'):
+                result = math_interpreter.reduce_tree(evaluate_actions)
+        except Exception:  # pylint: disable=broad-except
+            pass
+        else:
+            if numpy.ndim(result) == 0:
+                return [result] * num_samples
+            if numpy.shape(result) == (num_samples,):
+                return list(result)
+
+    return [
+        evaluate_tree(math_interpreter, all_variables, all_functions, case_sensitive)
+        for all_variables in all_variables_list
+    ]
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -559,3 +559,39 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+    def test_evaluate_samples(self):
+        """
+        Check that `evaluate_samples` gives the same results as `evaluator`
+        called on each sample, whether or not the samples can be evaluated
+        together over arrays.
+        """
+        samples = [{'x': 0.5, 'y': 2.0}, {'x': 1.5, 'y': -3.0}, {'x': 2.5, 'y': 7.0}]
+        expressions = [
+            "x^2 + 2*x*y - y/3",
+            "sin(x)*cos(y) + i*x",
+            "sec(x) + arccot(y)",
+            "x || y",
+            "2^x^2",
+            "5",
+            "fact(3)*x",
+        ]
+        for expression in expressions:
+            expected = [calc.evaluator(sample, {}, expression) for sample in samples]
+            results = calc.evaluate_samples(samples, {}, expression)
+            self.assertEqual(len(results), len(samples))
+            for result, expected_result in zip(results, expected):
+                self.assertAlmostEqual(result, expected_result)
+
+    def test_evaluate_samples_errors(self):
+        """
+        Errors in any sample are raised as `evaluator` would raise them.
+        """
+        samples = [{'x': 2.0}, {'x': -1.0}]
+        self.assertEqual(calc.evaluate_samples([], {}, "x+"), [])
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.evaluate_samples(samples, {}, "x+y")
+        with self.assertRaises(ValueError):
+            calc.evaluate_samples(samples, {}, "fact(x)")
+        with self.assertRaises(ZeroDivisionError):
+            calc.evaluate_samples(samples, {}, "1/(x+1)")
@@ -189,7 +189,16 @@ class LoncapaProblem(object):
             if hasattr(response, 'late_transforms'):
                 response.late_transforms(self)
 
-        self.extracted_tree = self._extract_html(self.tree)
+        # Instantiate the inputs without rendering their templates; the HTML
+        # is only rendered when it is asked for, by get_html.
+        self._create_inputs(self.tree)
+
+    @property
+    def extracted_tree(self):
+        """
+        Element tree of the XHTML representation of this problem.
+        """
+        return self._extract_html(self.tree)
 
     def do_reset(self):
         """
@@ -676,6 +685,71 @@ class LoncapaProblem(object):
         context['extra_files'] = extra_files or None
         return context
 
+    def _get_input_state(self, problemtree):  # private
+        """
+        Returns the state (value, status, feedback, etc.) with which to
+        construct the InputType for the input at `problemtree`.
+        """
+        status = "unsubmitted"
+        msg = ''
+        hint = ''
+        hintmode = None
+        input_id = problemtree.get('id')
+        if input_id in self.correct_map:
+            status = self.correct_map.get_correctness(input_id)
+            msg = self.correct_map.get_msg(input_id)
+            hint = self.correct_map.get_hint(input_id)
+            hintmode = self.correct_map.get_hintmode(input_id)
+
+        value = ""
+        if self.student_answers and input_id in self.student_answers:
+            value = self.student_answers[input_id]
+
+        if input_id not in self.input_state:
+            self.input_state[input_id] = {}
+
+        return {
+            'value': value,
+            'status': status,
+            'id': input_id,
+            'input_state': self.input_state[input_id],
+            'feedback': {
+                'message': msg,
+                'hint': hint,
+                'hintmode': hintmode,
+            }
+        }
+
+    def _create_inputs(self, problemtree):  # private
+        """
+        Instantiates the InputType objects for the inputs in problemtree, saving
+        them in self.inputs, without rendering any HTML.
+
+        Visits the same inputs as _extract_html would render.
+        """
+        if not isinstance(problemtree.tag, basestring):
+            return
+
+        if (problemtree.tag == 'script' and problemtree.get('type')
+                and 'javascript' in problemtree.get('type')):
+            return
+
+        if problemtree.tag in html_problem_semantics:
+            return
+
+        if problemtree.tag in inputtypes.registry.registered_tags():
+            input_id = problemtree.get('id')
+            input_type_cls = inputtypes.registry.get_class_for_tag(problemtree.tag)
+            self.inputs[input_id] = input_type_cls(self.capa_system, problemtree, self._get_input_state(problemtree))
+            return
+
+        # Responses render all of their children, but custom renderers render none
+        if problemtree not in self.responders and problemtree.tag in customrender.registry.registered_tags():
+            return
+
+        for item in problemtree:
+            self._create_inputs(item)
+
     def _extract_html(self, problemtree):  # private
         """
         Main (private) function which converts Problem XML tree to HTML.
@@ -701,41 +775,10 @@ class LoncapaProblem(object):
         if problemtree.tag in html_problem_semantics:
             return
 
-        problemid = problemtree.get('id')    # my ID
-
         if problemtree.tag in inputtypes.registry.registered_tags():
             # If this is an inputtype subtree, let it render itself.
-            status = "unsubmitted"
-            msg = ''
-            hint = ''
-            hintmode = None
             input_id = problemtree.get('id')
-            if problemid in self.correct_map:
-                pid = input_id
-                status = self.correct_map.get_correctness(pid)
-                msg = self.correct_map.get_msg(pid)
-                hint = self.correct_map.get_hint(pid)
-                hintmode = self.correct_map.get_hintmode(pid)
-
-            value = ""
-            if self.student_answers and problemid in self.student_answers:
-                value = self.student_answers[problemid]
-
-            if input_id not in self.input_state:
-                self.input_state[input_id] = {}
-
-            # do the rendering
-            state = {
-                'value': value,
-                'status': status,
-                'id': input_id,
-                'input_state': self.input_state[input_id],
-                'feedback': {
-                    'message': msg,
-                    'hint': hint,
-                    'hintmode': hintmode,
-                }
-            }
+            state = self._get_input_state(problemtree)
 
             input_type_cls = inputtypes.registry.get_class_for_tag(problemtree.tag)
             # save the input type so that we can make ajax calls on it if we need to
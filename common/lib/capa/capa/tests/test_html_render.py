@@ -142,8 +142,12 @@ class CapaHtmlRenderTest(unittest.TestCase):
         the_system.render_template = mock.Mock()
         the_system.render_template.return_value = "<div>Input Template Render</div>"
 
-        # Create the problem and render the HTML
+        # Create the problem, which should not render any templates yet
         problem = new_loncapa_problem(xml_str, capa_system=the_system)
+        self.assertFalse(the_system.render_template.called)
+        self.assertEqual(problem.inputs.keys(), ['1_2_1'])
+
+        # Render the HTML
         rendered_html = etree.XML(problem.get_html())
 
         # Expect problem has been turned into a <div>
@@ -169,7 +173,7 @@ class CapaHtmlRenderTest(unittest.TestCase):
 
         # Expect that the template renderer was called with the correct
         # arguments, once for the textline input and once for
-        # the solution
+        # the solution, and only when the HTML was rendered
         expected_textline_context = {
             'STATIC_URL': '/dummy-static/',
             'status': the_system.STATUS_CLASS('unsubmitted'),
@@ -190,8 +194,6 @@ class CapaHtmlRenderTest(unittest.TestCase):
         expected_calls = [
             mock.call('textline.html', expected_textline_context),
             mock.call('solutionspan.html', expected_solution_context),
-            mock.call('textline.html', expected_textline_context),
-            mock.call('solutionspan.html', expected_solution_context)
         ]
 
         self.assertEqual(
@@ -4,7 +4,7 @@ Tests capa util
 import unittest
 import textwrap
 from . import test_capa_system
-from capa.util import compare_with_tolerance, sanitize_html
+from capa.util import compare_with_tolerance, compare_many_with_tolerance, sanitize_html
 
 
 class UtilTest(unittest.TestCase):
@@ -82,6 +82,22 @@ class UtilTest(unittest.TestCase):
         result = compare_with_tolerance(infinity, infinity, '1.0', False)
         self.assertTrue(result)
 
+    def test_compare_many_with_tolerance(self):
+        infinity = float('Inf')
+        student_values = [100.0, 109.9, 111.0, infinity, 100.0, infinity, float('nan'), 1j]
+        instructor_values = [100.0, 100.0, 100.0, 100.0, infinity, infinity, 100.0, 1j]
+        for tolerance, relative_tolerance in [
+                ('0.001%', False), ('10%', False), ('10%', True), ('10.0', False),
+                ('0.1', True), (10.0, False), (0.1, True), (1.0, False),
+        ]:
+            for student, instructor in zip(student_values, instructor_values):
+                expected = compare_with_tolerance(student, instructor, tolerance, relative_tolerance)
+                result = compare_many_with_tolerance([student], [instructor], tolerance, relative_tolerance)
+                self.assertEqual(result, expected)
+        self.assertTrue(compare_many_with_tolerance([100.0, 100.001, infinity], [100.0, 100.0, infinity]))
+        self.assertFalse(compare_many_with_tolerance([100.0, 101.0, infinity], [100.0, 100.0, infinity]))
+        self.assertTrue(compare_many_with_tolerance([], []))
+
     def test_sanitize_html(self):
         """
         Test for html sanitization with bleach.
@@ -2,6 +2,7 @@
 Utility functions for capa.
 """
 import bleach
+import numpy
 
 from calc import evaluator
 from cmath import isinf
@@ -70,6 +71,39 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         return abs(student_complex - instructor_complex) <= tolerance
 
 
+def compare_many_with_tolerance(student_values, instructor_values, tolerance=default_tolerance,
+                                relative_tolerance=False):
+    """
+    Compare each of `student_values` to the corresponding entry of `instructor_values`.
+
+    Returns True only if every pair would compare equal with
+    `compare_with_tolerance`, given the same `tolerance` and
+    `relative_tolerance`. The pairs are compared all at once with numpy, and a
+    string tolerance is evaluated only once rather than for every pair.
+    """
+    student_values = numpy.asarray(student_values, dtype=complex)
+    instructor_values = numpy.asarray(instructor_values, dtype=complex)
+
+    if isinstance(tolerance, str):
+        if tolerance == default_tolerance:
+            relative_tolerance = True
+        if tolerance.endswith('%'):
+            tolerance = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+            if not relative_tolerance:
+                tolerance = tolerance * numpy.abs(instructor_values)
+        else:
+            tolerance = evaluator(dict(), dict(), tolerance)
+
+    with numpy.errstate(invalid='ignore', over='ignore'):
+        if relative_tolerance:
+            tolerance = tolerance * numpy.maximum(numpy.abs(student_values), numpy.abs(instructor_values))
+
+        # As in `compare_with_tolerance`, infinite values are compared directly.
+        infinite = numpy.isinf(student_values) | numpy.isinf(instructor_values)
+        within_tolerance = numpy.abs(student_values - instructor_values) <= tolerance
+        return bool(numpy.all(numpy.where(infinite, student_values == instructor_values, within_tolerance)))
+
+
 def contextualize_text(text, context):  # private
     """
     Takes a string with variables. E.g. $a+$b.
@@ -11,6 +11,7 @@ from django.conf import settings
 if not settings.configured:
     settings.configure()
 from django.core.cache import get_cache, InvalidCacheBackendError
+from django.dispatch import Signal
 import django.utils
 
 import re
@@ -32,6 +33,10 @@ except ImportError:
 
 ASSET_IGNORE_REGEX = getattr(settings, "ASSET_IGNORE_REGEX", r"(^\._.*$)|(^\.DS_Store$)|(^.*~$)")
 
+# Sent with the course_key whenever the course-level block of a course is created,
+# written, published or deleted through the Mixed modulestore.
+course_published = Signal(providing_args=["course_key"])  # pylint: disable=invalid-name
+
 
 def load_function(path):
     """
@@ -70,6 +75,7 @@ def create_modulestore_instance(engine, content_store, doc_store_config, options
 
     if issubclass(class_, MixedModuleStore):
         _options['create_modulestore_instance'] = create_modulestore_instance
+        _options['course_published_func'] = _send_course_published
 
     if issubclass(class_, BranchSettingMixin):
         _options['branch_setting_func'] = _get_modulestore_branch_setting
@@ -87,6 +93,13 @@ def create_modulestore_instance(engine, content_store, doc_store_config, options
     )
 
 
+def _send_course_published(course_key):
+    """
+    Send the course_published signal for course_key.
+    """
+    course_published.send(sender=MixedModuleStore, course_key=course_key)
+
+
 # A singleton instance of the Mixed Modulestore
 _MIXED_MODULESTORE = None
 
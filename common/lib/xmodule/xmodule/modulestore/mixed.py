@@ -99,16 +99,24 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
     """
     ModuleStore knows how to route requests to the right persistence ms
     """
-    def __init__(self, contentstore, mappings, stores, i18n_service=None, fs_service=None, create_modulestore_instance=None, **kwargs):
+    def __init__(
+            self, contentstore, mappings, stores, i18n_service=None, fs_service=None, create_modulestore_instance=None,
+            course_published_func=None, **kwargs
+    ):
         """
         Initialize a MixedModuleStore. Here we look into our passed in kwargs which should be a
         collection of other modulestore configuration information
+
+        course_published_func, if given, is called with the course key whenever the course-level
+        block of a course is created, written, published or deleted through this store.
         """
         super(MixedModuleStore, self).__init__(contentstore, **kwargs)
 
         if create_modulestore_instance is None:
             raise ValueError('MixedModuleStore constructor must be passed a create_modulestore_instance function')
 
+        self.course_published_func = course_published_func
+
         self.modulestores = []
         self.mappings = {}
 
@@ -146,6 +154,20 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                     self.mappings[course_key] = store
             self.modulestores.append(store)
 
+    def _course_published(self, course_key):
+        """
+        Tell the course_published_func (if any) that the course-level block of course_key changed.
+        """
+        if self.course_published_func is not None:
+            self.course_published_func(self._clean_course_id_for_mapping(course_key))
+
+    def _course_published_if_course(self, location):
+        """
+        Call _course_published if location is the course-level block of its course.
+        """
+        if location.category == 'course':
+            self._course_published(location.course_key)
+
     def _clean_course_id_for_mapping(self, course_id):
         """
         In order for mapping to work, the course_id must be minimal--no version, no branch--
@@ -350,7 +372,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         """
         assert(isinstance(course_key, CourseKey))
         store = self._get_modulestore_for_courseid(course_key)
-        return store.delete_course(course_key, user_id)
+        result = store.delete_course(course_key, user_id)
+        self._course_published(course_key)
+        return result
 
     @contract(asset_metadata='AssetMetadata', user_id='int|long', import_only=bool)
     def save_asset_metadata(self, asset_metadata, user_id, import_only=False):
@@ -565,6 +589,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
 
         # add new course to the mapping
         self.mappings[course_key] = store
+        self._course_published(course_key)
 
         return course
 
@@ -612,7 +637,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         # to have only course re-runs go to split. This code, however, uses the config'd priority
         dest_modulestore = self._get_modulestore_for_courseid(dest_course_id)
         if source_modulestore == dest_modulestore:
-            return source_modulestore.clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            result = source_modulestore.clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            self._course_published(dest_course_id)
+            return result
 
         if dest_modulestore.get_modulestore_type() == ModuleStoreEnum.Type.split:
             split_migrator = SplitMigrator(dest_modulestore, source_modulestore)
@@ -621,6 +648,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
             )
             # the super handles assets and any other necessities
             super(MixedModuleStore, self).clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            self._course_published(dest_course_id)
         else:
             raise NotImplementedError("No code for cloning from {} to {}".format(
                 source_modulestore, dest_modulestore
@@ -674,7 +702,10 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         Defer to the course's modulestore if it supports this method
         """
         store = self._verify_modulestore_support(course_key, 'import_xblock')
-        return store.import_xblock(user_id, course_key, block_type, block_id, fields, runtime)
+        result = store.import_xblock(user_id, course_key, block_type, block_id, fields, runtime)
+        if block_type == 'course':
+            self._course_published(course_key)
+        return result
 
     @strip_key
     def update_item(self, xblock, user_id, allow_not_found=False, **kwargs):
@@ -683,7 +714,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         (content, children, and metadata) attribute the change to the given user.
         """
         store = self._verify_modulestore_support(xblock.location.course_key, 'update_item')
-        return store.update_item(xblock, user_id, allow_not_found, **kwargs)
+        result = store.update_item(xblock, user_id, allow_not_found, **kwargs)
+        self._course_published_if_course(xblock.location)
+        return result
 
     @strip_key
     def delete_item(self, location, user_id, **kwargs):
@@ -691,7 +724,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         Delete the given item from persistence. kwargs allow modulestore specific parameters.
         """
         store = self._verify_modulestore_support(location.course_key, 'delete_item')
-        return store.delete_item(location, user_id=user_id, **kwargs)
+        result = store.delete_item(location, user_id=user_id, **kwargs)
+        self._course_published_if_course(location)
+        return result
 
     def revert_to_published(self, location, user_id):
         """
@@ -785,7 +820,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         Returns the newly published item.
         """
         store = self._verify_modulestore_support(location.course_key, 'publish')
-        return store.publish(location, user_id, **kwargs)
+        result = store.publish(location, user_id, **kwargs)
+        self._course_published_if_course(location)
+        return result
 
     @strip_key
     def unpublish(self, location, user_id, **kwargs):
@@ -794,7 +831,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         Returns the newly unpublished item.
         """
         store = self._verify_modulestore_support(location.course_key, 'unpublish')
-        return store.unpublish(location, user_id, **kwargs)
+        result = store.unpublish(location, user_id, **kwargs)
+        self._course_published_if_course(location)
+        return result
 
     def convert_to_draft(self, location, user_id):
         """
@@ -868,6 +907,16 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         with store.branch_setting(branch_setting, course_id):
             yield
 
+    def get_branch_setting(self, course_id=None):
+        """
+        Returns the current branch setting of the given course's store. If course_id is None, the default
+        store is used. Stores without branches (e.g. XML) only ever serve published content.
+        """
+        store = self._get_modulestore_for_courseid(course_id)
+        if hasattr(store, 'get_branch_setting'):
+            return store.get_branch_setting(course_id)
+        return ModuleStoreEnum.Branch.published_only
+
     @contextmanager
     def bulk_operations(self, course_id):
         """
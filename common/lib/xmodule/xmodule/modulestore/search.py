@@ -1,4 +1,74 @@
+from . import ModuleStoreEnum
 from .exceptions import (ItemNotFoundError, NoPathToItem)
+from xmodule.util.course_version import CourseVersionCache, get_course_version
+
+# Ancestry maps of recently used courses, keyed by course version, branch and modulestore type.
+_COURSE_ANCESTRIES = CourseVersionCache(u"xmodule.modulestore.search.course_ancestry")
+
+
+def _course_ancestry(modulestore, course_key):
+    """
+    Returns a dict mapping the (block_type, block_id) of every block reachable
+    from the root of the course to the (block_type, block_id) of its parent and
+    its 1-indexed position among the parent's children, or None if the course
+    does not exist or has no version to key the map on (e.g. XML courses).
+
+    The map is built in a single walk of the course and reused for as long as
+    the course's version stays the same.
+    """
+    course = modulestore.get_course(course_key)
+    if course is None or get_course_version(course) is None:
+        return None
+
+    get_branch_setting = getattr(modulestore, 'get_branch_setting', None)
+    branch = get_branch_setting(course_key) if get_branch_setting else ModuleStoreEnum.Branch.published_only
+    return _COURSE_ANCESTRIES.get(
+        course,
+        lambda: _compute_course_ancestry(modulestore, course_key),
+        branch,
+        modulestore.get_modulestore_type(course_key),
+    )
+
+
+def _compute_course_ancestry(modulestore, course_key):
+    """
+    Walks the course to build the map described by _course_ancestry.
+    """
+    course = modulestore.get_course(course_key, depth=None)
+    root = (course.location.block_type, course.location.block_id)
+    ancestry = {root: (None, None)}
+    stack = [course]
+    while stack:
+        block = stack.pop()
+        if not block.has_children:
+            continue
+        parent = (block.location.block_type, block.location.block_id)
+        # get_children rather than children b/c old mongo includes private children
+        # in children but not in get_children
+        for position, child in enumerate(block.get_children(), start=1):
+            node = (child.location.block_type, child.location.block_id)
+            if node not in ancestry:
+                ancestry[node] = (parent, position)
+                stack.append(child)
+    return ancestry
+
+
+def _path_from_ancestry(ancestry, usage_key):
+    """
+    Returns the path from the course down to usage_key, along with the
+    position of each block in the path among its parent's children.
+    """
+    path = []
+    positions = []
+    node = (usage_key.block_type, usage_key.block_id)
+    while node is not None:
+        parent, position = ancestry[node]
+        path.append(usage_key.course_key.make_usage_key(*node))
+        positions.append(position)
+        node = parent
+    path.reverse()
+    positions.reverse()
+    return path, positions
 
 
 def path_to_location(modulestore, usage_key):
@@ -69,12 +139,19 @@ def path_to_location(modulestore, usage_key):
             queue.append((parent, newpath))
 
     with modulestore.bulk_operations(usage_key.course_key):
-        if not modulestore.has_item(usage_key):
-            raise ItemNotFoundError(usage_key)
-
-        path = find_path_to_course()
-        if path is None:
-            raise NoPathToItem(usage_key)
+        ancestry = _course_ancestry(modulestore, usage_key.course_key)
+        if ancestry is not None and (usage_key.block_type, usage_key.block_id) in ancestry:
+            path, child_positions = _path_from_ancestry(ancestry, usage_key)
+        else:
+            # Not reachable from the course in its cached form: look the item
+            # up directly so that missing and orphaned items are reported.
+            if not modulestore.has_item(usage_key):
+                raise ItemNotFoundError(usage_key)
+
+            path = find_path_to_course()
+            if path is None:
+                raise NoPathToItem(usage_key)
+            child_positions = None
 
         n = len(path)
         course_id = path[0].course_key
@@ -95,13 +172,17 @@ def path_to_location(modulestore, usage_key):
             for path_index in range(2, n - 1):
                 category = path[path_index].block_type
                 if category == 'sequential' or category == 'videosequence':
-                    section_desc = modulestore.get_item(path[path_index])
-                    # this calls get_children rather than just children b/c old mongo includes private children
-                    # in children but not in get_children
-                    child_locs = [c.location for c in section_desc.get_children()]
+                    if child_positions is not None:
+                        child_position = child_positions[path_index + 1]
+                    else:
+                        section_desc = modulestore.get_item(path[path_index])
+                        # this calls get_children rather than just children b/c old mongo includes private children
+                        # in children but not in get_children
+                        child_locs = [c.location for c in section_desc.get_children()]
+                        child_position = child_locs.index(path[path_index + 1]) + 1
                     # positions are 1-indexed, and should be strings to be consistent with
                     # url parsing.
-                    position_list.append(str(child_locs.index(path[path_index + 1]) + 1))
+                    position_list.append(str(child_position))
             position = "_".join(position_list)
 
         return (course_id, chapter, section, position)
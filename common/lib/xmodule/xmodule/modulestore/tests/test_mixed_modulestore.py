@@ -1014,23 +1014,11 @@ class TestMixedModuleStore(CourseComparisonTest):
             parent = mongo_store.get_parent_location(self.problem_x1a_1)
             self.assertEqual(parent, self.vertical_x1a)
 
-    # Draft:
-    #   Problem path:
-    #    1. Get problem
-    #    2-3. count matches definition.children called 2x?
-    #    4. get parent via definition.children query
-    #    5-7. 2 counts and 1 get grandparent via definition.children
-    #    8-10. ditto for great-grandparent
-    #    11-13. ditto for next ancestor
-    #    14. fail count query looking for parent of course (unnecessary)
-    #    15. get course record direct query (not via definition.children) (already fetched in 13)
-    #    16. get items for inheritance computation
-    #    17. get vertical (parent of problem)
-    #    18. get items for inheritance computation (why? caching should handle)
-    #    19-20. get vertical_x1b (? why? this is the only ref in trace) & items for inheritance computation
-    #   Chapter path: get chapter, count parents 2x, get parents, count non-existent grandparents
+    # The first lookup builds the course's ancestry map; the counted ones reuse it and only
+    # read the course to check its version.
+    # Draft: get course
     # Split: active_versions & structure
-    @ddt.data(('draft', [20, 5], 0), ('split', [2, 2], 0))
+    @ddt.data(('draft', 1, 0), ('split', 2, 0))
     @ddt.unpack
     def test_path_to_location(self, default_ms, num_finds, num_sends):
         """
@@ -1049,9 +1037,9 @@ class TestMixedModuleStore(CourseComparisonTest):
                  (course_key, "Chapter_x", None, None)),
             )
 
+            path_to_location(self.store, self.course.location)
             for location, expected in should_work:
-                # each iteration has different find count, pop this iter's find count
-                with check_mongo_calls(num_finds.pop(0), num_sends):
+                with check_mongo_calls(num_finds, num_sends):
                     self.assertEqual(path_to_location(self.store, location), expected)
 
         not_found = (
@@ -1074,6 +1062,24 @@ class TestMixedModuleStore(CourseComparisonTest):
         with self.assertRaises(NoPathToItem):
             path_to_location(self.store, orphan)
 
+    @ddt.data('draft', 'split')
+    def test_path_to_location_after_reorder(self, default_ms):
+        """
+        Make sure that path_to_location reflects changes made to the course after its last call
+        """
+        self.initdb(default_ms)
+        self._create_block_hierarchy()
+
+        course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, course_key):
+            self.assertEqual(path_to_location(self.store, self.vertical_x1b)[3], '2')
+
+            sequential = self.store.get_item(self.sequential_x1)
+            sequential.children.reverse()
+            self.store.update_item(sequential, self.user_id)
+
+            self.assertEqual(path_to_location(self.store, self.vertical_x1b)[3], '1')
+
     def test_xml_path_to_location(self):
         """
         Make sure that path_to_location works: should be passed a modulestore
@@ -11,6 +11,9 @@ class PartitionService(object):
     This is an XBlock service that assigns tracks which groups users are in for various
     user partitions.  It uses the provided user_tags service object to
     persist the assignments.
+
+    The user is looked up at most once per service, i.e. once per request in
+    the LMS.
     """
     __metaclass__ = ABCMeta
 
@@ -24,6 +27,7 @@ class PartitionService(object):
     def __init__(self, runtime, track_function):
         self.runtime = runtime
         self._track_function = track_function
+        self._user = None
 
     def get_user_group_id_for_partition(self, user_partition_id):
         """
@@ -56,6 +60,46 @@ class PartitionService(object):
         group = self._get_group(user_partition)
         return group.id if group else None
 
+    def get_group_ids_for_users(self, user_partition_id, users):
+        """
+        Return the ids of the groups in user_partition_id to which each of users
+        is assigned, for grading and reporting over many users at once.
+
+        Partition schemes that provide a get_groups_for_users method look all of
+        the users up together, and leave out users who have not been assigned
+        to a group yet; for other schemes each user is looked up (and if need
+        be assigned) in turn.
+
+        Args:
+            user_partition_id -- an id of a partition that's hopefully in the
+                runtime.user_partitions list.
+            users -- the User objects to look up.
+
+        Returns:
+            A dict mapping user ids to group ids.
+
+        Raises:
+            ValueError if the user_partition_id isn't found.
+        """
+        user_partition = self._get_user_partition(user_partition_id)
+        if user_partition is None:
+            raise ValueError(
+                "Configuration problem!  No user_partition with id {0} "
+                "in course {1}".format(user_partition_id, self.runtime.course_id)
+            )
+
+        scheme = user_partition.scheme
+        if hasattr(scheme, 'get_groups_for_users'):
+            groups = scheme.get_groups_for_users(self.runtime.course_id, users, user_partition)
+        else:
+            groups = {
+                user.id: scheme.get_group_for_user(
+                    self.runtime.course_id, user, user_partition, track_function=self._track_function
+                )
+                for user in users
+            }
+        return {user_id: group.id for user_id, group in groups.iteritems() if group is not None}
+
     def _get_user_partition(self, user_partition_id):
         """
         Look for a user partition with a matching id in the course's partitions.
@@ -75,7 +119,8 @@ class PartitionService(object):
         If the user has not yet been assigned, a group will be chosen for them based upon
         the partition's scheme.
         """
-        user = self.runtime.get_real_user(self.runtime.anonymous_student_id)
+        if self._user is None:
+            self._user = self.runtime.get_real_user(self.runtime.anonymous_student_id)
         return user_partition.scheme.get_group_for_user(
-            self.runtime.course_id, user, user_partition, track_function=self._track_function
+            self.runtime.course_id, self._user, user_partition, track_function=self._track_function
         )
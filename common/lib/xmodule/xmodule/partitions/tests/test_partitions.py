@@ -300,3 +300,15 @@ class TestPartitionService(PartitionTestCase):
         self.user_partition.scheme.current_group = groups[1]    # pylint: disable=no-member
         group2_id = self.partition_service.get_user_group_id_for_partition(user_partition_id)
         self.assertEqual(group2_id, groups[1].id)    # pylint: disable=no-member
+
+    def test_get_group_ids_for_users(self):
+        users = [Mock(id=1), Mock(id=2)]
+        groups = self.user_partition.groups    # pylint: disable=no-member
+        self.user_partition.scheme.current_group = groups[1]    # pylint: disable=no-member
+
+        # schemes without a batch lookup are asked about each user in turn
+        group_ids = self.partition_service.get_group_ids_for_users(self.user_partition.id, users)
+        self.assertEqual(group_ids, {1: groups[1].id, 2: groups[1].id})
+
+        with self.assertRaises(ValueError):
+            self.partition_service.get_group_ids_for_users(999, users)
@@ -9,6 +9,7 @@ Implement CourseTab
 
 from abc import ABCMeta, abstractmethod
 from xblock.fields import List
+from xmodule.util.course_version import CourseVersionCache
 
 # We should only scrape strings for i18n in this file, since the target language is known only when
 # they are rendered in the template.  So ugettext gets called in the template.
@@ -556,7 +557,9 @@ class TextbookTabs(TextbookTabsBase):
             yield SingleTextbookTab(
                 name=textbook.title,
                 tab_id='textbook/{0}'.format(index),
-                link_func=lambda course, reverse_func: reverse_func('book', args=[course.id.to_deprecated_string(), index]),
+                link_func=lambda course, reverse_func, index=index: reverse_func(
+                    'book', args=[course.id.to_deprecated_string(), index]
+                ),
             )
 
 
@@ -576,7 +579,9 @@ class PDFTextbookTabs(TextbookTabsBase):
             yield SingleTextbookTab(
                 name=textbook['tab_title'],
                 tab_id='pdftextbook/{0}'.format(index),
-                link_func=lambda course, reverse_func: reverse_func('pdf_book', args=[course.id.to_deprecated_string(), index]),
+                link_func=lambda course, reverse_func, index=index: reverse_func(
+                    'pdf_book', args=[course.id.to_deprecated_string(), index]
+                ),
             )
 
 
@@ -596,7 +601,9 @@ class HtmlTextbookTabs(TextbookTabsBase):
             yield SingleTextbookTab(
                 name=textbook['tab_title'],
                 tab_id='htmltextbook/{0}'.format(index),
-                link_func=lambda course, reverse_func: reverse_func('html_book', args=[course.id.to_deprecated_string(), index]),
+                link_func=lambda course, reverse_func, index=index: reverse_func(
+                    'html_book', args=[course.id.to_deprecated_string(), index]
+                ),
             )
 
 
@@ -710,6 +717,10 @@ class InstructorTab(StaffTab):
         )
 
 
+# The displayable tabs of recently used courses. See CourseTabList.compiled_tabs.
+_COMPILED_TABS = CourseVersionCache(u"xmodule.tabs.compiled_tabs")
+
+
 class CourseTabList(List):
     """
     An XBlock field class that encapsulates a collection of Tabs in a course.
@@ -786,6 +797,22 @@ class CourseTabList(List):
         """
         return next((tab for tab in tab_list if tab.tab_id == tab_id), None)
 
+    @staticmethod
+    def compiled_tabs(course):
+        """
+        Returns a list of the course's tabs that are not hidden, each paired with the tuple of
+        items it expands to if it is a collection, or None otherwise.
+
+        The list only depends on the course's content, so it is kept for as long as the course
+        version stays the same, leaving just the per-user can_display checks to be made for each
+        page.  Courses without a version are compiled on every call.
+        """
+        return _COMPILED_TABS.get(course, lambda: [
+            (tab, tuple(tab.items(course)) if tab.is_collection else None)
+            for tab in course.tabs
+            if not tab.is_hideable or not tab.is_hidden
+        ])
+
     @staticmethod
     def iterate_displayable(
             course,
@@ -798,12 +825,10 @@ class CourseTabList(List):
         Generator method for iterating through all tabs that can be displayed for the given course and
         the given user with the provided access settings.
         """
-        for tab in course.tabs:
-            if tab.can_display(
-                    course, settings, is_user_authenticated, is_user_staff, is_user_enrolled
-            ) and (not tab.is_hideable or not tab.is_hidden):
-                if tab.is_collection:
-                    for item in tab.items(course):
+        for tab, items in CourseTabList.compiled_tabs(course):
+            if tab.can_display(course, settings, is_user_authenticated, is_user_staff, is_user_enrolled):
+                if items is not None:
+                    for item in items:
                         yield item
                 else:
                     yield tab
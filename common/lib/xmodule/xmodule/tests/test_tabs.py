@@ -1,4 +1,5 @@
 """Tests for Tab classes"""
+from datetime import datetime
 from mock import MagicMock
 import xmodule.tabs as tabs
 import unittest
@@ -303,6 +304,28 @@ class TextbooksTestCase(TabTestCase):
                 num_textbooks_found = num_textbooks_found + 1
         self.assertEquals(num_textbooks_found, self.num_textbooks)
 
+    def test_textbooks_compiled_per_course_version(self):
+
+        self.settings.FEATURES['ENABLE_TEXTBOOK'] = True
+        self.course.subtree_edited_on = datetime(2015, 1, 1)
+        self.assertEquals(len(tabs.CourseTabList.compiled_tabs(self.course)), len(self.course.tabs))
+
+        # the compiled tabs are reused while the course version is unchanged
+        self.course.textbooks = []
+        textbook_tabs = [
+            tab for tab in tabs.CourseTabList.iterate_displayable(self.course, self.settings)
+            if isinstance(tab, tabs.SingleTextbookTab)
+        ]
+        self.assertEquals(len(textbook_tabs), self.num_textbooks)
+
+        # and compiled again once it changes
+        self.course.subtree_edited_on = datetime(2015, 1, 2)
+        textbook_tabs = [
+            tab for tab in tabs.CourseTabList.iterate_displayable(self.course, self.settings)
+            if isinstance(tab, tabs.SingleTextbookTab)
+        ]
+        self.assertEquals(len(textbook_tabs), self.num_textbooks - len(self.books))
+
     def test_textbooks_disabled(self):
 
         self.settings.FEATURES['ENABLE_TEXTBOOK'] = False
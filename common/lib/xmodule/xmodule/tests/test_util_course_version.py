@@ -0,0 +1,51 @@
+"""Tests for methods defined in util/course_version.py"""
+import datetime
+from unittest import TestCase
+
+from mock import Mock
+
+from xmodule.util.course_version import CourseVersionCache, get_course_version
+
+
+def make_course(course_id, edited_on=datetime.datetime(2015, 1, 1)):
+    """ Returns a stand-in for a course with the given id, last edited on `edited_on` """
+    return Mock(id=course_id, subtree_edited_on=edited_on)
+
+
+class CourseVersionCacheTest(TestCase):
+    """
+    Tests for CourseVersionCache
+    """
+    def setUp(self):
+        super(CourseVersionCacheTest, self).setUp()
+        self.cache = CourseVersionCache(u"test", max_size=2)
+
+    def test_get_course_version(self):
+        self.assertEqual(get_course_version(make_course('a')), '2015-01-01T00:00:00')
+        self.assertIsNone(get_course_version(make_course('a', edited_on=None)))
+
+    def test_value_reused_for_same_version(self):
+        compute = Mock(return_value='value')
+        self.assertEqual(self.cache.get(make_course('a'), compute), 'value')
+        self.assertEqual(self.cache.get(make_course('a'), compute), 'value')
+        self.assertEqual(compute.call_count, 1)
+
+    def test_value_recomputed_for_new_version(self):
+        self.cache.get(make_course('a'), lambda: 'old')
+        course = make_course('a', edited_on=datetime.datetime(2015, 1, 2))
+        self.assertEqual(self.cache.get(course, lambda: 'new'), 'new')
+
+    def test_unversioned_course_not_cached(self):
+        compute = Mock(return_value='value')
+        course = make_course('a', edited_on=None)
+        self.cache.get(course, compute)
+        self.cache.get(course, compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_least_recently_used_value_dropped(self):
+        self.cache.get(make_course('a'), lambda: 'a')
+        self.cache.get(make_course('b'), lambda: 'b')
+        self.cache.get(make_course('a'), lambda: 'recomputed')
+        self.cache.get(make_course('c'), lambda: 'c')
+        self.assertEqual(self.cache.get(make_course('a'), lambda: 'recomputed'), 'a')
+        self.assertEqual(self.cache.get(make_course('b'), lambda: 'recomputed'), 'recomputed')
@@ -0,0 +1,103 @@
+"""
+Caching of values derived from the content of a course, for as long as that content stays the same.
+"""
+from collections import OrderedDict
+import threading
+
+# Number of values each CourseVersionCache keeps in the memory of a process.
+DEFAULT_MAX_SIZE = 100
+
+_MISSING = object()
+
+
+def get_course_version(course):
+    """
+    Returns a string identifying the current version of the content of `course`,
+    for use in the keys of caches that hold data derived from the course
+    structure.  The version changes whenever anything in the course changes.
+
+    Returns None if the course's modulestore does not keep track of when its
+    content was edited (e.g. XML courses); such data should not be cached.
+    """
+    try:
+        edited_on = course.subtree_edited_on
+    except AttributeError:
+        return None
+    if edited_on is None:
+        return None
+    return edited_on.isoformat()
+
+
+class CourseVersionCache(object):
+    """
+    A cache of values computed from courses, keyed by the id and version of the
+    course (see get_course_version), so that a value is never returned once its
+    course has changed.
+
+    The most recently used values are kept in the memory of each process, up to
+    `max_size` of them.  If `shared` is True, values are also stored in the Django
+    cache under keys starting with `name`, so that other processes need not
+    compute them again; `serialize` and `deserialize` then convert values to and
+    from what is stored there, if values cannot be pickled as they are.
+
+    Values of courses without a version are computed on every call.
+    """
+    def __init__(self, name, max_size=DEFAULT_MAX_SIZE, shared=False, serialize=None, deserialize=None):
+        self.name = name
+        self.max_size = max_size
+        self.shared = shared
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, course, compute, *key_parts):
+        """
+        Returns the value for `course` and `key_parts`, calling compute() to compute
+        it if it is not cached for the current version of the course.
+        """
+        version = get_course_version(course)
+        if version is None:
+            return compute()
+
+        key = (course.id, version) + key_parts
+        with self._lock:
+            value = self._values.pop(key, _MISSING)
+            if value is not _MISSING:
+                # re-insert the value to mark it as the most recently used
+                self._values[key] = value
+                return value
+
+        if self.shared:
+            value = self._get_shared(key, compute)
+        else:
+            value = compute()
+
+        with self._lock:
+            self._values[key] = value
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+        return value
+
+    def _get_shared(self, key, compute):
+        """
+        Returns the value stored in the Django cache for `key`, computing and storing it if there is none.
+        """
+        # Imported here so that this module can be used outside of Django when no cache is shared.
+        from django.core.cache import cache
+
+        cache_key = u".".join([self.name] + [unicode(part) for part in key])
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return self.deserialize(stored) if self.deserialize else stored
+
+        value = compute()
+        cache.set(cache_key, self.serialize(value) if self.serialize else value)
+        return value
+
+    def clear(self):
+        """
+        Drops the values kept in the memory of this process.
+        """
+        with self._lock:
+            self._values.clear()
@@ -12,6 +12,9 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -19,8 +22,9 @@ from django.db import models, transaction
 from html_to_text import html_to_text
 from mail_utils import wrap_message
 
+from xmodule.modulestore.django import modulestore
 from xmodule_django.models import CourseKeyField
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import KEYWORD_FUNCTION_MAP, substitute_keywords, substitute_keywords_with_data
 
 log = logging.getLogger(__name__)
 
@@ -228,6 +232,125 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile(self, plaintext, htmltext, context):
+        """
+        Create a CompiledCourseEmail from the plain text and HTML bodies of an
+        email, rendering everything that is the same for all recipients up front.
+
+        `context` holds the values shared by all recipients; the values in
+        RECIPIENT_CONTEXT_KEYS are supplied later for each recipient.
+        """
+        return CompiledCourseEmail(self, plaintext, htmltext, context)
+
+
+# Context keys that differ between the recipients of a course email.
+RECIPIENT_CONTEXT_KEYS = frozenset(['name', 'email', 'user_id'])
+
+# Kinds of segments of a compiled email template.
+_LITERAL, _RECIPIENT_FIELD, _MESSAGE_BODY = range(3)
+
+
+class CompiledCourseEmail(object):
+    """
+    The plain text and HTML messages of a course email, with the templates
+    split into segments and everything that is the same for all recipients
+    already rendered.
+
+    render() only fills in the recipient-specific fields, and gives the same
+    messages as CourseEmailTemplate.render_plaintext and render_htmltext.
+    """
+    def __init__(self, template, plaintext, htmltext, context):
+        self._context = context
+        self._plaintext = plaintext
+        self._htmltext = htmltext
+        self._plain_segments = self._split(template.plain_template, context)
+        self._html_segments = self._split(template.html_template, context)
+
+        # Keyword substitution needs the recipient's User and the course, so only
+        # do it for bodies that actually contain keywords.
+        self._has_keywords = any(
+            keyword in plaintext or keyword in htmltext for keyword in KEYWORD_FUNCTION_MAP
+        )
+        self._course = None
+
+    @staticmethod
+    def _split(format_string, context):
+        """
+        Split format_string into a list of (kind, text) segments, rendering the
+        fields that don't depend on the recipient using context.
+        """
+        segments = []
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(format_string):
+            fields = []
+            if field_name is not None:
+                field = u'{' + field_name
+                if conversion:
+                    field += u'!' + conversion
+                if format_spec:
+                    field += u':' + format_spec
+                field += u'}'
+                if re.split(r'[.\[]', field_name, 1)[0] in RECIPIENT_CONTEXT_KEYS:
+                    fields.append((_RECIPIENT_FIELD, field))
+                else:
+                    literal_text += field.format(**context)
+
+            if segments and segments[-1][0] == _LITERAL:
+                segments[-1] = (_LITERAL, segments[-1][1] + literal_text)
+            else:
+                segments.append((_LITERAL, literal_text))
+            segments.extend(fields)
+
+        # Like CourseEmailTemplate._render, insert the body in place of the
+        # first (formatted) message body tag.
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        for index, (kind, text) in enumerate(segments):
+            if kind == _LITERAL and message_body_tag in text:
+                before, after = text.split(message_body_tag, 1)
+                segments[index:index + 1] = [(_LITERAL, before), (_MESSAGE_BODY, None), (_LITERAL, after)]
+                break
+        return segments
+
+    @staticmethod
+    def _join(segments, message_body, context):
+        """
+        Join segments into a message, filling in the recipient fields from context.
+        """
+        parts = []
+        for kind, text in segments:
+            if kind == _LITERAL:
+                parts.append(text)
+            elif kind == _RECIPIENT_FIELD:
+                parts.append(text.format(**context))
+            else:
+                parts.append(message_body)
+        return wrap_message(u''.join(parts))
+
+    def render(self, recipient_context):
+        """
+        Create the plain text and HTML messages for one recipient.
+
+        `recipient_context` holds the values of RECIPIENT_CONTEXT_KEYS for the
+        recipient.  Returns a (plaintext, html) tuple of unicode strings.
+        """
+        context = dict(self._context)
+        context.update(recipient_context)
+
+        plaintext = self._plaintext
+        htmltext = self._htmltext
+        user_id = context.get('user_id')
+        course_id = context.get('course_id')
+        if self._has_keywords and user_id is not None and course_id is not None:
+            user = User.objects.get(id=user_id)
+            if self._course is None:
+                self._course = modulestore().get_course(course_id, depth=0)
+            plaintext = substitute_keywords(plaintext, user, self._course)
+            htmltext = substitute_keywords(htmltext, user, self._course)
+
+        return (
+            self._join(self._plain_segments, plaintext, context),
+            self._join(self._html_segments, htmltext, context),
+        )
+
 
 class CourseAuthorization(models.Model):
     """
@@ -42,6 +42,7 @@ from instructor_task.models import InstructorTask
 from instructor_task.subtasks import (
     SubtaskStatus,
     queue_subtasks_for_query,
+    get_items_for_subtask,
     check_subtask_is_valid,
     update_subtask_status,
 )
@@ -91,7 +92,7 @@ BULK_EMAIL_FAILURE_ERRORS = (
 )
 
 
-def _get_recipient_queryset(user_id, to_option, course_id, course_location):
+def _get_recipient_queryset(user_id, to_option, course_id):
     """
     Returns a query set of email recipients corresponding to the requested to_option category.
 
@@ -134,6 +135,18 @@ def _get_recipient_queryset(user_id, to_option, course_id, course_location):
     return use_read_replica_if_available(recipient_qset)
 
 
+def _get_recipients_for_subtask(entry_id, email_id, recipient_bounds):
+    """
+    Returns the recipients of an email that fall within the `recipient_bounds` given to a subtask.
+
+    Each is represented as a dict with the 'profile__name', 'email' and 'pk' keys of the User.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    email_obj = CourseEmail.objects.get(id=email_id)
+    recipient_qset = _get_recipient_queryset(entry.requester_id, email_obj.to_option, email_obj.course_id)
+    return get_items_for_subtask(recipient_qset, ['profile__name', 'email'], recipient_bounds)
+
+
 def _get_course_email_context(course):
     """
     Returns context arguments to apply to all emails, independent of recipient.
@@ -213,24 +226,24 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     to_option = email_obj.to_option
     global_email_context = _get_course_email_context(course)
 
-    def _create_send_email_subtask(to_list, initial_subtask_status):
-        """Creates a subtask to send email to a given recipient list."""
+    def _create_send_email_subtask(recipient_bounds, initial_subtask_status):
+        """Creates a subtask to send email to the recipients within the given bounds."""
         subtask_id = initial_subtask_status.task_id
         new_subtask = send_course_email.subtask(
             (
                 entry_id,
                 email_id,
-                to_list,
+                None,
                 global_email_context,
                 initial_subtask_status.to_dict(),
             ),
+            {'recipient_bounds': recipient_bounds},
             task_id=subtask_id,
             routing_key=settings.BULK_EMAIL_ROUTING_KEY,
         )
         return new_subtask
 
-    recipient_qset = _get_recipient_queryset(user_id, to_option, course_id, course.location)
-    recipient_fields = ['profile__name', 'email']
+    recipient_qset = _get_recipient_queryset(user_id, to_option, course_id)
 
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s, to_option %s",
              task_id, course_id, email_id, to_option)
@@ -240,7 +253,6 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         action_name,
         _create_send_email_subtask,
         recipient_qset,
-        recipient_fields,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
     )
 
@@ -253,7 +265,7 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
 
 
 @task(default_retry_delay=settings.BULK_EMAIL_DEFAULT_RETRY_DELAY, max_retries=settings.BULK_EMAIL_MAX_RETRIES)  # pylint: disable=not-callable
-def send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status_dict):
+def send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status_dict, recipient_bounds=None):
     """
     Sends an email to a list of recipients.
 
@@ -264,6 +276,7 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
         - 'profile__name': full name of User.
         - 'email': email address of User.
         - 'pk': primary key of User model.
+        When None, the recipients are instead fetched using `recipient_bounds`.
       * `global_email_context`: dict containing values that are unique for this email but the same
         for all recipients of this email.  This dict is to be used to fill in slots in email
         template.  It does not include 'name' and 'email', which will be provided by the to_list.
@@ -283,15 +296,16 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
         Most values will be zero on initial call, but may be different when the task is
         invoked as part of a retry.
 
+      * `recipient_bounds`: (min_pk, max_pk) bounds on the User primary keys of the recipients,
+        as generated by queue_subtasks_for_query().  Only used on the initial call, since
+        retries are passed the list of recipients that remain to be sent to.
+
     Sends to all addresses contained in to_list that are not also in the Optout table.
     Emails are sent multi-part, in both plain text and html.  Updates InstructorTask object
     with status information (sends, failures, skips) and updates number of subtasks completed.
     """
     subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
     current_task_id = subtask_status.task_id
-    num_to_send = len(to_list)
-    log.info(u"Preparing to send email %s to %d recipients as subtask %s for instructor task %d: context = %s, status=%s",
-             email_id, num_to_send, current_task_id, entry_id, global_email_context, subtask_status)
 
     # Check that the requested subtask is actually known to the current InstructorTask entry.
     # If this fails, it throws an exception, which should fail this subtask immediately.
@@ -306,7 +320,14 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
 
     send_exception = None
     new_subtask_status = None
+    num_to_send = len(to_list) if to_list is not None else 0
     try:
+        if to_list is None:
+            to_list = _get_recipients_for_subtask(entry_id, email_id, recipient_bounds)
+            num_to_send = len(to_list)
+        log.info(u"Preparing to send email %s to %d recipients as subtask %s for instructor task %d: context = %s, status=%s",
+                 email_id, num_to_send, current_task_id, entry_id, global_email_context, subtask_status)
+
         course_title = global_email_context['course_title']
         with dog_stats_api.timer('course_email.single_task.time.overall', tags=[_statsd_tag(course_title)]):
             new_subtask_status, send_exception = _send_course_email(
@@ -449,9 +470,13 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         connection = get_connection()
         connection.open()
 
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
+        # Define context values to use in all course emails, and render everything
+        # that is the same for all recipients just once:
+        email_context = {'course_id': course_email.course_id}
         email_context.update(global_email_context)
+        compiled_email = course_email_template.compile(
+            course_email.text_message, course_email.html_message, email_context
+        )
 
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
@@ -461,14 +486,13 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             # yet been emailed, but not send to those who have already been sent to.
             current_recipient = to_list[-1]
             email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+
+            # Construct message content by filling in the user-specific values:
+            plaintext_msg, html_msg = compiled_email.render({
+                'email': email,
+                'name': current_recipient['profile__name'],
+                'user_id': current_recipient['pk'],
+            })
 
             # Create email:
             email_msg = EmailMultiAlternatives(
@@ -4,7 +4,7 @@ Unit tests for handling email sending errors
 """
 from itertools import cycle
 
-from celery.states import SUCCESS, RETRY
+from celery.states import SUCCESS, RETRY, FAILURE
 from django.test.utils import override_settings
 from django.conf import settings
 from django.core.management import call_command
@@ -330,3 +330,30 @@ class TestEmailErrors(ModuleStoreTestCase):
             # for the subtask, and it's not important to the test.
             with patch('bulk_email.tasks.update_subtask_status'):
                 send_course_email(entry_id, bogus_email_id, to_list, global_email_context, subtask_status.to_dict())
+
+    def test_send_email_completed_subtask_does_not_fetch_recipients(self):
+        entry = InstructorTask.create(self.course.id, "task_type", "task_key", "task_input", self.instructor)
+        entry_id = entry.id  # pylint: disable=no-member
+        subtask_id = "subtask-id-value"
+        initialize_subtask_info(entry, "emailed", 100, [subtask_id])
+        update_subtask_status(entry_id, subtask_id, SubtaskStatus.create(subtask_id, state=SUCCESS))
+        global_email_context = {'course_title': 'dummy course'}
+        new_subtask_status = SubtaskStatus.create(subtask_id)
+        with patch('bulk_email.tasks._get_recipients_for_subtask') as mock_get_recipients:
+            with self.assertRaisesRegexp(DuplicateTaskException, 'already completed'):
+                send_course_email(entry_id, 1001, None, global_email_context, new_subtask_status.to_dict(), (None, None))
+        self.assertFalse(mock_get_recipients.called)
+
+    def test_send_email_recipients_not_fetched(self):
+        entry = InstructorTask.create(self.course.id, "task_type", "task_key", "task_input", self.instructor)
+        entry_id = entry.id  # pylint: disable=no-member
+        subtask_id = "subtask-id-recipients-not-fetched"
+        initialize_subtask_info(entry, "emailed", 100, [subtask_id])
+        subtask_status = SubtaskStatus.create(subtask_id)
+        global_email_context = {'course_title': 'dummy course'}
+        with patch('bulk_email.tasks._get_recipients_for_subtask', side_effect=DatabaseError):
+            with patch('bulk_email.tasks.update_subtask_status') as mock_update_status:
+                with self.assertRaises(DatabaseError):
+                    send_course_email(entry_id, 1001, None, global_email_context, subtask_status.to_dict(), (None, None))
+        # The failure is recorded, so that the instructor task can still complete
+        self.assertEqual(mock_update_status.call_args[0][2].state, FAILURE)
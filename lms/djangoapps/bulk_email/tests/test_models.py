@@ -130,6 +130,19 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_email_matches_render(self):
+        recipient_context = {'email': 'your-email@test.com', 'name': u'Us{e}r N\xe4me'}
+        for name in (None, "branded.template"):
+            template = CourseEmailTemplate.get_template(name=name)
+            context = self._get_sample_html_context()
+            del context['email']
+            compiled = template.compile("My new plain text.", "My new html text.", context)
+            plaintext, htmltext = compiled.render(recipient_context)
+
+            context.update(recipient_context)
+            self.assertEqual(plaintext, template.render_plaintext("My new plain text.", context))
+            self.assertEqual(htmltext, template.render_htmltext("My new html text.", context))
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
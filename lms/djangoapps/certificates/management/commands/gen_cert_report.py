@@ -4,7 +4,7 @@ Generate a report of certificate statuses
 
 from django.core.management.base import BaseCommand, CommandError
 from certificates.models import GeneratedCertificate
-from django.contrib.auth.models import User
+from student.models import CourseEnrollment
 from optparse import make_option
 from django.conf import settings
 from opaque_keys import InvalidKeyError
@@ -61,29 +61,19 @@ class Command(BaseCommand):
         # find students who are active
         # number of enrolled students = downloadable + notpassing
         print "Looking up certificate states for {0}".format(options['course'])
-        enrolled_current = User.objects.filter(
-            courseenrollment__course_id=course_id,
-            courseenrollment__is_active=True
-        )
-        enrolled_total = User.objects.filter(
-            courseenrollment__course_id=course_id
-        )
-        verified_enrolled = GeneratedCertificate.objects.filter(
-            course_id__exact=course_id, mode__exact='verified'
-        )
-        honor_enrolled = GeneratedCertificate.objects.filter(
-            course_id__exact=course_id, mode__exact='honor'
-        )
-        audit_enrolled = GeneratedCertificate.objects.filter(
-            course_id__exact=course_id, mode__exact='audit'
-        )
+        enrollment_tally = dict(CourseEnrollment.objects.filter(
+            course_id=course_id
+        ).values_list('is_active').annotate(dcount=Count('id')).order_by())
+        mode_enrolled_tally = dict(GeneratedCertificate.objects.filter(
+            course_id__exact=course_id
+        ).values_list('mode').annotate(dcount=Count('id')).order_by())
 
         cert_data[course_id] = {
-            'enrolled_current': enrolled_current.count(),
-            'enrolled_total': enrolled_total.count(),
-            'verified_enrolled': verified_enrolled.count(),
-            'honor_enrolled': honor_enrolled.count(),
-            'audit_enrolled': audit_enrolled.count()
+            'enrolled_current': enrollment_tally.get(True, 0),
+            'enrolled_total': sum(enrollment_tally.values()),
+            'verified_enrolled': mode_enrolled_tally.get('verified', 0),
+            'honor_enrolled': mode_enrolled_tally.get('honor', 0),
+            'audit_enrolled': mode_enrolled_tally.get('audit', 0)
         }
 
         status_tally = GeneratedCertificate.objects.filter(
@@ -3,7 +3,7 @@ Management command to find all students that need certificates for
 courses that have finished, and put their cert requests on the queue.
 """
 from django.core.management.base import BaseCommand, CommandError
-from certificates.models import certificate_status_for_student
+from certificates.models import certificate_statuses_for_course
 from certificates.queue import XQueueCertInterface
 from django.contrib.auth.models import User
 from optparse import make_option
@@ -24,7 +24,10 @@ class Command(BaseCommand):
     Find all students that need certificates for courses that have finished and
     put their cert requests on the queue.
 
-    If --user is given, only grade and certify the requested username.
+    Students are processed in batches in order of their user id.  Each batch is
+    graded and put on the queue together, and the last user id of every batch is
+    printed so that an interrupted run can be resumed with --from-user-id.  Several
+    runs may share a course by each taking a different range of user ids.
 
     Use the --noop option to test without actually putting certificates on the
     queue to be generated.
@@ -55,6 +58,24 @@ class Command(BaseCommand):
                     'whose entry in the certificate table matches STATUS. '
                     'STATUS can be generating, unavailable, deleted, error '
                     'or notpassing.'),
+        make_option('--batch-size',
+                    metavar='SIZE',
+                    dest='batch_size',
+                    type='int',
+                    default=100,
+                    help='Number of students to grade and queue together'),
+        make_option('--from-user-id',
+                    metavar='USER_ID',
+                    dest='from_user_id',
+                    type='int',
+                    default=None,
+                    help='Only process students with a user id greater than USER_ID'),
+        make_option('--to-user-id',
+                    metavar='USER_ID',
+                    dest='to_user_id',
+                    type='int',
+                    default=None,
+                    help='Only process students with a user id up to and including USER_ID'),
     )
 
     def handle(self, *args, **options):
@@ -64,7 +85,7 @@ class Command(BaseCommand):
         # to something else with the force flag
 
         if options['force']:
-            valid_statuses = getattr(CertificateStatuses, options['force'])
+            valid_statuses = [getattr(CertificateStatuses, options['force'])]
         else:
             valid_statuses = [CertificateStatuses.unavailable]
 
@@ -89,33 +110,53 @@ class Command(BaseCommand):
 
             print "Fetching enrolled students for {0}".format(course_key.to_deprecated_string())
             enrolled_students = User.objects.filter(
-                courseenrollment__course_id=course_key)
+                courseenrollment__course_id=course_key).order_by('id')
+            if options['to_user_id'] is not None:
+                enrolled_students = enrolled_students.filter(id__lte=options['to_user_id'])
 
             xq = XQueueCertInterface()
             if options['insecure']:
                 xq.use_https = False
+            last_user_id = options['from_user_id']
+            if last_user_id is not None:
+                enrolled_students = enrolled_students.filter(id__gt=last_user_id)
             total = enrolled_students.count()
             count = 0
+            next_status = STATUS_INTERVAL
             start = datetime.datetime.now(UTC)
 
-            for student in enrolled_students:
-                count += 1
-                if count % STATUS_INTERVAL == 0:
+            while True:
+                students = enrolled_students
+                if last_user_id is not None:
+                    students = students.filter(id__gt=last_user_id)
+                students = list(students[:options['batch_size']])
+                if not students:
+                    break
+                count += len(students)
+                last_user_id = students[-1].id
+
+                statuses = certificate_statuses_for_course(course_key, students)
+                students = [
+                    student for student in students
+                    if statuses[student.id]['status'] in valid_statuses
+                ]
+                if students and not options['noop']:
+                    # Add the certificate requests to the queue
+                    ret = xq.add_certs(students, course_key, course=course)
+                    for student in students:
+                        if ret[student.id] == 'generating':
+                            print '{0} - {1}'.format(student, ret[student.id])
+
+                print "Processed students up to user id {0}".format(last_user_id)
+                if count >= next_status:
                     # Print a status update with an approximation of
                     # how much time is left based on how long the last
                     # interval took
                     diff = datetime.datetime.now(UTC) - start
-                    timeleft = diff * (total - count) / STATUS_INTERVAL
+                    timeleft = diff * (total - count) / (count - next_status + STATUS_INTERVAL)
                     hours, remainder = divmod(timeleft.seconds, 3600)
                     minutes, seconds = divmod(remainder, 60)
                     print "{0}/{1} completed ~{2:02}:{3:02}m remaining".format(
                         count, total, hours, minutes)
+                    next_status = count + STATUS_INTERVAL
                     start = datetime.datetime.now(UTC)
-
-                if certificate_status_for_student(
-                        student, course_key)['status'] in valid_statuses:
-                    if not options['noop']:
-                        # Add the certificate request to the queue
-                        ret = xq.add_cert(student, course_key, course=course)
-                        if ret == 'generating':
-                            print '{0} - {1}'.format(student, ret)
@@ -150,14 +150,59 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
-    return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+    return _certificate_status(None)
+
+
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Returns a dictionary mapping each of `course_ids` to what
+    certificate_status_for_student would return for `student` in that
+    course, looked up with a single query.
+    """
+    course_ids = list(course_ids)
+    certificates = dict(
+        (generated_certificate.course_id, generated_certificate)
+        for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids)
+    )
+    return dict(
+        (course_id, _certificate_status(certificates.get(course_id)))
+        for course_id in course_ids
+    )
+
+
+def certificate_statuses_for_course(course_id, students):
+    """
+    Returns a dictionary mapping the id of each of `students` to what
+    certificate_status_for_student would return for them in the course
+    with `course_id`, looked up with a single query.
+    """
+    students = list(students)
+    certificates = dict(
+        (generated_certificate.user_id, generated_certificate)
+        for generated_certificate in GeneratedCertificate.objects.filter(course_id=course_id, user__in=students)
+    )
+    return dict(
+        (student.id, _certificate_status(certificates.get(student.id)))
+        for student in students
+    )
+
+
+def _certificate_status(generated_certificate):
+    """
+    Returns the certificate status dictionary described by
+    certificate_status_for_student for `generated_certificate`, which
+    is None when the student has no certificate.
+    """
+    if generated_certificate is None:
+        return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+    return d
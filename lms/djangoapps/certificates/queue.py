@@ -1,5 +1,4 @@
 from certificates.models import GeneratedCertificate
-from certificates.models import certificate_status_for_student
 from certificates.models import CertificateStatuses as status
 from certificates.models import CertificateWhitelist
 
@@ -152,6 +151,20 @@ class XQueueCertInterface(object):
 
         Returns the student's status
         """
+        return self.add_certs([student], course_id, course, forced_grade, template_file)[student.id]
+
+    def add_certs(self, students, course_id, course=None, forced_grade=None, template_file=None):
+        """
+        Request new certificates for many students in a course at once.
+
+        Works as add_cert does for each of the students, except that what is
+        needed to know about the students (their certificates, profiles,
+        enrollment modes, whitelisting and verification) is looked up for all
+        of them together.  Students that could not be graded are logged and
+        keep their status.
+
+        Returns a dict mapping the id of each student to their status
+        """
 
         VALID_STATUSES = [status.generating,
                           status.unavailable,
@@ -159,31 +172,58 @@ class XQueueCertInterface(object):
                           status.error,
                           status.notpassing]
 
-        cert_status = certificate_status_for_student(student, course_id)['status']
-
-        new_status = cert_status
+        students = list(students)
+        certs = dict(
+            (cert.user_id, cert)
+            for cert in GeneratedCertificate.objects.filter(course_id=course_id, user__in=students)
+        )
+        new_statuses = dict(
+            (student.id, certs[student.id].status if student.id in certs else status.unavailable)
+            for student in students
+        )
 
-        if cert_status in VALID_STATUSES:
-            # grade the student
+        # grade the students whose certificates are in a valid status
+        candidates = [student for student in students if new_statuses[student.id] in VALID_STATUSES]
+        if not candidates:
+            return new_statuses
+        candidate_ids = [student.id for student in candidates]
 
-            # re-use the course passed in optionally so we don't have to re-fetch everything
-            # for every student
-            if course is None:
-                course = courses.get_course_by_id(course_id)
-            profile = UserProfile.objects.get(user=student)
-            profile_name = profile.name
+        # re-use the course passed in optionally so we don't have to re-fetch everything
+        # for every student
+        if course is None:
+            course = courses.get_course_by_id(course_id)
+        course_name = course.display_name or course_id.to_deprecated_string()
 
+        profiles = dict(
+            (profile.user_id, profile) for profile in UserProfile.objects.filter(user__in=candidate_ids)
+        )
+        whitelisted_ids = set(self.whitelist.filter(
+            user__in=candidate_ids, course_id=course_id, whitelist=True
+        ).values_list('user_id', flat=True))
+        restricted_ids = set(self.restricted.filter(user__in=candidate_ids).values_list('user_id', flat=True))
+        enrollment_modes = dict(CourseEnrollment.objects.filter(
+            user__in=candidate_ids, course_id=course_id
+        ).values_list('user_id', 'mode'))
+        verified_ids = SoftwareSecurePhotoVerification.verified_user_ids(candidate_ids)
+        reverified_ids = SoftwareSecurePhotoVerification.reverified_for_all_user_ids(course_id, candidate_ids)
+
+        for student in candidates:
             # Needed
             self.request.user = student
             self.request.session = {}
 
-            course_name = course.display_name or course_id.to_deprecated_string()
-            is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
-            grade = grades.grade(student, self.request, course)
-            enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+            try:
+                grade = grades.grade(student, self.request, course)
+            except Exception:  # pylint: disable=broad-except
+                # Keep going with the other students, but log it for future reference.
+                logger.exception(u"Could not grade %s for a certificate in %s", student.username, course_id)
+                continue
+            profile_name = profiles[student.id].name
+
+            enrollment_mode = enrollment_modes.get(student.id)
             mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
-            user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
-            user_is_reverified = SoftwareSecurePhotoVerification.user_is_reverified_for_all(course_id, student)
+            user_is_verified = student.id in verified_ids
+            user_is_reverified = student.id in reverified_ids
             cert_mode = enrollment_mode
             if (mode_is_verified and user_is_verified and user_is_reverified):
                 template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
@@ -196,7 +236,9 @@ class XQueueCertInterface(object):
             if forced_grade:
                 grade['grade'] = forced_grade
 
-            cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+            cert = certs.get(student.id)
+            if cert is None:
+                cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
 
             cert.mode = cert_mode
             cert.user = student
@@ -211,16 +253,16 @@ class XQueueCertInterface(object):
                 #   Despite blowing up the xml parser, bad values here are fine
                 grade_contents = None
 
-            if is_whitelisted or grade_contents is not None:
+            if student.id in whitelisted_ids or grade_contents is not None:
 
                 # check to see whether the student is on the
                 # the embargoed country restricted list
                 # otherwise, put a new certificate request
                 # on the queue
 
-                if self.restricted.filter(user=student).exists():
-                    new_status = status.restricted
-                    cert.status = new_status
+                if student.id in restricted_ids:
+                    new_statuses[student.id] = status.restricted
+                    cert.status = status.restricted
                     cert.save()
                 else:
                     key = make_hashkey(random.random())
@@ -236,16 +278,16 @@ class XQueueCertInterface(object):
                     }
                     if template_file:
                         contents['template_pdf'] = template_file
-                    new_status = status.generating
-                    cert.status = new_status
+                    new_statuses[student.id] = status.generating
+                    cert.status = status.generating
                     cert.save()
                     self._send_to_xqueue(contents, key)
             else:
-                cert_status = status.notpassing
-                cert.status = cert_status
+                new_statuses[student.id] = status.notpassing
+                cert.status = status.notpassing
                 cert.save()
 
-        return new_status
+        return new_statuses
 
     def _send_to_xqueue(self, contents, key):
 
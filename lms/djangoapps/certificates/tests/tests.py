@@ -3,12 +3,19 @@ Tests for the certificates models.
 """
 
 from django.test import TestCase
+from mock import patch
 
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
+from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
-from certificates.models import CertificateStatuses, GeneratedCertificate, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses, GeneratedCertificate, certificate_status_for_student,
+    certificate_statuses_for_student, certificate_statuses_for_course
+)
+from certificates.queue import XQueueCertInterface
+from courseware.tests.factories import GlobalStaffFactory, StaffFactory
 
 
 class CertificatesModelTest(ModuleStoreTestCase):
@@ -23,3 +30,87 @@ class CertificatesModelTest(ModuleStoreTestCase):
         certificate_status = certificate_status_for_student(student, course.id)
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
+
+    def test_certificate_statuses_in_bulk(self):
+        student, other_student = UserFactory(), UserFactory()
+        course = CourseFactory.create(org='edx', number='certified', display_name='Certified Course')
+        other_course = CourseFactory.create(org='edx', number='uncertified', display_name='Uncertified Course')
+        GeneratedCertificate.objects.create(
+            user=student, course_id=course.id, status=CertificateStatuses.downloadable,
+            download_url='http://www.example.com/certificate.pdf', grade='0.75'
+        )
+
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_student(student, [course.id, other_course.id])
+        self.assertEqual(statuses, {
+            course.id: certificate_status_for_student(student, course.id),
+            other_course.id: certificate_status_for_student(student, other_course.id),
+        })
+        self.assertEqual(statuses[course.id]['download_url'], 'http://www.example.com/certificate.pdf')
+
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_course(course.id, [student, other_student])
+        self.assertEqual(statuses[student.id]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(statuses[other_student.id]['status'], CertificateStatuses.unavailable)
+
+
+class XQueueCertInterfaceTest(ModuleStoreTestCase):
+    """
+    Tests for requesting certificates through XQueueCertInterface
+    """
+
+    def test_add_certs(self):
+        course = CourseFactory.create(org='edx', number='bulk', display_name='Bulk Course')
+        passing, failing, restricted, downloadable = students = [UserFactory() for __ in range(4)]
+        for student in students:
+            CourseEnrollment.enroll(student, course.id)
+        restricted.profile.allow_certificate = False
+        restricted.profile.save()
+        GeneratedCertificate.objects.create(
+            user=downloadable, course_id=course.id, status=CertificateStatuses.downloadable
+        )
+
+        def grade(student, request, course):  # pylint: disable=unused-argument
+            """ Passes every student but `failing`. """
+            return {'grade': None if student == failing else 'Pass', 'percent': 0.5}
+
+        xqueue = XQueueCertInterface()
+        with patch('certificates.queue.grades.grade', side_effect=grade) as mock_grade:
+            with patch.object(xqueue, '_send_to_xqueue') as mock_send:
+                statuses = xqueue.add_certs(students, course.id, course=course)
+
+        # Students with a downloadable certificate are not graded again
+        self.assertEqual([call_args[0][0] for call_args in mock_grade.call_args_list], [passing, failing, restricted])
+        self.assertEqual(statuses, {
+            passing.id: CertificateStatuses.generating,
+            failing.id: CertificateStatuses.notpassing,
+            restricted.id: CertificateStatuses.restricted,
+            downloadable.id: CertificateStatuses.downloadable,
+        })
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual(mock_send.call_args[0][0]['username'], passing.username)
+        for student in (passing, failing, restricted):
+            self.assertEqual(
+                certificate_status_for_student(student, course.id)['status'], statuses[student.id]
+            )
+
+    def test_add_certs_for_staff(self):
+        course = CourseFactory.create(org='edx', number='staff', display_name='Staff Course')
+        chapter = ItemFactory.create(category='chapter', parent_location=course.location)
+        section = ItemFactory.create(
+            category='sequential', parent_location=chapter.location, graded=True, format='Homework'
+        )
+        ItemFactory.create(category='problem', parent_location=section.location)
+        course = self.store.get_course(course.id, depth=None)
+        students = [StaffFactory(course_key=course.id), GlobalStaffFactory()]
+        for student in students:
+            CourseEnrollment.enroll(student, course.id)
+
+        xqueue = XQueueCertInterface()
+        with patch.object(xqueue, '_send_to_xqueue') as mock_send:
+            statuses = xqueue.add_certs(students, course.id, course=course)
+
+        # Staff are graded like anyone else, rather than failing to grade
+        for student in students:
+            self.assertEqual(statuses[student.id], CertificateStatuses.notpassing)
+        self.assertFalse(mock_send.called)
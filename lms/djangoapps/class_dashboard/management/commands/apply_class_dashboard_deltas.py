@@ -0,0 +1,22 @@
+"""
+Management command to apply the deltas recorded by StudentModule saves to the
+aggregates of the Metrics tab of the instructor dashboard.
+"""
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand
+
+from class_dashboard.models import apply_all_deltas
+
+
+class Command(BaseCommand):
+    """
+    Apply the deltas waiting for the class dashboard aggregates of every course.
+
+    Should be run periodically, so that deltas of courses whose metrics are
+    rarely looked at do not pile up.
+    """
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        apply_all_deltas()
@@ -0,0 +1,288 @@
+"""
+Aggregates of StudentModule data for the Metrics tab of the instructor dashboard.
+
+Grouping the StudentModule rows of a course on every dashboard load is among the
+heaviest queries run against the database, so the grade and open counts are kept
+here instead.  They are built from StudentModule the first time the metrics of a
+course are asked for, and kept up to date as StudentModules are saved and deleted
+from then on.  Deleting the AggregatedCourse row of a course has its aggregates
+rebuilt on the next read.
+
+Saving a StudentModule does not update the counts, which are shared by every
+student of a problem and would have submissions of the problem wait on each
+other's transactions.  It only inserts an AggregateDelta, and the deltas of a
+course are applied to its counts the next time they are read, or by the
+apply_class_dashboard_deltas management command, which should be run
+periodically so that deltas do not pile up.
+
+Aggregates are only kept up to date while the CLASS_DASHBOARD feature is enabled,
+so the AggregatedCourse rows should be deleted when re-enabling it.
+"""
+from datetime import timedelta
+from collections import Counter
+
+from django.conf import settings
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from courseware.models import StudentModule
+from opaque_keys.edx.keys import CourseKey
+from xmodule_django.models import CourseKeyField, LocationKeyField
+
+# Number of deltas deleted with each query once they have been applied.
+DELTA_DELETE_CHUNK_SIZE = 1000
+
+# Deltas of courses without aggregates are kept this long, in case the aggregates
+# of the course are being built from StudentModule rows that did not have them yet.
+UNAGGREGATED_DELTA_MAX_AGE = timedelta(days=1)
+
+
+class AggregatedCourse(models.Model):
+    """
+    Marks a course whose aggregates have been built from StudentModule.
+    """
+    course_id = CourseKeyField(max_length=255, primary_key=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+
+class ProblemGradeCount(models.Model):
+    """
+    The number of students with a particular grade on a problem.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField()
+    max_grade = models.FloatField(null=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade'),)
+
+
+class SequentialOpenCount(models.Model):
+    """
+    The number of students that have opened a subsection.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'module_state_key'),)
+
+
+class AggregateDelta(models.Model):
+    """
+    A change to a ProblemGradeCount (when `grade` is set) or to a
+    SequentialOpenCount (when it is not), waiting to be applied to it.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField(null=True)
+    max_grade = models.FloatField(null=True)
+    delta = models.IntegerField()
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+def ensure_course_aggregates(course_id):
+    """
+    Builds the aggregates of the course with `course_id`, unless they have been
+    built already, in which case the deltas waiting for them are applied.
+    """
+    if AggregatedCourse.objects.filter(course_id=course_id).exists():
+        apply_course_deltas(course_id)
+    else:
+        rebuild_course_aggregates(course_id)
+
+
+@transaction.commit_on_success
+def rebuild_course_aggregates(course_id):
+    """
+    Replaces the aggregates of the course with `course_id` with counts taken from StudentModule.
+
+    The counts are taken from the primary database: a replica could miss saves
+    whose deltas are dropped here.
+    """
+    # Keep other processes from building or applying deltas to the aggregates meanwhile.
+    list(AggregatedCourse.objects.select_for_update().filter(course_id=course_id))
+
+    # The deltas of every save seen by the queries below are now reflected in the counts.
+    # Deltas are read before StudentModule so that any delta read has its save seen.
+    delta_ids = list(AggregateDelta.objects.filter(course_id=course_id).values_list('id', flat=True))
+
+    ProblemGradeCount.objects.filter(course_id=course_id).delete()
+    SequentialOpenCount.objects.filter(course_id=course_id).delete()
+
+    grade_query = StudentModule.objects.filter(
+        course_id__exact=course_id,
+        grade__isnull=False,
+        module_type__exact="problem",
+    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    ProblemGradeCount.objects.bulk_create([
+        ProblemGradeCount(
+            course_id=course_id,
+            module_state_key=row['module_state_key'],
+            grade=row['grade'],
+            max_grade=row['max_grade'],
+            count=row['count_grade'],
+        )
+        for row in grade_query
+    ])
+
+    open_query = StudentModule.objects.filter(
+        course_id__exact=course_id,
+        module_type__exact="sequential",
+    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    SequentialOpenCount.objects.bulk_create([
+        SequentialOpenCount(
+            course_id=course_id,
+            module_state_key=row['module_state_key'],
+            count=row['count_sequential'],
+        )
+        for row in open_query
+    ])
+
+    _delete_deltas(delta_ids)
+    AggregatedCourse.objects.get_or_create(course_id=course_id)
+
+
+@transaction.commit_on_success
+def apply_course_deltas(course_id):
+    """
+    Applies the deltas waiting for the aggregates of the course with `course_id` to its counts.
+    """
+    # Keep other processes from applying the same deltas meanwhile.
+    if not list(AggregatedCourse.objects.select_for_update().filter(course_id=course_id)):
+        return
+
+    delta_ids = []
+    totals = Counter()
+    for delta in AggregateDelta.objects.filter(course_id=course_id):
+        delta_ids.append(delta.id)
+        totals[(delta.module_state_key, delta.grade, delta.max_grade)] += delta.delta
+
+    for (module_state_key, grade, max_grade), delta in totals.iteritems():
+        if not delta:
+            continue
+        if grade is None:
+            _adjust_count(SequentialOpenCount, delta, course_id=course_id, module_state_key=module_state_key)
+        else:
+            _adjust_count(
+                ProblemGradeCount,
+                delta,
+                course_id=course_id,
+                module_state_key=module_state_key,
+                grade=grade,
+                max_grade=max_grade,
+            )
+    _delete_deltas(delta_ids)
+
+
+def apply_all_deltas():
+    """
+    Applies the deltas waiting for the aggregates of every course, and deletes old
+    deltas of courses without aggregates, which are not needed to build them.
+    """
+    # values_list gives the course ids as stored, rather than as CourseKeys
+    course_ids = set(AggregateDelta.objects.values_list('course_id', flat=True).distinct())
+    aggregated_course_ids = [
+        CourseKey.from_string(course_id) for course_id in AggregatedCourse.objects.values_list('course_id', flat=True)
+    ]
+    for course_id in aggregated_course_ids:
+        if unicode(course_id) in course_ids:
+            apply_course_deltas(course_id)
+    AggregateDelta.objects.exclude(course_id__in=aggregated_course_ids).filter(
+        created__lt=timezone.now() - UNAGGREGATED_DELTA_MAX_AGE
+    ).delete()
+
+
+def _delete_deltas(delta_ids):
+    """
+    Deletes the deltas with the given ids.  Only deltas that have been read are deleted by id,
+    since deltas of transactions that have not committed yet may have lower ids.
+    """
+    for index in range(0, len(delta_ids), DELTA_DELETE_CHUNK_SIZE):
+        AggregateDelta.objects.filter(id__in=delta_ids[index:index + DELTA_DELETE_CHUNK_SIZE]).delete()
+
+
+def _aggregates_enabled():
+    """
+    Returns whether aggregates are being kept up to date, which they are while the Metrics tab is enabled.
+    """
+    return settings.FEATURES.get('CLASS_DASHBOARD', False)
+
+
+def _adjust_count(model, delta, **fields):
+    """
+    Adds `delta` to the count of the `model` row with the given `fields`, creating the row if needed.
+    """
+    if model.objects.filter(**fields).update(count=F('count') + delta):
+        return
+    try:
+        model.objects.create(count=delta, **fields)
+    except IntegrityError:
+        # Another process created the row first; add to its count instead.
+        model.objects.filter(**fields).update(count=F('count') + delta)
+
+
+def _add_delta(student_module, delta, grade=None, max_grade=None):
+    """
+    Records a change of `delta` to the count of the sequential of `student_module`,
+    or, if `grade` is given, to the number of students with that grade on its problem.
+    """
+    AggregateDelta.objects.create(
+        course_id=student_module.course_id,
+        module_state_key=student_module.module_state_key,
+        grade=grade,
+        max_grade=max_grade,
+        delta=delta,
+    )
+
+
+@receiver(post_init, sender=StudentModule)
+def _remember_student_module_grade(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remembers the grade a StudentModule was loaded with, so that saving it can
+    move the student from their old grade's count to their new one.
+    """
+    if _aggregates_enabled():
+        instance._aggregated_grade = (instance.grade, instance.max_grade)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=StudentModule)
+def _update_aggregates_on_save(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the aggregates of the course of a StudentModule that was saved.
+    """
+    if not _aggregates_enabled():
+        return
+    if instance.module_type == 'sequential':
+        if created:
+            _add_delta(instance, 1)
+    elif instance.module_type == 'problem':
+        new_grade = (instance.grade, instance.max_grade)
+        old_grade = None if created else getattr(instance, '_aggregated_grade', new_grade)
+        if old_grade != new_grade:
+            if old_grade is not None and old_grade[0] is not None:
+                _add_delta(instance, -1, *old_grade)
+            if new_grade[0] is not None:
+                _add_delta(instance, 1, *new_grade)
+        instance._aggregated_grade = new_grade  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=StudentModule)
+def _update_aggregates_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the aggregates of the course of a StudentModule that was deleted.
+    """
+    if not _aggregates_enabled():
+        return
+    if instance.module_type == 'sequential':
+        _add_delta(instance, -1)
+    elif instance.module_type == 'problem':
+        grade, max_grade = getattr(instance, '_aggregated_grade', (instance.grade, instance.max_grade))
+        if grade is not None:
+            _add_delta(instance, -1, grade, max_grade)
@@ -11,6 +11,7 @@ from mock import patch
 
 from capa.tests.response_xml_factory import StringResponseXMLFactory
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MOCK_MODULESTORE
+from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory, AdminFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
@@ -22,6 +23,7 @@ from class_dashboard.dashboard_data import (get_problem_grade_distribution, get_
                                             get_section_display_name, get_array_section_has_problem,
                                             get_students_opened_subsection, get_students_problem_grades,
                                             )
+from class_dashboard.models import AggregateDelta
 from class_dashboard.views import has_instructor_access_for_class
 
 USER_COUNT = 11
@@ -104,6 +106,28 @@ class TestGetProblemGradeDistribution(ModuleStoreTestCase):
         for val in total_student_count.values():
             self.assertEquals(USER_COUNT, val)
 
+    def test_problem_grade_distribution_follows_saves(self):
+
+        get_problem_grade_distribution(self.course.id)
+
+        # The first user had a grade of 0 on the last problem, as did all but the last user.
+        student_module = StudentModule.objects.get(student=self.users[0], module_state_key=self.item.location)
+        student_module.grade = 1
+        student_module.max_grade = 1
+        # The shared counts are left alone: the save only records its deltas
+        student_module.save()
+        self.assertEqual(AggregateDelta.objects.filter(course_id=self.course.id).count(), 2)
+
+        with patch('class_dashboard.models.rebuild_course_aggregates') as mock_rebuild:
+            prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course.id)
+        self.assertFalse(mock_rebuild.called)
+        self.assertFalse(AggregateDelta.objects.filter(course_id=self.course.id).exists())
+        self.assertEquals(
+            sorted(prob_grade_distrib[self.item.location]['grade_distrib']),
+            [(0, USER_COUNT - 2), (1, 2)]
+        )
+        self.assertEquals(USER_COUNT, total_student_count[self.item.location])
+
     def test_get_sequential_open_distibution(self):
 
         sequential_open_distrib = get_sequential_open_distrib(self.course.id)
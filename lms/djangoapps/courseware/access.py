@@ -26,6 +26,7 @@ from student.roles import (
 )
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from opaque_keys.edx.keys import CourseKey, UsageKey
+from openedx.core.djangoapps.course_overviews.models import CourseOverview
 DEBUG_ACCESS = False
 
 log = logging.getLogger(__name__)
@@ -52,7 +53,7 @@ def has_access(user, action, obj, course_key=None):
     user: a Django user object. May be anonymous. If none is passed,
                     anonymous is assumed
 
-    obj: The object to check access for.  A module, descriptor, location, or
+    obj: The object to check access for.  A module, descriptor, course overview, location, or
                     certain special strings (e.g. 'global')
 
     action: A string specifying the action that the client is trying to perform.
@@ -76,6 +77,10 @@ def has_access(user, action, obj, course_key=None):
     if isinstance(obj, CourseDescriptor):
         return _has_access_course_desc(user, action, obj)
 
+    # A CourseOverview carries the course-level fields these checks need
+    if isinstance(obj, CourseOverview):
+        return _has_access_course_desc(user, action, obj)
+
     if isinstance(obj, ErrorDescriptor):
         return _has_access_error_desc(user, action, obj, course_key)
 
@@ -329,7 +334,8 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
             return True
 
         # Check start date
-        if 'detached' not in descriptor._class_tags and descriptor.start is not None:
+        # CourseOverviews are not XBlocks and have no class tags
+        if 'detached' not in getattr(descriptor, '_class_tags', ()) and descriptor.start is not None:
             now = datetime.now(UTC())
             effective_start = _adjust_start_date_for_beta_testers(
                 user,
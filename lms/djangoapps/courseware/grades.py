@@ -1,8 +1,9 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
-from collections import defaultdict
+from collections import defaultdict, namedtuple, Counter
 import json
 import random
+import re
 import logging
 
 from contextlib import contextmanager
@@ -19,14 +20,26 @@ from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.util.course_version import CourseVersionCache
 from xmodule.util.duedate import get_extended_due_date
 from .models import StudentModule
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import UsageKey
 
 log = logging.getLogger("edx.courseware")
 
+# A graded section of a course, as needed to grade students:
+#   location: the usage key of the section
+#   display_name: the display name of the section
+#   scored_locations: the usage keys of the section and of all the descendants
+#       with scores that could possibly be in it, for any student
+#   always_recalculate_grades: whether any of those must always be graded
+GradedSection = namedtuple(
+    'GradedSection', ['location', 'display_name', 'scored_locations', 'always_recalculate_grades']
+)
+
 
 def yield_dynamic_descriptor_descendents(descriptor, module_creator):
     """
@@ -51,6 +64,137 @@ def yield_dynamic_descriptor_descendents(descriptor, module_creator):
         yield next_descriptor
 
 
+# Matches "student_answers" followed by a colon.  A match need not be a key of
+# that name: its first quote may be escaped within a longer key, and the key may
+# be in a nested object.  _top_level_student_answers checks both.
+STUDENT_ANSWERS_KEY_RE = re.compile(r'"student_answers"\s*:\s*')
+
+# Matches a JSON string or bracket, to walk a JSON document without decoding it.
+JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+
+def _top_level_student_answers(state):
+    """
+    Return the position of the value of the "student_answers" key of the
+    outermost object of the JSON-serialized problem `state`, or None if that
+    object has no such key.
+    """
+    depth = 0
+    for token in JSON_TOKEN_RE.finditer(state):
+        text = token.group()
+        if text in ('{', '['):
+            depth += 1
+        elif text in ('}', ']'):
+            depth -= 1
+        elif depth == 1:
+            key_match = STUDENT_ANSWERS_KEY_RE.match(state, token.start())
+            if key_match:
+                return key_match.end()
+    return None
+
+
+def _student_answers_from_state(state):
+    """
+    Return the dict of student answers held in the JSON-serialized problem `state`.
+
+    When the state has a top-level "student_answers" key, only its value is
+    decoded, rather than the whole (potentially large) state. Otherwise the
+    whole state is decoded.
+
+    Raises:
+        ValueError: if the state cannot be decoded
+    """
+    if not state:
+        return {}
+
+    position = _top_level_student_answers(state) if STUDENT_ANSWERS_KEY_RE.search(state) else None
+    if position is not None:
+        raw_answers, __ = json.JSONDecoder().raw_decode(state, position)
+    else:
+        raw_answers = json.loads(state).get("student_answers", {})
+
+    return raw_answers if isinstance(raw_answers, dict) else {}
+
+
+def graded_sections_for_course(course):
+    """
+    Returns the graded sections of `course`, in the form of a dictionary
+    mapping each section format to a list of `GradedSection`s.
+
+    This is a compact version of `course.grading_context['graded_sections']`,
+    which holds usage keys rather than descriptors.  It is computed once for
+    each version of the course and cached across processes, so that grading
+    does not need to walk every graded section of the course in each new
+    runtime.  Descriptors only need to be loaded for the sections that a
+    particular student actually has to be graded on.
+    """
+    return _GRADED_SECTIONS.get(course, lambda: _compute_graded_sections(course))
+
+
+def _serialize_graded_sections(graded_sections):
+    """
+    Converts `graded_sections` to plain values, for storing in the cache.
+    """
+    return {
+        section_format: [
+            (
+                unicode(section.location),
+                section.display_name,
+                [unicode(location) for location in section.scored_locations],
+                section.always_recalculate_grades,
+            )
+            for section in sections
+        ]
+        for section_format, sections in graded_sections.iteritems()
+    }
+
+
+def _deserialize_graded_sections(serialized_sections):
+    """
+    Converts what _serialize_graded_sections returns back to graded sections.
+    """
+    return {
+        section_format: [
+            GradedSection(
+                UsageKey.from_string(location),
+                display_name,
+                [UsageKey.from_string(scored_location) for scored_location in scored_locations],
+                always_recalculate_grades,
+            )
+            for location, display_name, scored_locations, always_recalculate_grades in sections
+        ]
+        for section_format, sections in serialized_sections.iteritems()
+    }
+
+
+_GRADED_SECTIONS = CourseVersionCache(
+    u"courseware.grades.graded_sections",
+    shared=True,
+    serialize=_serialize_graded_sections,
+    deserialize=_deserialize_graded_sections,
+)
+
+
+def _compute_graded_sections(course):
+    """
+    Computes the graded sections of `course` from its grading context.
+
+    See `graded_sections_for_course`.
+    """
+    return {
+        section_format: [
+            GradedSection(
+                section['section_descriptor'].location,
+                section['section_descriptor'].display_name_with_default,
+                [descriptor.location for descriptor in section['xmoduledescriptors']],
+                any(descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']),
+            )
+            for section in sections
+        ]
+        for section_format, sections in course.grading_context['graded_sections'].iteritems()
+    }
+
+
 def answer_distributions(course_key):
     """
     Given a course_key, return answer distributions in the form of a dictionary
@@ -81,7 +225,13 @@ def answer_distributions(course_key):
     This method will try to use a read-replica database if one is available.
     """
     # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    # Filled in with every problem in the course at once, so that the
+    # modulestore is only asked about problems individually when they are not
+    # found in the course (e.g. because they have since been deleted).
+    state_keys_to_problem_info = {
+        problem.location: (problem.url_name, problem.display_name_with_default)
+        for problem in modulestore().get_items(course_key, qualifiers={'category': 'problem'})
+    }
 
     def url_and_display_name(usage_key):
         """
@@ -101,22 +251,33 @@ def answer_distributions(course_key):
 
         return state_keys_to_problem_info[usage_key]
 
+    # dict: { raw module_state_key string : usage key mapped into this course }
+    usage_keys = {}
+
     # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
-    answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
+    # order, and build up our answer_counts dict that we will eventually return.
+    # Rows are streamed as tuples rather than loaded as model instances.
+    answer_counts = defaultdict(Counter)
+    submitted_problems = StudentModule.all_submitted_problems_read_only(course_key).values_list(
+        'id', 'student_id', 'module_state_key', 'state'
+    )
+    for module_id, student_id, module_state_key, state in submitted_problems.iterator():
         try:
-            state_dict = json.loads(module.state) if module.state else {}
-            raw_answers = state_dict.get("student_answers", {})
+            raw_answers = _student_answers_from_state(state)
         except ValueError:
             log.error(
                 "Answer Distribution: Could not parse module state for " +
-                "StudentModule id={}, course={}".format(module.id, course_key)
+                "StudentModule id={}, course={}".format(module_id, course_key)
             )
             continue
 
+        if not raw_answers:
+            continue
+
         try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
+            if module_state_key not in usage_keys:
+                usage_keys[module_state_key] = UsageKey.from_string(module_state_key).map_into_course(course_key)
+            url, display_name = url_and_display_name(usage_keys[module_state_key])
             # Each problem part has an ID that is derived from the
             # module.module_state_key (with some suffix appended)
             for problem_part_id, raw_answer in raw_answers.items():
@@ -134,7 +295,7 @@ def answer_distributions(course_key):
                   "was later deleted from the course. This answer will be " + \
                   "omitted from the answer distribution CSV."
             log.warning(
-                msg.format(module.module_state_key, module.id, module.student_id, course_key)
+                msg.format(module_state_key, module_id, student_id, course_key)
             )
             continue
 
@@ -172,7 +333,7 @@ def _grade(student, request, course, keep_raw_scores):
 
     More information on the format is in the docstring for CourseGrader.
     """
-    grading_context = course.grading_context
+    graded_sections = graded_sections_for_course(course)
     raw_scores = []
 
     # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
@@ -182,44 +343,48 @@ def _grade(student, request, course, keep_raw_scores):
         course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
     )
 
+    # Dict of section locations -> section descriptors, loaded when the first
+    # section that has to be graded is found
+    section_descriptors = {}
+
     totaled_scores = {}
     # This next complicated loop is just to collect the totaled_scores, which is
     # passed to the grader
-    for section_format, sections in grading_context['graded_sections'].iteritems():
+    for section_format, sections in graded_sections.iteritems():
         format_scores = []
         for section in sections:
-            section_descriptor = section['section_descriptor']
-            section_name = section_descriptor.display_name_with_default
+            section_name = section.display_name
 
             # some problems have state that is updated independently of interaction
             # with the LMS, so they need to always be scored. (E.g. foldit.,
             # combinedopenended)
-            should_grade_section = any(
-                descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
-            )
+            should_grade_section = section.always_recalculate_grades
 
             # If there are no problems that always have to be regraded, check to
             # see if any of our locations are in the scores from the submissions
             # API. If scores exist, we have to calculate grades for this section.
-            if not should_grade_section:
+            if not should_grade_section and submissions_scores:
                 should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
-                    for descriptor in section['xmoduledescriptors']
+                    location.to_deprecated_string() in submissions_scores
+                    for location in section.scored_locations
                 )
 
             if not should_grade_section:
                 with manual_transaction():
                     should_grade_section = StudentModule.objects.filter(
                         student=student,
-                        module_state_key__in=[
-                            descriptor.location for descriptor in section['xmoduledescriptors']
-                        ]
+                        module_state_key__in=section.scored_locations
                     ).exists()
 
             # If we haven't seen a single problem in the section, we don't have
             # to grade it at all! We can assume 0%
             if should_grade_section:
                 scores = []
+                if not section_descriptors:
+                    section_descriptors = _get_section_descriptors(course)
+                section_descriptor = section_descriptors.get(section.location)
+                if section_descriptor is None:
+                    section_descriptor = modulestore().get_item(section.location)
 
                 def create_module(descriptor):
                     '''creates an XModule instance given a descriptor'''
@@ -262,7 +427,7 @@ def _grade(student, request, course, keep_raw_scores):
             else:
                 log.info(
                     "Unable to grade a section with a total possible score of zero. " +
-                    str(section_descriptor.location)
+                    str(section.location)
                 )
 
         totaled_scores[section_format] = format_scores
@@ -283,6 +448,18 @@ def _grade(student, request, course, keep_raw_scores):
     return grade_summary
 
 
+def _get_section_descriptors(course):
+    """
+    Returns a dictionary mapping the location of each section of `course` to
+    its descriptor.
+    """
+    return {
+        section.location: section
+        for chapter in course.get_children()
+        for section in chapter.get_children()
+    }
+
+
 def grade_for_percentage(grade_cutoffs, percentage):
     """
     Returns a letter grade as defined in grading_policy (e.g. 'A' 'B' 'C' for 6.002x) or None.
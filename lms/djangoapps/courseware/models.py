@@ -13,11 +13,11 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
 from django.contrib.auth.models import User
-from django.conf import settings
 from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from util.query import use_read_replica_if_available
 from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField
 
 
@@ -73,10 +73,7 @@ class StudentModule(models.Model):
             module_type='problem',
             grade__isnull=False
         )
-        if "read_replica" in settings.DATABASES:
-            return queryset.using("read_replica")
-        else:
-            return queryset
+        return use_read_replica_if_available(queryset)
 
     def __repr__(self):
         return 'StudentModule<%r>' % ({
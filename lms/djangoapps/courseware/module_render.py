@@ -1,6 +1,7 @@
 import json
 import logging
 import mimetypes
+from datetime import datetime
 
 import static_replace
 import xblock.reference.plugins
@@ -9,6 +10,8 @@ from functools import partial
 from requests.auth import HTTPBasicAuth
 import dogstats_wrapper as dog_stats_api
 from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import UsageKey
+from pytz import UTC
 
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -35,6 +38,7 @@ from xblock.exceptions import NoSuchHandlerError
 from xblock.django.request import django_to_webob_request, webob_to_django_response
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
+from xmodule.fields import Date
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore, ModuleI18nService
@@ -49,6 +53,7 @@ from xmodule_modifiers import (
     request_token
 )
 from xmodule.lti_module import LTIModule
+from xmodule.util.course_version import CourseVersionCache
 from xmodule.x_module import XModuleDescriptor
 
 from util.json_request import JsonResponse
@@ -57,6 +62,8 @@ from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
 
 log = logging.getLogger(__name__)
 
+_TOC_OUTLINES = CourseVersionCache(u"courseware.module_render.toc_outline", shared=True)
+
 
 if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
     REQUESTS_AUTH = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
@@ -116,39 +123,129 @@ def toc_for_course(request, course, active_chapter, active_section, field_data_c
 
     field_data_cache must include data from the course module and 2 levels of its descendents
     '''
-
+    user = request.user
     with modulestore().bulk_operations(course.id):
-        course_module = get_module_for_descriptor(request.user, request, course, field_data_cache, course.id)
-        if course_module is None:
+        # Do not check access when it's a noauth request (as get_module_for_descriptor does).
+        check_access = getattr(user, 'known', True)
+        if check_access and not has_access(user, 'load', course, course.id):
             return None
 
         chapters = list()
-        for chapter in course_module.get_display_items():
-            if chapter.hide_from_toc:
+        for chapter in _toc_outline_for_course(course):
+            if chapter['hide_from_toc']:
+                continue
+            if check_access and not _can_load_toc_entry(user, chapter, course.id):
                 continue
 
             sections = list()
-            for section in chapter.get_display_items():
-
-                active = (chapter.url_name == active_chapter and
-                          section.url_name == active_section)
-
-                if not section.hide_from_toc:
-                    sections.append({'display_name': section.display_name_with_default,
-                                     'url_name': section.url_name,
-                                     'format': section.format if section.format is not None else '',
-                                     'due': get_extended_due_date(section),
-                                     'active': active,
-                                     'graded': section.graded,
-                                     })
-
-            chapters.append({'display_name': chapter.display_name_with_default,
-                             'url_name': chapter.url_name,
+            for section in chapter['sections']:
+
+                active = (chapter['url_name'] == active_chapter and
+                          section['url_name'] == active_section)
+
+                if section['hide_from_toc']:
+                    continue
+                if check_access and not _can_load_toc_entry(user, section, course.id):
+                    continue
+
+                sections.append({'display_name': section['display_name'],
+                                 'url_name': section['url_name'],
+                                 'format': section['format'],
+                                 'due': _toc_due_date(user, section, field_data_cache, course.id),
+                                 'active': active,
+                                 'graded': section['graded'],
+                                 })
+
+            chapters.append({'display_name': chapter['display_name'],
+                             'url_name': chapter['url_name'],
                              'sections': sections,
-                             'active': chapter.url_name == active_chapter})
+                             'active': chapter['url_name'] == active_chapter})
         return chapters
 
 
+def _toc_outline_for_course(course):
+    """
+    Returns the part of the table of contents of `course` that is the same for
+    every user: a list of chapter dicts, each with a list of section dicts.
+
+    Entries hold plain values (locations as strings) and the fields that the
+    'load' access check reads, so toc_for_course can filter and complete them
+    for a user without instantiating the course, chapter and section modules.
+    The outline is computed once for each version of the course and cached
+    across processes.
+    """
+    return _TOC_OUTLINES.get(course, lambda: _compute_toc_outline(course))
+
+
+def _compute_toc_outline(course):
+    """
+    Computes the outline of `course` from its descriptors.
+
+    See `_toc_outline_for_course`.
+    """
+    def outline_entry(descriptor):
+        """
+        The fields of descriptor shared by chapter and section entries.
+        """
+        return {
+            'location': unicode(descriptor.location),
+            'display_name': descriptor.display_name_with_default,
+            'url_name': descriptor.url_name,
+            'hide_from_toc': descriptor.hide_from_toc,
+            'start': descriptor.start,
+            'visible_to_staff_only': descriptor.visible_to_staff_only,
+        }
+
+    chapters = []
+    for chapter in course.get_display_items():
+        chapter_entry = outline_entry(chapter)
+        chapter_entry['sections'] = []
+        for section in chapter.get_display_items():
+            section_entry = outline_entry(section)
+            section_entry.update({
+                'format': section.format if section.format is not None else '',
+                'due': section.due,
+                'graded': section.graded,
+            })
+            chapter_entry['sections'].append(section_entry)
+        chapters.append(chapter_entry)
+    return chapters
+
+
+def _can_load_toc_entry(user, entry, course_key):
+    """
+    Returns whether `user` may load the block of the outline `entry`.
+
+    Blocks that are visible to everyone and have started are loadable by any
+    user; only for the others is the descriptor loaded to run the full check.
+    """
+    if not entry['visible_to_staff_only'] and (entry['start'] is None or datetime.now(UTC) > entry['start']):
+        return True
+    descriptor = modulestore().get_item(UsageKey.from_string(entry['location']).map_into_course(course_key))
+    return has_access(user, 'load', descriptor, course_key)
+
+
+def _toc_due_date(user, section, field_data_cache, course_key):
+    """
+    Returns the due date of the outline `section` for `user`, taking into
+    account a due date extension held in the user's state for the section.
+    """
+    if section['due'] is None or not user.is_authenticated():
+        return section['due']
+
+    key = DjangoKeyValueStore.Key(
+        scope=Scope.user_state,
+        user_id=user.id,
+        block_scope_id=UsageKey.from_string(section['location']).map_into_course(course_key),
+        field_name='extended_due',
+    )
+    student_module = field_data_cache.find(key)
+    extended_due = None
+    if student_module is not None:
+        extended_due = Date().from_json(json.loads(student_module.state).get('extended_due'))
+    return get_extended_due_date({'due': section['due'], 'extended_due': extended_due})
+
+
 def get_module(user, request, usage_key, field_data_cache,
                position=None, log_if_not_found=True, wrap_xmodule_display=True,
                grade_bucket_type=None, depth=0,
@@ -433,6 +530,7 @@ def get_module_system_for_user(user, field_data_cache,
             module.descriptor.scope_ids._replace(user_id=real_user.id)  # pylint: disable=protected-access
         )
         module.scope_ids = module.descriptor.scope_ids  # this is needed b/c NamedTuples are immutable
+        module.descriptor._lms_binding = None  # pylint: disable=protected-access
         # now bind the module to the new ModuleSystem instance and vice-versa
         module.runtime = inner_system
         inner_system.xmodule_instance = module
@@ -473,10 +571,11 @@ def get_module_system_for_user(user, field_data_cache,
     # because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
+    jump_to_id_base_url = reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''})
     block_wrappers.append(partial(
         replace_jump_to_id_urls,
         course_id,
-        reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
+        jump_to_id_base_url,
     ))
 
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
@@ -527,7 +626,7 @@ def get_module_system_for_user(user, field_data_cache,
         replace_jump_to_id_urls=partial(
             static_replace.replace_jump_to_id_urls,
             course_id=course_id,
-            jump_to_id_base_url=reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''})
+            jump_to_id_base_url=jump_to_id_base_url
         ),
         node_path=settings.NODE_PATH,
         publish=publish,
@@ -600,6 +699,22 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         if not has_access(user, 'load', descriptor, course_id):
             return None
 
+    # Grading and rendering often ask for the same block more than once in a request. A descriptor
+    # already bound for this user, field data cache and arguments is returned as is: binding it
+    # again would build a new module system and throw away the XModule instance it had constructed.
+    binding = (
+        user.id, course_id, xqueue_callback_url_prefix, request_token, position,
+        wrap_xmodule_display, grade_bucket_type, static_asset_path, user_location,
+    )
+    previous_binding = getattr(descriptor, '_lms_binding', None)
+    if (
+            previous_binding is not None and
+            previous_binding[0] is field_data_cache and
+            previous_binding[1] == binding and
+            descriptor.scope_ids.user_id == user.id
+    ):
+        return descriptor
+
     (system, field_data) = get_module_system_for_user(
         user=user,
         field_data_cache=field_data_cache,  # These have implicit user bindings, the rest of args are considered not to
@@ -617,6 +732,7 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
 
     descriptor.bind_for_student(system, field_data)  # pylint: disable=protected-access
     descriptor.scope_ids = descriptor.scope_ids._replace(user_id=user.id)  # pylint: disable=protected-access
+    descriptor._lms_binding = (field_data_cache, binding)  # pylint: disable=protected-access
     return descriptor
 
 
@@ -6,10 +6,11 @@ from django.test.utils import override_settings
 from mock import patch
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from courseware.grades import grade, iterate_grades_for
+from courseware.grades import grade, iterate_grades_for, graded_sections_for_course
+from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MOCK_MODULESTORE
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -120,3 +121,46 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+@override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
+class TestGradedSections(ModuleStoreTestCase):
+    """
+    Test the compact, cached graded sections of a course.
+    """
+    def setUp(self):
+        super(TestGradedSections, self).setUp()
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+        self.homework = ItemFactory.create(
+            parent_location=chapter.location, category='sequential', metadata={'graded': True, 'format': 'Homework'}
+        )
+        ItemFactory.create(parent_location=chapter.location, category='sequential')
+        self.vertical = ItemFactory.create(parent_location=self.homework.location, category='vertical')
+        self.problem = ItemFactory.create(parent_location=self.vertical.location, category='problem')
+        self.course_key = course.id
+
+    def test_graded_sections(self):
+        course = modulestore().get_course(self.course_key, depth=None)
+        graded_sections = graded_sections_for_course(course)
+        self.assertEqual(graded_sections.keys(), ['Homework'])
+        [section] = graded_sections['Homework']
+        self.assertEqual(section.location, self.homework.location)
+        self.assertEqual(section.scored_locations, [self.problem.location])
+        self.assertFalse(section.always_recalculate_grades)
+
+    def test_graded_sections_cached(self):
+        course = modulestore().get_course(self.course_key, depth=None)
+        graded_sections = graded_sections_for_course(course)
+
+        # A new runtime for the same version of the course reuses the graded sections
+        course = modulestore().get_course(self.course_key, depth=None)
+        with patch('courseware.grades._compute_graded_sections') as mock_compute:
+            self.assertEqual(graded_sections_for_course(course), graded_sections)
+            self.assertFalse(mock_compute.called)
+
+        # Changing the course changes its version, and recomputes them
+        other_problem = ItemFactory.create(parent_location=self.vertical.location, category='problem')
+        course = modulestore().get_course(self.course_key, depth=None)
+        [section] = graded_sections_for_course(course)['Homework']
+        self.assertEqual(set(section.scored_locations), {self.problem.location, other_problem.location})
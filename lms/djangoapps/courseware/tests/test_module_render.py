@@ -241,6 +241,31 @@ class ModuleRenderTestCase(ModuleStoreTestCase, LoginEnrollmentTestCase):
         render.get_module_for_descriptor(self.mock_user, request, descriptor, field_data_cache, self.toy_course.id)
         render.get_module_for_descriptor(self.mock_user, request, descriptor, field_data_cache, self.toy_course.id)
 
+    def test_bound_module_reused(self):
+        request = self.request_factory.get('')
+        request.user = self.mock_user
+        course = CourseFactory()
+        descriptor = ItemFactory(category='vertical', parent=course)
+        field_data_cache = FieldDataCache([self.toy_course, descriptor], self.toy_course.id, self.mock_user)
+        with patch.object(render, 'get_module_system_for_user', wraps=render.get_module_system_for_user) as mock_system:
+            module = render.get_module_for_descriptor(
+                self.mock_user, request, descriptor, field_data_cache, self.toy_course.id
+            )
+            self.assertIs(
+                module,
+                render.get_module_for_descriptor(
+                    self.mock_user, request, descriptor, field_data_cache, self.toy_course.id
+                )
+            )
+            self.assertEqual(mock_system.call_count, 1)
+
+            # A different field data cache means a different binding
+            other_field_data_cache = FieldDataCache([descriptor], self.toy_course.id, self.mock_user)
+            render.get_module_for_descriptor(
+                self.mock_user, request, descriptor, other_field_data_cache, self.toy_course.id
+            )
+            self.assertEqual(mock_system.call_count, 2)
+
 
 @override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
 class TestHandleXBlockCallback(ModuleStoreTestCase, LoginEnrollmentTestCase):
@@ -492,6 +517,24 @@ class TestTOC(ModuleStoreTestCase):
             for toc_section in expected:
                 self.assertIn(toc_section, actual)
 
+    def test_toc_outline_reused(self):
+        with self.store.default_store(ModuleStoreEnum.Type.mongo):
+            self.setup_modulestore(ModuleStoreEnum.Type.mongo, 3, 0)
+            expected = render.toc_for_course(
+                self.request, self.toy_course, self.chapter, None, self.field_data_cache
+            )
+            with patch('courseware.module_render._compute_toc_outline') as mock_compute:
+                actual = render.toc_for_course(
+                    self.request, self.toy_course, self.chapter, 'Welcome', self.field_data_cache
+                )
+            self.assertFalse(mock_compute.called)
+            # Only the active flags differ between the two tables of contents
+            chapter = next(chapter for chapter in actual if chapter['url_name'] == self.chapter)
+            section = next(section for section in chapter['sections'] if section['url_name'] == 'Welcome')
+            self.assertTrue(section['active'])
+            section['active'] = False
+            self.assertEqual(expected, actual)
+
 
 @override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
 class TestHtmlModifiers(ModuleStoreTestCase):
@@ -1051,6 +1051,39 @@ class TestAnswerDistributions(TestSubmittingProblems):
                 }
             )
 
+    def test_answers_within_larger_state(self):
+        # Only the student_answers part of the state is decoded, so make sure
+        # other keys (before or after it, or mentioning it) don't confuse it.
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        student_module = StudentModule.objects.get(
+            course_id=self.course.id,
+            student=self.student_user
+        )
+        answer_id = '{}_2_1'.format(self.p1_html_id)
+        for state in (
+                '{"input_state": {"x": "\\"student_answers\\": {}"}, "student_answers": {"%(id)s": "Correct"}}',
+                '{"student_answers": {"%(id)s": "Correct"}, "correct_map": {"a": {"msg": "student_answers"}}}',
+                '{"student_answers":{"%(id)s":"Correct"}}',
+                '{"input_state": {"student_answers": {"%(id)s": "Nested"}}, "student_answers": {"%(id)s": "Correct"}}',
+                '{"x \\"student_answers": {"%(id)s": "Escaped"}, "student_answers": {"%(id)s": "Correct"}}',
+        ):
+            student_module.state = state % {'id': answer_id}
+            student_module.save()
+
+            self.assertEqual(
+                grades.answer_distributions(self.course.id),
+                {
+                    ('p1', 'p1', answer_id): {
+                        'Correct': 1
+                    },
+                }
+            )
+
+        # A nested "student_answers" key is not taken for the top-level one
+        student_module.state = '{"input_state": {"student_answers": {"%s": "Nested"}}}' % answer_id
+        student_module.save()
+        self.assertFalse(grades.answer_distributions(self.course.id))
+
 
 class TestConditionalContent(TestSubmittingProblems):
     """
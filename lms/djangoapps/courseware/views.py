@@ -1056,19 +1056,19 @@ def submission_history(request, course_id, student_username, location):
     return render_to_response('courseware/submission_history.html', context)
 
 
+TAB_NOTIFICATION_HANDLERS = {
+    StaffGradingTab.type: open_ended_notifications.staff_grading_notifications,
+    PeerGradingTab.type: open_ended_notifications.peer_grading_notifications,
+    OpenEndedGradingTab.type: open_ended_notifications.combined_notifications
+}
+
+
 def notification_image_for_tab(course_tab, user, course):
     """
     Returns the notification image path for the given course_tab if applicable, otherwise None.
     """
-
-    tab_notification_handlers = {
-        StaffGradingTab.type: open_ended_notifications.staff_grading_notifications,
-        PeerGradingTab.type: open_ended_notifications.peer_grading_notifications,
-        OpenEndedGradingTab.type: open_ended_notifications.combined_notifications
-    }
-
-    if course_tab.type in tab_notification_handlers:
-        notifications = tab_notification_handlers[course_tab.type](course, user)
+    if course_tab.type in TAB_NOTIFICATION_HANDLERS:
+        notifications = TAB_NOTIFICATION_HANDLERS[course_tab.type](course, user)
         if notifications and notifications['pending_grading']:
             return notifications['img_path']
 
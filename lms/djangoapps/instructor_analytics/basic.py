@@ -12,6 +12,8 @@ from django.db.models import Q
 from django.contrib.auth.models import User
 import xmodule.graders as xmgraders
 from django.core.exceptions import ObjectDoesNotExist
+from openedx.core.djangoapps.course_groups.cohorts import get_cohorts_for_users
+from util.query import use_read_replica_if_available
 
 
 STUDENT_FEATURES = ('id', 'username', 'first_name', 'last_name', 'is_staff', 'email')
@@ -153,54 +155,65 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Generate the student feature dictionaries of enrolled_students_features one at a time.
+
+    Only the requested columns are read, through a database cursor rather than
+    as a list of model instances, so that reports on large courses can be
+    written out without holding every student in memory.
+    """
     include_cohort_column = 'cohort' in features
 
-    students = User.objects.filter(
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    # For data extractions on the 'meta' field
+    # the feature name should be in the format of 'meta.foo' where
+    # 'foo' is the keyname in the meta dictionary
+    meta_features = []
+    for feature in features:
+        if 'meta.' in feature:
+            meta_key = feature.split('.')[1]
+            meta_features.append((feature, meta_key))
+
+    # The profile id tells students without a profile apart from empty profile fields.
+    columns = ['id', 'profile__id'] + student_features + ['profile__' + feature for feature in profile_features]
+    if meta_features:
+        columns.append('profile__meta')
+
+    students = use_read_replica_if_available(User.objects.filter(
         courseenrollment__course_id=course_key,
         courseenrollment__is_active=1,
-    ).order_by('username').select_related('profile')
+    ).order_by('username').values_list(*columns))
 
     if include_cohort_column:
-        students = students.prefetch_related('course_groups')
-
-    def extract_student(student, features):
-        """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        # For data extractions on the 'meta' field
-        # the feature name should be in the format of 'meta.foo' where
-        # 'foo' is the keyname in the meta dictionary
-        meta_features = []
-        for feature in features:
-            if 'meta.' in feature:
-                meta_key = feature.split('.')[1]
-                meta_features.append((feature, meta_key))
-
-        student_dict = dict((feature, getattr(student, feature))
-                            for feature in student_features)
-        profile = student.profile
-        if profile is not None:
-            profile_dict = dict((feature, getattr(profile, feature))
-                                for feature in profile_features)
-            student_dict.update(profile_dict)
-
-            # now featch the requested meta fields
-            meta_dict = json.loads(profile.meta) if profile.meta else {}
-            for meta_feature, meta_key in meta_features:
-                student_dict[meta_feature] = meta_dict.get(meta_key)
+        cohorts_by_user_id = get_cohorts_for_users(course_key)
+
+    num_student_features = len(student_features)
+    num_profile_features = len(profile_features)
+    for row in students.iterator():
+        student_id, profile_id = row[:2]
+        row = row[2:]
+        student_dict = dict(zip(student_features, row[:num_student_features]))
+        row = row[num_student_features:]
+        if profile_id is not None:
+            student_dict.update(zip(profile_features, row[:num_profile_features]))
+
+            # now fetch the requested meta fields
+            if meta_features:
+                meta = row[num_profile_features]
+                meta_dict = json.loads(meta) if meta else {}
+                for meta_feature, meta_key in meta_features:
+                    student_dict[meta_feature] = meta_dict.get(meta_key)
 
         if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
-            )
-        return student_dict
-
-    return [extract_student(student, features) for student in students]
+            cohort = cohorts_by_user_id.get(student_id)
+            student_dict['cohort'] = cohort.name if cohort is not None else "[unassigned]"
+        yield student_dict
 
 
 def coupon_codes_features(features, coupons_list):
@@ -64,19 +64,23 @@ def format_dictlist(dictlist, features):
     }
     """
 
-    def dict_to_entry(dct):
-        """ Convert dictionary to a list for a csv row """
-        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
-        vals = [v for (_, v) in ordered]
-        return vals
-
     header = features
-    datarows = map(dict_to_entry, dictlist)
+    datarows = list(iter_format_dictlist(dictlist, features))
 
     return header, datarows
 
 
+def iter_format_dictlist(dictlist, features):
+    """
+    Generate the datarows of format_dictlist one at a time, so that `dictlist`
+    can itself be a generator of dictionaries that is never held in memory.
+    """
+    for dct in dictlist:
+        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
+        ordered = sorted(relevant_items, key=lambda (k, v): features.index(k))
+        yield [v for (_, v) in ordered]
+
+
 def format_instances(instances, features):
     """
     Convert a list of instances into a header list and datarows list.
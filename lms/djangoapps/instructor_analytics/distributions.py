@@ -22,7 +22,8 @@ The distribution in a course for gender might look like:
 """
 
 from django.db.models import Count
-from student.models import CourseEnrollment, UserProfile
+from student.models import UserProfile
+from util.query import use_read_replica_if_available
 
 # choices with a restricted domain, e.g. level_of_education
 _EASY_CHOICE_FEATURES = ('gender', 'level_of_education')
@@ -100,6 +101,16 @@ def profile_distribution(course_id, feature):
 
     prd = ProfileDistribution(feature)
 
+    # Count the students with each value of the feature in a single query.
+    # Counting 'id' rather than the feature itself also counts NULL values,
+    # which annotating with Count(feature) would count as 0.
+    query_distribution = use_read_replica_if_available(UserProfile.objects.filter(
+        user__courseenrollment__course_id=course_id,
+        user__courseenrollment__is_active=True
+    ).values(feature).annotate(count=Count('id')).order_by())
+    # query_distribution is of the form [{'featureval': 'value1', 'count': 4},
+    #    {'featureval': 'value2', 'count': 2}, ...]
+
     if feature in _EASY_CHOICE_FEATURES:
         prd.type = 'EASY_CHOICE'
 
@@ -112,59 +123,26 @@ def profile_distribution(course_id, feature):
         choices = [(short, full)
                    for (short, full) in raw_choices] + [('no_data', 'No Data')]
 
-        def get_filter(feature, value):
-            """ Get the orm filter parameters for a feature. """
-            return {
-                'gender': {'user__profile__gender': value},
-                'level_of_education': {'user__profile__level_of_education': value},
-            }[feature]
-
-        def get_count(feature, value):
-            """ Get the count of enrolled students matching the feature value. """
-            return CourseEnrollment.objects.filter(
-                course_id=course_id,
-                is_active=True,
-                **get_filter(feature, value)
-            ).count()
-
-        distribution = {}
-        for (short, full) in choices:
+        distribution = dict((short, 0) for (short, full) in choices)
+        for vald in query_distribution:
             # handle no data case
-            if short == 'no_data':
-                distribution['no_data'] = 0
-                distribution['no_data'] += get_count(feature, None)
-                distribution['no_data'] += get_count(feature, '')
-            else:
-                distribution[short] = get_count(feature, short)
+            if vald[feature] in (None, ''):
+                distribution['no_data'] += vald['count']
+            elif vald[feature] in distribution:
+                distribution[vald[feature]] = vald['count']
 
         prd.data = distribution
         prd.choices_display_names = dict(choices)
     elif feature in _OPEN_CHOICE_FEATURES:
         prd.type = 'OPEN_CHOICE'
-        profiles = UserProfile.objects.filter(
-            user__courseenrollment__course_id=course_id,
-            user__courseenrollment__is_active=True
-        )
-        query_distribution = profiles.values(
-            feature).annotate(Count(feature)).order_by()
-        # query_distribution is of the form [{'featureval': 'value1', 'featureval__count': 4},
-        #    {'featureval': 'value2', 'featureval__count': 2}, ...]
 
-        distribution = dict((vald[feature], vald[feature + '__count'])
+        distribution = dict((vald[feature], vald['count'])
                             for vald in query_distribution)
         # distribution is of the form {'value1': 4, 'value2': 2, ...}
 
         # change none to no_data for valid json key
         if None in distribution:
-            # django does not properly count NULL values when using annotate Count
-            # so
-            #     distribution['no_data'] = distribution.pop(None)
-            # would always be 0.
-
-            # Correctly count null values
-            distribution['no_data'] = profiles.filter(
-                **{feature: None}
-            ).count()
+            distribution['no_data'] = distribution.pop(None)
 
         prd.data = distribution
 
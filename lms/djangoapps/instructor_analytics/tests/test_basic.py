@@ -74,6 +74,12 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             self.assertIn(userreport['meta.position'], ["edX expert {}".format(user.id) for user in self.users])
             self.assertIn(userreport['meta.company'], ["Open edX Inc {}".format(user.id) for user in self.users])
 
+    def test_enrolled_students_meta_not_parsed_unless_requested(self):
+        with patch('instructor_analytics.basic.json.loads') as mock_loads:
+            userreports = enrolled_students_features(self.course_key, ('username', 'name'))
+        self.assertEqual(len(userreports), len(self.users))
+        self.assertFalse(mock_loads.called)
+
     def test_enrolled_students_features_keys_cohorted(self):
         course = CourseFactory.create(course_key=self.course_key)
         course.cohort_config = {'cohorted': True, 'auto_cohort': True, 'auto_cohort_groups': ['cohort']}
@@ -92,8 +98,8 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
         query_features = ('username', 'cohort')
         # There should be a constant of 2 SQL queries when calling
         # enrolled_students_features.  The first query comes from the call to
-        # User.objects.filter(...), and the second comes from
-        # prefetch_related('course_groups').
+        # User.objects.filter(...), and the second looks up the cohorts of the
+        # course's users all at once.
         with self.assertNumQueries(2):
             userreports = enrolled_students_features(course.id, query_features)
         self.assertEqual(len([r for r in userreports if r['username'] in cohorted_usernames]), len(cohorted_students))
@@ -50,6 +50,11 @@ class TestAnalyticsDistributions(TestCase):
         self.assertNotIn('no_data', distribution.data)
         self.assertEqual(distribution.data[1930], 1)
 
+    def test_profile_distribution_num_queries(self):
+        for feature in AVAILABLE_PROFILE_FEATURES:
+            with self.assertNumQueries(1):
+                profile_distribution(self.course_id, feature)
+
     def test_gender_count(self):
         course_enrollments = CourseEnrollment.objects.filter(
             course_id=self.course_id, user__profile__gender='m'
@@ -16,6 +16,7 @@ from courseware.module_render import get_xqueue_callback_url_prefix
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import UsageKey
 from instructor_task.models import InstructorTask, PROGRESS
+from instructor_task.subtasks import refresh_subtask_progress
 
 
 log = logging.getLogger(__name__)
@@ -119,8 +120,9 @@ def _update_instructor_task(instructor_task, task_result):
     Tasks that are in progress and have subtasks doing the processing do not look
     to the task's AsyncResult object.  When subtasks are running, the
     InstructorTask object itself is updated with the subtasks' progress,
-    not any AsyncResult object.  In this case, the InstructorTask is
-    not updated at all.
+    not any AsyncResult object.  As it is only updated periodically, the
+    InstructorTask is then updated in place with its subtasks' latest
+    statuses instead.
 
     Calculates json to store in "task_output" field of the `instructor_task`,
     as well as updating the task_state.
@@ -150,8 +152,9 @@ def _update_instructor_task(instructor_task, task_result):
         # meaning that the subtasks have successfully been defined.  However, the InstructorTask
         # will be marked as in PROGRESS, until the last subtask completes and marks it as SUCCESS.
         # We want to ignore the parent SUCCESS if subtasks are still running, and just trust the
-        # contents of the InstructorTask.
+        # contents of the InstructorTask, brought up to date with its subtasks.
         entry_needs_updating = False
+        refresh_subtask_progress(instructor_task)
     elif result_state in [PROGRESS, SUCCESS]:
         # construct a status message directly from the task result's result:
         # it needs to go back with the entry passed in.
@@ -190,6 +190,31 @@ class InstructorTask(models.Model):
         return json.dumps({'message': 'Task revoked before running'})
 
 
+class InstructorSubtask(models.Model):
+    """
+    Stores the status of one subtask of an InstructorTask.
+
+    Each subtask writes only its own row, so that many subtasks finishing at
+    the same time do not contend for a lock on the parent InstructorTask.
+    Their statuses are rolled up into the parent's `subtasks` and `task_output`
+    fields from time to time, and when the last subtask finishes.
+
+    `instructor_task` is the parent InstructorTask.
+    `task_id` stores the id used by celery for the subtask.
+    `state` stores the celery state of the subtask, as also found in `status`.
+    `status` stores the subtask's status, as a JSON-serialized SubtaskStatus dict.
+    `updated` stores date that entry was last modified
+    """
+    instructor_task = models.ForeignKey(InstructorTask, db_index=True, related_name='subtask_statuses')
+    task_id = models.CharField(max_length=255, unique=True)
+    state = models.CharField(max_length=50, db_index=True)
+    status = models.TextField()
+    updated = models.DateTimeField(auto_now=True)
+
+    def __unicode__(self):
+        return u'InstructorSubtask<{}: {}>'.format(self.task_id, self.status)
+
+
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
@@ -1,6 +1,7 @@
 """
 This module contains celery task functions for handling the management of subtasks.
 """
+from datetime import timedelta
 from time import time
 import json
 from uuid import uuid4
@@ -14,8 +15,9 @@ import dogstats_wrapper as dog_stats_api
 
 from django.db import transaction, DatabaseError
 from django.core.cache import cache
+from django.utils import timezone
 
-from instructor_task.models import InstructorTask, PROGRESS, QUEUING
+from instructor_task.models import InstructorTask, InstructorSubtask, PROGRESS, QUEUING
 
 TASK_LOG = get_task_logger(__name__)
 
@@ -24,6 +26,9 @@ SUBTASK_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
 # Number of times to retry if a subtask update encounters a lock on the InstructorTask.
 # (These are recursive retries, so don't make this number too large.)
 MAX_DATABASE_LOCK_RETRIES = 5
+# Minimum number of seconds between roll-ups of subtask statuses into their InstructorTask,
+# until the last subtask has finished.
+SUBTASK_ROLL_UP_INTERVAL = 30
 
 
 class DuplicateTaskException(Exception):
@@ -31,22 +36,6 @@ class DuplicateTaskException(Exception):
     pass
 
 
-def _get_number_of_subtasks(total_num_items, items_per_task):
-    """
-    Determines number of subtasks that would be generated by _generate_items_for_subtask.
-
-    This needs to be calculated before the query is executed so that the list of all subtasks can be
-    stored in the InstructorTask before any subtasks are started.
-
-    The number of subtask_id values returned by this should match the number of chunks returned
-    by the generate_items_for_subtask generator.
-    """
-    num_subtasks, remainder = divmod(total_num_items, items_per_task)
-    if remainder:
-        num_subtasks += 1
-    return num_subtasks
-
-
 @contextmanager
 def track_memory_usage(metric, course_id):
     """
@@ -70,59 +59,53 @@ def track_memory_usage(metric, course_id):
         )
 
 
-def _generate_items_for_subtask(
-    item_queryset,
-    item_fields,
-    total_num_items,
-    items_per_task,
-    total_num_subtasks,
-    course_id,
-):
+def _generate_bounds_for_subtasks(item_queryset, items_per_task):
     """
-    Generates a chunk of "items" that should be passed into a subtask.
+    Generates the bounds of each chunk of "items" that should be passed into a subtask.
+
+    The queryset is walked in primary key order, one chunk at a time, with each query
+    picking up after the last primary key of the previous chunk.  This keeps every query
+    small, rather than holding a single cursor open over the whole queryset.
 
     Arguments:
         `item_queryset` : a query set that defines the "items" that should be passed to subtasks.
+        `items_per_task` : maximum size of chunks to break the query into for use by a subtask.
+
+    Returns:  yields a tuple of (min_pk, max_pk, num_items) for each chunk, where the
+    primary key bounds are inclusive.
+    """
+    chunk_queryset = item_queryset.order_by('pk')
+    while True:
+        pks = list(chunk_queryset.values_list('pk', flat=True)[:items_per_task])
+        if not pks:
+            return
+        yield pks[0], pks[-1], len(pks)
+        if len(pks) < items_per_task:
+            return
+        chunk_queryset = item_queryset.order_by('pk').filter(pk__gt=pks[-1])
+
+
+def get_items_for_subtask(item_queryset, item_fields, item_bounds):
+    """
+    Returns the "items" that a subtask should process.
+
+    Arguments:
+        `item_queryset` : a query set that defines the "items" that were passed to subtasks.
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
-        `total_num_items` : the result of item_queryset.count().
-        `items_per_query` : size of chunks to break the query operation into.
-        `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
-        `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
+        `item_bounds` : the (min_pk, max_pk) bounds passed to the subtask by queue_subtasks_for_query().
+            Both bounds are inclusive, and a bound of None leaves that end of the range open.
 
-    Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
-
-    Warning:  if the algorithm here changes, the _get_number_of_subtasks() method should similarly be changed.
+    Returns:  a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
     """
-    num_items_queued = 0
+    min_pk, max_pk = item_bounds
+    if min_pk is not None:
+        item_queryset = item_queryset.filter(pk__gte=min_pk)
+    if max_pk is not None:
+        item_queryset = item_queryset.filter(pk__lte=max_pk)
     all_item_fields = list(item_fields)
     all_item_fields.append('pk')
-    num_subtasks = 0
-
-    items_for_task = []
-
-    with track_memory_usage('course_email.subtask_generation.memory', course_id):
-        for item in item_queryset.values(*all_item_fields).iterator():
-            if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
-                yield items_for_task
-                num_items_queued += items_per_task
-                items_for_task = []
-                num_subtasks += 1
-            items_for_task.append(item)
-
-        # yield remainder items for task, if any
-        if items_for_task:
-            yield items_for_task
-            num_items_queued += len(items_for_task)
-
-    # Note, depending on what kind of DB is used, it's possible for the queryset
-    # we iterate over to change in the course of the query. Therefore it's
-    # possible that there are more (or fewer) items queued than were initially
-    # calculated. It also means it's possible that the last task contains
-    # more items than items_per_task allows. We expect this to be a small enough
-    # number as to be negligible.
-    if num_items_queued != total_num_items:
-        TASK_LOG.info("Number of items generated by chunking %s not equal to original total %s", num_items_queued, total_num_items)
+    return list(item_queryset.order_by('pk').values(*all_item_fields))
 
 
 class SubtaskStatus(object):
@@ -233,7 +216,8 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
 
     The "subtasks" field also contains a 'status' key, that contains a dict that stores status
     information for each subtask.  The value for each subtask (keyed by its task_id)
-    is its subtask status, as defined by SubtaskStatus.to_dict().
+    is its subtask status, as defined by SubtaskStatus.to_dict().  Each subtask also gets
+    an InstructorSubtask row holding the same status, which the subtask updates as it runs.
 
     This information needs to be set up in the InstructorTask before any of the subtasks start
     running.  If not, there is a chance that the subtasks could complete before the parent task
@@ -272,32 +256,69 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
 
     # and save the entry immediately, before any subtasks actually start work:
     entry.save_now()
+    _create_subtask_statuses(entry, subtask_status)
     return task_progress
 
 
-def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_queryset, item_fields, items_per_task):
+@transaction.autocommit
+def _create_subtask_statuses(entry, subtask_status):
+    """
+    Creates an InstructorSubtask row for each of the subtasks of `entry`,
+    ensuring the rows are committed before any subtasks start work.
+
+    `subtask_status` is a dict of subtask status dicts, keyed by task_id.
+    """
+    InstructorSubtask.objects.bulk_create([
+        InstructorSubtask(instructor_task=entry, task_id=task_id, state=status['state'], status=json.dumps(status))
+        for task_id, status in subtask_status.iteritems()
+    ])
+
+
+def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_queryset, items_per_task):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
 
+    Subtasks are not passed the items themselves, but the primary key bounds of their chunk,
+    and are expected to fetch their own items using get_items_for_subtask().
+
     Arguments:
         `entry` : the InstructorTask object for which subtasks are being queued.
         `action_name` : a past-tense verb that can be used for constructing readable status messages.
         `create_subtask_fcn` : a function of two arguments that constructs the desired kind of subtask object.
-            Arguments are the list of items to be processed by this subtask, and a SubtaskStatus
-            object reflecting initial status (and containing the subtask's id).
+            Arguments are the (min_pk, max_pk) bounds of the items to be processed by this subtask
+            (see get_items_for_subtask()),
+            and a SubtaskStatus object reflecting initial status (and containing the subtask's id).
         `item_queryset` : a query set that defines the "items" that should be passed to subtasks.
-        `item_fields` : the fields that should be included in the dict that is returned.
-            These are in addition to the 'pk' field.
-        `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
+        `items_per_task` : maximum size of chunks to break the query into for use by a subtask.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
     """
     task_id = entry.task_id
-    total_num_items = item_queryset.count()
 
-    # Calculate the number of tasks that will be created, and create a list of ids for each task.
-    total_num_subtasks = _get_number_of_subtasks(total_num_items, items_per_task)
+    # The list of all subtasks needs to be stored in the InstructorTask before any subtasks
+    # are started, so find the bounds of every chunk first.  Only the bounds are kept.
+    max_pk_list = []
+    total_num_items = 0
+    with track_memory_usage('course_email.subtask_generation.memory', entry.course_id):
+        for __, max_pk, num_items in _generate_bounds_for_subtasks(item_queryset, items_per_task):
+            max_pk_list.append(max_pk)
+            total_num_items += num_items
+
+    # Depending on what kind of DB is used, it's possible for the queryset to change
+    # before the subtasks run.  Make the chunks contiguous, starting each one right after
+    # the previous one ends, and leave the first and last chunks open-ended, so that items
+    # that start matching the queryset in the meantime are still processed by some subtask.
+    # This means that a task may contain more items than items_per_task allows, and that
+    # more items may be processed than were initially counted.  We expect this to be a
+    # small enough number as to be negligible.
+    item_bounds_list = []
+    if max_pk_list:
+        min_pk_list = [None] + [max_pk + 1 for max_pk in max_pk_list[:-1]]
+        item_bounds_list = zip(min_pk_list, max_pk_list[:-1] + [None])
+
+    # Create a list of ids for each task.
+    total_num_subtasks = len(item_bounds_list)
     subtask_id_list = [str(uuid4()) for _ in range(total_num_subtasks)]
 
     # Update the InstructorTask  with information about the subtasks we've defined.
@@ -310,17 +331,6 @@ def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_querys
     )  # pylint: disable=no-member
     progress = initialize_subtask_info(entry, action_name, total_num_items, subtask_id_list)
 
-    # Construct a generator that will return the recipients to use for each subtask.
-    # Pass in the desired fields to fetch for each recipient.
-    item_list_generator = _generate_items_for_subtask(
-        item_queryset,
-        item_fields,
-        total_num_items,
-        items_per_task,
-        total_num_subtasks,
-        entry.course_id,
-    )
-
     # Now create the subtasks, and start them running.
     TASK_LOG.info(
         "Task %s: creating %s subtasks to process %s items.",
@@ -328,12 +338,9 @@ def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_querys
         total_num_subtasks,
         total_num_items,
     )
-    num_subtasks = 0
-    for item_list in item_list_generator:
-        subtask_id = subtask_id_list[num_subtasks]
-        num_subtasks += 1
+    for subtask_id, item_bounds in zip(subtask_id_list, item_bounds_list):
         subtask_status = SubtaskStatus.create(subtask_id)
-        new_subtask = create_subtask_fcn(item_list, subtask_status)
+        new_subtask = create_subtask_fcn(item_bounds, subtask_status)
         new_subtask.apply_async()
 
     # Subtasks have been queued so no exceptions should be raised after this point.
@@ -408,6 +415,7 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
     # Confirm that the InstructorTask knows about this particular subtask.
     subtask_dict = json.loads(entry.subtasks)
     subtask_status_info = subtask_dict['status']
+    subtask_status_info.update(_get_subtask_statuses(entry_id, [current_task_id]))
     if current_task_id not in subtask_status_info:
         format_str = "Unexpected task_id '{}': unable to find status for subtask of instructor task '{}': rejecting task {}"
         msg = format_str.format(current_task_id, entry, new_subtask_status)
@@ -453,10 +461,12 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
 
 def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
     """
-    Update the status of the subtask in the parent InstructorTask object tracking its progress.
+    Update the status of the subtask, and the parent InstructorTask object tracking its progress.
 
     Because select_for_update is used to lock the InstructorTask object while it is being updated,
-    multiple subtasks updating at the same time may time out while waiting for the lock.
+    multiple subtasks updating it at the same time may time out while waiting for the lock.
+    (Subtasks only update it when the last of them finishes, or periodically; see
+    _update_subtask_status.)
     The actual update operation is surrounded by a try/except/else that permits the update to be
     retried if the transaction times out.
 
@@ -485,10 +495,184 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
         _release_subtask_lock(current_task_id)
 
 
-@transaction.commit_manually
+def _get_subtask_statuses(entry_id, task_ids=None, for_update=False):
+    """
+    Returns the statuses stored in the InstructorSubtask rows of the InstructorTask
+    with id `entry_id`, as a dict of subtask status dicts keyed by task_id.
+
+    If `task_ids` is given, only the statuses of those subtasks are returned.
+    If `for_update` is True, the rows are read with select_for_update, which
+    locks them and returns their latest committed statuses even when the
+    current transaction's snapshot is older.
+    """
+    subtasks = InstructorSubtask.objects.filter(instructor_task_id=entry_id)
+    if for_update:
+        subtasks = subtasks.select_for_update()
+    if task_ids is not None:
+        subtasks = subtasks.filter(task_id__in=task_ids)
+    return {task_id: json.loads(status) for task_id, status in subtasks.values_list('task_id', 'status')}
+
+
+def _apply_subtask_statuses(entry, subtask_statuses):
+    """
+    Updates the "subtasks" and "task_output" fields of the InstructorTask `entry`
+    in place (without saving it) from `subtask_statuses`, a dict of subtask
+    status dicts keyed by task_id.
+
+    Counts in "task_output" are totalled over the subtasks that are done, and
+    the entry's state is set to SUCCESS once all of its subtasks are done.
+    A subtask that is already done in `entry` keeps its status if the one in
+    `subtask_statuses` is not done, since that one must be stale.
+    """
+    subtask_dict = json.loads(entry.subtasks)
+    subtask_status_info = subtask_dict['status']
+    for task_id, subtask_status in subtask_statuses.iteritems():
+        current_status = subtask_status_info.get(task_id)
+        if current_status is not None and current_status['state'] in READY_STATES and \
+                subtask_status['state'] not in READY_STATES:
+            continue
+        subtask_status_info[task_id] = subtask_status
+
+    # Set the estimate of duration, but only if it
+    # increases.  Clock skew between time() returned by different machines
+    # may result in non-monotonic values for duration.
+    task_progress = json.loads(entry.task_output)
+    start_time = task_progress['start_time']
+    prev_duration = task_progress['duration_ms']
+    new_duration = int((time() - start_time) * 1000)
+    task_progress['duration_ms'] = max(prev_duration, new_duration)
+
+    # Counts only include subtasks that are done.
+    # In future, we can make this more responsive by including the progress
+    # of subtasks that are being retried.
+    for statname in ['attempted', 'succeeded', 'failed', 'skipped']:
+        task_progress[statname] = 0
+    subtask_dict['succeeded'] = 0
+    subtask_dict['failed'] = 0
+    for subtask_status in subtask_status_info.itervalues():
+        subtask_state = subtask_status['state']
+        if subtask_state in READY_STATES:
+            for statname in ['attempted', 'succeeded', 'failed', 'skipped']:
+                task_progress[statname] += subtask_status[statname]
+            if subtask_state == SUCCESS:
+                subtask_dict['succeeded'] += 1
+            else:
+                subtask_dict['failed'] += 1
+    num_remaining = subtask_dict['total'] - subtask_dict['succeeded'] - subtask_dict['failed']
+
+    # If we're done with the last task, update the parent status to indicate that.
+    # At present, we mark the task as having succeeded.  In future, we should see
+    # if there was a catastrophic failure that occurred, and figure out how to
+    # report that here.
+    if num_remaining <= 0:
+        entry.task_state = SUCCESS
+    entry.subtasks = json.dumps(subtask_dict)
+    entry.task_output = InstructorTask.create_output_for_success(task_progress)
+
+
+def refresh_subtask_progress(entry):
+    """
+    Updates the InstructorTask `entry` in place (without saving it) with the
+    latest statuses of its subtasks, which may not have been rolled up into the
+    stored entry yet.
+
+    Does nothing if the entry has no subtasks, or if their statuses are kept in
+    the entry itself.
+    """
+    if len(entry.subtasks) == 0:
+        return
+    subtask_statuses = _get_subtask_statuses(entry.id)
+    if subtask_statuses:
+        _apply_subtask_statuses(entry, subtask_statuses)
+
+
 def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     """
-    Update the status of the subtask in the parent InstructorTask object tracking its progress.
+    Update the status of the subtask, and the progress of the parent InstructorTask when it is due.
+
+    The status is written to the subtask's own InstructorSubtask row, which does not
+    need a lock on the parent InstructorTask.  The statuses of all subtasks are then
+    rolled up into the parent when the last subtask has finished, or when the parent
+    has not been updated for SUBTASK_ROLL_UP_INTERVAL seconds.
+
+    Subtasks that have no InstructorSubtask row (i.e. that were queued before
+    such rows were created) update the parent InstructorTask directly.
+    """
+    TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
+                  current_task_id, entry_id, new_subtask_status)
+
+    if not _save_subtask_status(current_task_id, new_subtask_status):
+        _update_subtask_status_in_entry(entry_id, current_task_id, new_subtask_status)
+    elif _subtask_roll_up_is_due(entry_id):
+        _roll_up_subtask_statuses(entry_id)
+
+
+@transaction.autocommit
+def _save_subtask_status(current_task_id, new_subtask_status):
+    """
+    Writes the status of the subtask to its InstructorSubtask row, ensuring it is committed.
+
+    Returns False if the subtask has no InstructorSubtask row.
+    """
+    num_updated = InstructorSubtask.objects.filter(task_id=current_task_id).update(
+        state=new_subtask_status.state,
+        status=json.dumps(new_subtask_status.to_dict()),
+        updated=timezone.now(),
+    )
+    return num_updated > 0
+
+
+def _subtask_roll_up_is_due(entry_id):
+    """
+    Returns True if all of the subtasks of the InstructorTask with id `entry_id`
+    are done, or if the InstructorTask has not been updated for
+    SUBTASK_ROLL_UP_INTERVAL seconds.
+    """
+    subtasks = InstructorSubtask.objects.filter(instructor_task_id=entry_id)
+    if not subtasks.exclude(state__in=READY_STATES).exists():
+        return True
+    last_updated = InstructorTask.objects.filter(pk=entry_id).values_list('updated', flat=True)[0]
+    return timezone.now() - last_updated >= timedelta(seconds=SUBTASK_ROLL_UP_INTERVAL)
+
+
+@transaction.commit_manually
+def _roll_up_subtask_statuses(entry_id):
+    """
+    Update the parent InstructorTask with the statuses of all of its subtasks.
+
+    Uses select_for_update to lock the InstructorTask object while it is being updated.
+    The operation is surrounded by a try/except/else that permit the manual transaction to be
+    committed on completion, or rolled back on error.
+
+    The subtask statuses are read with select_for_update too.  A plain read would
+    use the snapshot of the transaction that _subtask_roll_up_is_due opened, taken
+    before waiting for the lock, and could undo a roll-up that committed meanwhile.
+
+    See _apply_subtask_statuses for how the InstructorTask's "subtasks" and "task_output"
+    fields are updated.
+    """
+    try:
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        _apply_subtask_statuses(entry, _get_subtask_statuses(entry_id, for_update=True))
+
+        TASK_LOG.debug("about to save....")
+        entry.save()
+        TASK_LOG.info("Task output updated to %s for instructor task %d", entry.task_output, entry_id)
+    except Exception:
+        TASK_LOG.exception("Unexpected error while updating InstructorTask.")
+        transaction.rollback()
+        dog_stats_api.increment('instructor_task.subtask.update_exception')
+        raise
+    else:
+        TASK_LOG.debug("about to commit....")
+        transaction.commit()
+
+
+@transaction.commit_manually
+def _update_subtask_status_in_entry(entry_id, current_task_id, new_subtask_status):
+    """
+    Update the status of the subtask in the parent InstructorTask object tracking its progress,
+    for subtasks that have no InstructorSubtask row.
 
     Uses select_for_update to lock the InstructorTask object while it is being updated.
     The operation is surrounded by a try/except/else that permit the manual transaction to be
@@ -513,9 +697,6 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
     """
-    TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
-                  current_task_id, entry_id, new_subtask_status)
-
     try:
         entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
         subtask_dict = json.loads(entry.subtasks)
@@ -20,6 +20,7 @@ from pytz import UTC
 
 from track.views import task_track
 from util.file import course_filename_prefix_generator, UniversalNewlineIterator
+from util.query import uses_read_replica_if_available
 from xmodule.modulestore.django import modulestore
 
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -28,8 +29,8 @@ from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_analytics.basic import enrolled_students_features
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.basic import iter_enrolled_students_features
+from instructor_analytics.csvs import iter_format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
 from student.models import CourseEnrollment
 
@@ -44,6 +45,10 @@ UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
 
+# define number of StudentModule rows to fetch at a time when visiting all of the
+# submissions to a problem
+STUDENT_MODULE_CHUNK_SIZE = 1000
+
 
 class BaseInstructorTask(Task):
     """
@@ -257,6 +262,32 @@ def run_main_task(entry_id, task_fcn, action_name):
     return task_progress
 
 
+def _iterate_student_modules(modules_to_update, chunk_size=None):
+    """
+    Yields the StudentModule objects matched by `modules_to_update`, in order of primary key.
+
+    Rows are fetched `chunk_size` at a time, by asking for the rows following the
+    last primary key seen, so that visiting every submission to a popular problem
+    neither materializes the whole result set in memory nor holds a long-running
+    cursor open.  The `student` of each StudentModule is fetched in the same query,
+    rather than with one query per row.
+
+    Rows deleted while visiting (as `delete_problem_module_state` does) do not
+    affect which rows are visited next.
+    """
+    chunk_size = chunk_size or STUDENT_MODULE_CHUNK_SIZE
+    modules_to_update = modules_to_update.select_related('student').order_by('id')
+    last_id = None
+    while True:
+        chunk_query = modules_to_update if last_id is None else modules_to_update.filter(id__gt=last_id)
+        chunk = list(chunk_query[:chunk_size])
+        for module_to_update in chunk:
+            yield module_to_update
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1].id
+
+
 def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
@@ -321,7 +352,7 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
+    for module_to_update in _iterate_student_modules(modules_to_update):
         task_progress.attempted += 1
         # There is no try here:  if there's an error, we let it throw, and the task will
         # be marked as FAILED, with a stack trace.
@@ -528,6 +559,7 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
     )
 
 
+@uses_read_replica_if_available
 def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
@@ -600,6 +632,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+@uses_read_replica_if_available
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing profile
@@ -612,21 +645,25 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table and format it, one student at a time
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
+    student_data = iter_enrolled_students_features(course_id, query_features)
 
-    rows.insert(0, header)
+    def rows():
+        """Generates the header and a row per student, counting the students as they go."""
+        yield query_features
+        for row in iter_format_dictlist(student_data, query_features):
+            task_progress.attempted += 1
+            yield row
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+    # Perform the upload, writing out rows as they are generated
+    upload_csv_to_report_store(rows(), 'student_profile_info', course_id, start_date)
+
+    task_progress.succeeded = task_progress.attempted
+    task_progress.skipped = task_progress.total - task_progress.attempted
 
     return task_progress.update_task_state(extra_meta=current_step)
 
@@ -1,13 +1,24 @@
 """
 Unit tests for instructor_task subtasks.
 """
+import json
 from uuid import uuid4
 
+from celery.states import SUCCESS, FAILURE, RETRY
 from mock import Mock, patch
 
 from student.models import CourseEnrollment
 
-from instructor_task.subtasks import queue_subtasks_for_query
+from instructor_task.models import InstructorTask, PROGRESS
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    _roll_up_subtask_statuses,
+    get_items_for_subtask,
+    initialize_subtask_info,
+    queue_subtasks_for_query,
+    refresh_subtask_progress,
+    update_subtask_status,
+)
 from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase
 
@@ -27,7 +38,11 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             self.create_student(username='student{0}'.format(random_id))
 
     def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
-        """Queue subtasks while enrolling more students into course in the middle of the process."""
+        """
+        Queue subtasks while enrolling more students into course in the middle of the process.
+
+        Returns the queryset the subtasks were queued for.
+        """
 
         task_id = str(uuid4())
         instructor_task = InstructorTaskFactory.create(
@@ -40,42 +55,116 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self._enroll_students_in_course(self.course.id, initial_count)
         task_queryset = CourseEnrollment.objects.filter(course_id=self.course.id)
 
-        def initialize_subtask_info(*args):  # pylint: disable=unused-argument
+        def fake_initialize_subtask_info(*args):  # pylint: disable=unused-argument
             """Instead of initializing subtask info enroll some more students into course."""
             self._enroll_students_in_course(self.course.id, extra_count)
             return {}
 
         with patch('instructor_task.subtasks.initialize_subtask_info') as mock_initialize_subtask_info:
-            mock_initialize_subtask_info.side_effect = initialize_subtask_info
+            mock_initialize_subtask_info.side_effect = fake_initialize_subtask_info
             queue_subtasks_for_query(
                 entry=instructor_task,
                 action_name='action_name',
                 create_subtask_fcn=create_subtask_fcn,
                 item_queryset=task_queryset,
-                item_fields=[],
                 items_per_task=items_per_task,
             )
+        return task_queryset
+
+    def _get_items_per_subtask(self, task_queryset, mock_create_subtask_fcn):
+        """Returns the number of items fetched by each subtask created by the mock."""
+        return [
+            len(get_items_for_subtask(task_queryset, [], call_args[0][0]))
+            for call_args in mock_create_subtask_fcn.call_args_list
+        ]
 
     def test_queue_subtasks_for_query1(self):
         """Test queue_subtasks_for_query() if the last subtask only needs to accommodate < items_per_tasks items."""
 
         mock_create_subtask_fcn = Mock()
-        self._queue_subtasks(mock_create_subtask_fcn, 3, 7, 1)
+        task_queryset = self._queue_subtasks(mock_create_subtask_fcn, 3, 7, 1)
 
         # Check number of items for each subtask
-        mock_create_subtask_fcn_args = mock_create_subtask_fcn.call_args_list
-        self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
-        self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
-        self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 2)
+        self.assertEqual(self._get_items_per_subtask(task_queryset, mock_create_subtask_fcn), [3, 3, 2])
 
     def test_queue_subtasks_for_query2(self):
         """Test queue_subtasks_for_query() if the last subtask needs to accommodate > items_per_task items."""
 
         mock_create_subtask_fcn = Mock()
-        self._queue_subtasks(mock_create_subtask_fcn, 3, 8, 3)
+        task_queryset = self._queue_subtasks(mock_create_subtask_fcn, 3, 8, 3)
 
         # Check number of items for each subtask
-        mock_create_subtask_fcn_args = mock_create_subtask_fcn.call_args_list
-        self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
-        self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
-        self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+        self.assertEqual(self._get_items_per_subtask(task_queryset, mock_create_subtask_fcn), [3, 3, 5])
+
+    def test_queue_subtasks_for_query_passes_bounds(self):
+        """Test that queue_subtasks_for_query() passes subtasks the primary key bounds of their chunks."""
+
+        mock_create_subtask_fcn = Mock()
+        task_queryset = self._queue_subtasks(mock_create_subtask_fcn, 3, 6, 0)
+
+        pks = list(task_queryset.order_by('pk').values_list('pk', flat=True))
+        bounds = [call_args[0][0] for call_args in mock_create_subtask_fcn.call_args_list]
+        self.assertEqual(bounds, [(None, pks[2]), (pks[2] + 1, None)])
+
+    def test_subtask_statuses_rolled_up_when_done(self):
+        """Test that subtasks only update their InstructorTask once they have all finished."""
+        instructor_task = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='bulk_course_email',
+        )
+        first_id, second_id = str(uuid4()), str(uuid4())
+        initialize_subtask_info(instructor_task, 'emailed', 5, [first_id, second_id])
+
+        update_subtask_status(instructor_task.id, first_id, SubtaskStatus.create(first_id, succeeded=3, state=SUCCESS))
+        entry = InstructorTask.objects.get(id=instructor_task.id)
+        self.assertEqual(json.loads(entry.task_output)['succeeded'], 0)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 0)
+
+        # reading the task's progress includes subtasks that have not been rolled up yet
+        refresh_subtask_progress(entry)
+        self.assertEqual(entry.task_state, PROGRESS)
+        self.assertEqual(json.loads(entry.task_output)['succeeded'], 3)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 1)
+
+        update_subtask_status(instructor_task.id, second_id, SubtaskStatus.create(second_id, failed=2, state=FAILURE))
+        entry = InstructorTask.objects.get(id=instructor_task.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        task_progress = json.loads(entry.task_output)
+        self.assertEqual(
+            (task_progress['attempted'], task_progress['succeeded'], task_progress['failed']),
+            (5, 3, 2)
+        )
+        subtask_dict = json.loads(entry.subtasks)
+        self.assertEqual((subtask_dict['succeeded'], subtask_dict['failed']), (1, 1))
+        self.assertEqual(subtask_dict['status'][first_id]['succeeded'], 3)
+
+    def test_stale_roll_up_keeps_finished_subtasks(self):
+        """Test that rolling up an out-of-date subtask status does not undo a finished subtask."""
+        instructor_task = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='bulk_course_email',
+        )
+        first_id, second_id = str(uuid4()), str(uuid4())
+        initialize_subtask_info(instructor_task, 'emailed', 5, [first_id, second_id])
+        update_subtask_status(instructor_task.id, first_id, SubtaskStatus.create(first_id, succeeded=3, state=SUCCESS))
+        update_subtask_status(
+            instructor_task.id, second_id, SubtaskStatus.create(second_id, succeeded=2, state=SUCCESS)
+        )
+
+        stale_statuses = {
+            first_id: SubtaskStatus.create(first_id, succeeded=3, state=SUCCESS).to_dict(),
+            second_id: SubtaskStatus.create(second_id, state=RETRY).to_dict(),
+        }
+        with patch('instructor_task.subtasks._get_subtask_statuses', return_value=stale_statuses):
+            _roll_up_subtask_statuses(instructor_task.id)
+
+        entry = InstructorTask.objects.get(id=instructor_task.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.task_output)['succeeded'], 5)
+        subtask_dict = json.loads(entry.subtasks)
+        self.assertEqual(subtask_dict['succeeded'], 2)
+        self.assertEqual(subtask_dict['status'][second_id]['state'], SUCCESS)
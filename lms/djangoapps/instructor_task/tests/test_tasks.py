@@ -335,6 +335,14 @@ class TestResetAttemptsInstructorTask(TestInstructorTasks):
         # check that entries were reset
         self._assert_num_attempts(students, 0)
 
+    @patch('instructor_task.tasks_helper.STUDENT_MODULE_CHUNK_SIZE', 3)
+    def test_reset_with_multiple_chunks(self):
+        input_state = json.dumps({'attempts': 3})
+        num_students = 10
+        students = self._create_students_with_state(num_students, input_state)
+        self._test_run_with_task(reset_problem_attempts, 'reset', num_students)
+        self._assert_num_attempts(students, 0)
+
     def test_reset_with_zero_attempts(self):
         initial_attempts = 0
         input_state = json.dumps({'attempts': initial_attempts})
@@ -438,3 +446,12 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                 StudentModule.objects.get(course_id=self.course.id,
                                           student=student,
                                           module_state_key=self.location)
+
+    @patch('instructor_task.tasks_helper.STUDENT_MODULE_CHUNK_SIZE', 3)
+    def test_delete_with_multiple_chunks(self):
+        num_students = 10
+        self._create_students_with_state(num_students)
+        self._test_run_with_task(delete_problem_state, 'deleted', num_students)
+        self.assertFalse(
+            StudentModule.objects.filter(course_id=self.course.id, module_state_key=self.location).exists()
+        )
@@ -133,10 +133,14 @@ class LmsPartitionService(PartitionService):
     the least messy way to hook things through)
 
     """
+    _course_partitions = None
+
     @property
     def course_partitions(self):
-        course = modulestore().get_course(self.runtime.course_id)
-        return course.user_partitions
+        if self._course_partitions is None:
+            course = modulestore().get_course(self.runtime.course_id)
+            self._course_partitions = course.user_partitions
+        return self._course_partitions
 
 
 class UserTagsService(object):
@@ -149,11 +153,18 @@ class UserTagsService(object):
 
     def __init__(self, runtime):
         self.runtime = runtime
+        self._user = None
 
     def _get_current_user(self):
-        """Returns the real, not anonymized, current user."""
-        real_user = self.runtime.get_real_user(self.runtime.anonymous_student_id)
-        return real_user
+        """
+        Returns the real, not anonymized, current user.
+
+        The same User object is returned every time, so that the course tags
+        cached on it by the course tag API are shared between calls.
+        """
+        if self._user is None:
+            self._user = self.runtime.get_real_user(self.runtime.anonymous_student_id)
+        return self._user
 
     def get_tag(self, scope, key):
         """
@@ -9,7 +9,7 @@ from student.models import CourseEnrollment, User
 
 
 class CourseField(serializers.RelatedField):
-    """Custom field to wrap a CourseDescriptor object. Read-only."""
+    """Custom field to wrap a CourseOverview object. Read-only."""
 
     def to_native(self, course):
         course_id = unicode(course.id)
@@ -63,7 +63,7 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
     """
     Serializes CourseEnrollment models
     """
-    course = CourseField()
+    course = CourseField(source='course_overview')
 
     class Meta:  # pylint: disable=missing-docstring
         model = CourseEnrollment
@@ -244,7 +244,7 @@ class UserCourseEnrollmentsList(generics.ListAPIView):
         enrollments = self.queryset.filter(user__username=self.kwargs['username'], is_active=True).order_by('created')
         return [
             enrollment for enrollment in enrollments
-            if mobile_access_when_enrolled(enrollment.course, self.request.user)
+            if mobile_access_when_enrolled(enrollment.course_overview, self.request.user)
         ]
 
 
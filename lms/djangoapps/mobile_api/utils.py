@@ -4,9 +4,9 @@ Common utility methods and decorators for Mobile APIs.
 
 
 import functools
-from django.http import Http404
 
 from opaque_keys.edx.keys import CourseKey
+from courseware.access import has_access
 from courseware.courses import get_course_with_access
 from rest_framework import permissions
 from rest_framework.authentication import OAuth2Authentication, SessionAuthentication
@@ -47,10 +47,8 @@ def mobile_access_when_enrolled(course, user):
     # pointing to non-existent (or removed) courses, in which case `course` is None.
     if not course:
         return False
-    try:
-        return get_course_with_access(user, 'load_mobile_no_enrollment_check', course.id) is not None
-    except Http404:
-        return False
+    # course may be a descriptor or a CourseOverview; either carries what the check needs
+    return has_access(user, 'load_mobile_no_enrollment_check', course)
 
 
 def mobile_view(is_user=False):
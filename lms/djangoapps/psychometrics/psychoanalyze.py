@@ -6,6 +6,7 @@
 from __future__ import division
 
 import datetime
+import hashlib
 import logging
 import json
 import math
@@ -14,7 +15,8 @@ from opaque_keys.edx.locator import BlockUsageLocator
 from scipy.optimize import curve_fit
 
 from django.conf import settings
-from django.db.models import Sum, Max
+from django.core.cache import cache
+from django.db.models import Count, Sum, Max
 from psychometrics.models import PsychometricData
 from courseware.models import StudentModule
 from pytz import UTC
@@ -26,6 +28,11 @@ log = logging.getLogger("edx.psychometrics")
 
 db = getattr(settings, 'DATABASE_FOR_PSYCHOMETRICS', 'default')
 
+# Number of seconds for which the plots of a problem are cached.  The cache key
+# changes whenever the psychometric data of the problem does, so this only
+# bounds how long plots of data that has since changed are kept around.
+PLOTS_CACHE_TIMEOUT = 24 * 60 * 60
+
 #-----------------------------------------------------------------------------
 # fit functions
 
@@ -54,6 +61,22 @@ class StatVar(object):
         self.min = None
         self.max = None
 
+    @classmethod
+    def from_array(cls, values, unit=1):
+        """
+        Return a StatVar of the numbers in the array values, skipping NaNs
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        stats = cls(unit)
+        if values.size:
+            stats.sum = float(values.sum())
+            stats.sum2 = float(np.dot(values, values))
+            stats.cnt = int(values.size)
+            stats.min = float(values.min())
+            stats.max = float(values.max())
+        return stats
+
     def add(self, x):
         if x is None:
             return
@@ -99,6 +122,16 @@ class StatVar(object):
 # histogram generator
 
 
+def _count_occurrences(values, length):
+    """
+    Return an array of the number of times each of 0 to length - 1 occurs in
+    the integer array values.  Unlike np.bincount, values may be empty.
+    """
+    if not len(values):
+        return np.zeros(length, dtype=int)
+    return np.bincount(values, minlength=length)
+
+
 def make_histogram(ydata, bins=None):
     '''
     Generate histogram of ydata using bins provided, or by default bins
@@ -111,12 +144,12 @@ def make_histogram(ydata, bins=None):
         bins = range(0, 100, 10)
 
     nbins = len(bins)
-    hist = dict(zip(bins, [0] * nbins))
-    for y in ydata:
-        for b in bins[::-1]:  # in reverse order
-            if y > b:
-                hist[b] += 1
-                break
+    ydata = np.asarray(ydata, dtype=float)
+    ydata = ydata[~np.isnan(ydata)]
+    # each y is counted in the largest bin below it
+    ybins = np.searchsorted(bins, ydata, side='left') - 1
+    counts = _count_occurrences(ybins[ybins >= 0], nbins)
+    hist = dict(zip(bins, counts.tolist()))
     # hist['bins'] = bins
     return hist
 
@@ -129,14 +162,8 @@ def problems_with_psychometric_data(course_id):
     Does this for a given course_id.
     '''
     pmdset = PsychometricData.objects.using(db).filter(studentmodule__course_id=course_id)
-    plist = [p['studentmodule__module_state_key'] for p in pmdset.values('studentmodule__module_state_key').distinct()]
     problems = dict(
-        (
-            p,
-            pmdset.filter(
-                studentmodule__module_state_key=BlockUsageLocator.from_string(p)
-            ).count()
-        ) for p in plist
+        pmdset.values_list('studentmodule__module_state_key').annotate(count=Count('id')).order_by()
     )
 
     return problems
@@ -145,11 +172,31 @@ def problems_with_psychometric_data(course_id):
 
 
 def generate_plots_for_problem(problem):
+    """
+    Return (msg, plots) for the psychometric data of the problem with location url problem.
 
+    The plots are cached until the psychometric data of the problem changes.
+    """
     pmdset = PsychometricData.objects.using(db).filter(
         studentmodule__module_state_key=BlockUsageLocator.from_string(problem)
     )
-    nstudents = pmdset.count()
+    summary = pmdset.aggregate(Count('id'), Sum('attempts'), Max('attempts'), Max('studentmodule__modified'))
+    cache_key = 'psychometrics.plots.{}'.format(
+        hashlib.md5(repr((problem, sorted(summary.items())))).hexdigest()
+    )
+    result = cache.get(cache_key)
+    if result is None:
+        result = _generate_plots_for_problem(problem, pmdset, summary)
+        cache.set(cache_key, result, PLOTS_CACHE_TIMEOUT)
+    return result
+
+
+def _generate_plots_for_problem(problem, pmdset, summary):
+    """
+    Compute the (msg, plots) returned by generate_plots_for_problem from the
+    psychometric data in pmdset, whose aggregates are given by summary.
+    """
+    nstudents = summary['id__count']
     msg = ""
     plots = []
 
@@ -157,11 +204,16 @@ def generate_plots_for_problem(problem):
         msg += "%s nstudents=%d --> skipping, too few" % (problem, nstudents)
         return msg, plots
 
-    max_grade = pmdset[0].studentmodule.max_grade
+    # fetch the data of all students at once, as one array per column
+    rows = pmdset.values_list('studentmodule__grade', 'studentmodule__max_grade', 'attempts', 'checktimes')
+    grade_column, max_grade_column, attempts_column, checktimes_column = zip(*rows)
+    grades = np.array(grade_column, dtype=float)  # ungraded students are NaN
+    attempts = np.array(attempts_column, dtype=int)
 
-    agdat = pmdset.aggregate(Sum('attempts'), Max('attempts'))
-    max_attempts = agdat['attempts__max']
-    total_attempts = agdat['attempts__sum']  # not used yet
+    max_grade = max_grade_column[0]
+
+    max_attempts = summary['attempts__max']
+    total_attempts = summary['attempts__sum']  # not used yet
 
     msg += "max attempts = %d" % max_attempts
 
@@ -169,10 +221,7 @@ def generate_plots_for_problem(problem):
     dataset = {'xdat': xdat}
 
     # compute grade statistics
-    grades = [pmd.studentmodule.grade for pmd in pmdset]
-    gsv = StatVar()
-    for g in grades:
-        gsv += g
+    gsv = StatVar.from_array(grades)
     msg += "<br><p><font color='blue'>Grade distribution: %s</font></p>" % gsv
 
     # generate grade histogram
@@ -209,21 +258,15 @@ def generate_plots_for_problem(problem):
     # histogram of time differences between checks
     # Warning: this is inefficient - doesn't scale to large numbers of students
     dtset = []  # time differences in minutes
-    dtsv = StatVar()
-    for pmd in pmdset:
+    for checktimes in checktimes_column:
         try:
-            checktimes = eval(pmd.checktimes)  # update log of attempt timestamps
+            checktimes = eval(checktimes)  # update log of attempt timestamps
         except:
             continue
-        if len(checktimes) < 2:
-            continue
-        ct0 = checktimes[0]
-        for ct in checktimes[1:]:
-            dt = (ct - ct0).total_seconds() / 60.0
-            if dt < 20:  # ignore if dt too long
-                dtset.append(dt)
-                dtsv += dt
-            ct0 = ct
+        dtset.extend((ct - ct0).total_seconds() / 60.0 for (ct0, ct) in zip(checktimes, checktimes[1:]))
+    dtset = np.array(dtset, dtype=float)
+    dtset = dtset[dtset < 20]  # ignore if dt too long
+    dtsv = StatVar.from_array(dtset)
     if dtsv.cnt > 2:
         msg += "<br/><p><font color='brown'>Time differences between checks: %s</font></p>" % dtsv
         bins = np.linspace(0, 1.5 * dtsv.sdv(), 30)
@@ -242,18 +285,20 @@ def generate_plots_for_problem(problem):
         plots.append(plot)
 
     # one IRT plot curve for each grade received (TODO: this assumes integer grades)
-    for grade in range(1, int(max_grade) + 1):
+    # counts[grade, x] is the number of students with that grade after x attempts
+    ngrades = int(max_grade) + 1
+    nattempts = max_attempts + 1
+    graded = ~np.isnan(grades)
+    graded[graded] = (grades[graded] == np.round(grades[graded])) & (grades[graded] >= 0) & (grades[graded] < ngrades)
+    cells = grades[graded].astype(int) * nattempts + attempts[graded]
+    counts = _count_occurrences(cells, ngrades * nattempts).reshape((ngrades, nattempts))
+    for grade in range(1, ngrades):
         yset = {}
-        gset = pmdset.filter(studentmodule__grade=grade)
-        ngset = gset.count()
+        ngset = counts[grade].sum()
         if ngset == 0:
             continue
-        ydat = []
-        ylast = 0
-        for x in xdat:
-            y = gset.filter(attempts=x).count() / ngset
-            ydat.append(y + ylast)
-            ylast = y + ylast
+        # the fraction of the students with this grade that got it within x attempts
+        ydat = (np.cumsum(counts[grade, 1:]) / ngset).tolist()
         yset['ydat'] = ydat
 
         if len(ydat) > 3:  # try to fit to logistic function if enough data points
@@ -210,6 +210,20 @@ class PhotoVerification(StatusModel):
             window=window
         ).exists()
 
+    @classmethod
+    def verified_user_ids(cls, user_ids, earliest_allowed_date=None, window=None):
+        """
+        Return the set of the ids in `user_ids` of users for whom
+        user_is_verified() is true, found with a single query.
+        """
+        return set(cls.objects.filter(
+            user__in=list(user_ids),
+            status="approved",
+            created_at__gte=(earliest_allowed_date
+                             or cls._earliest_allowed_date()),
+            window=window
+        ).values_list('user_id', flat=True))
+
     @classmethod
     def user_has_valid_or_pending(cls, user, earliest_allowed_date=None, window=None, queryset=None):
         """
@@ -629,6 +643,33 @@ class SoftwareSecurePhotoVerification(PhotoVerification):
 
         return True
 
+    @classmethod
+    def reverified_for_all_user_ids(cls, course_id, user_ids):
+        """
+        Return the set of the ids in `user_ids` of users for whom
+        user_is_reverified_for_all() is true, found with at most two queries.
+        """
+        user_ids = list(user_ids)
+        window_ids = set(
+            MidcourseReverificationWindow.objects.filter(course_id=course_id).values_list('id', flat=True)
+        )
+        # if there are no windows for a course, then every user is reverified
+        if not window_ids:
+            return set(user_ids)
+
+        # The status of the most recent reverification for each window must be "approved"
+        # for a student to count as completely reverified
+        latest_statuses = {}
+        attempts = cls.objects.filter(
+            user__in=user_ids, window__in=window_ids
+        ).order_by('updated_at').values_list('user_id', 'window_id', 'status')
+        for user_id, window_id, status in attempts:
+            latest_statuses[(user_id, window_id)] = status
+        return set(
+            user_id for user_id in user_ids
+            if all(latest_statuses.get((user_id, window_id)) == "approved" for window_id in window_ids)
+        )
+
     @classmethod
     def original_verification(cls, user):
         """
@@ -416,6 +416,9 @@ GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
+# Read replica
+READ_REPLICA_MAX_LAG = ENV_TOKENS.get("READ_REPLICA_MAX_LAG", READ_REPLICA_MAX_LAG)
+
 ##### ORA2 ######
 # Prefix for uploads of example-based assessment AI classifiers
 # This can be used to separate uploads for different environments
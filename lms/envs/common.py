@@ -1483,6 +1483,9 @@ INSTALLED_APPS = (
     'openedx.core.djangoapps.course_groups',
     'bulk_email',
 
+    # Denormalized course metadata for the dashboard and other course listings
+    'openedx.core.djangoapps.course_overviews',
+
     # External auth (OpenID, shib)
     'external_auth',
     'django_openid_auth',
@@ -1646,6 +1649,14 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+###################### Read Replica ######################
+# Reports and analytics read from a database called 'read_replica', if one is
+# configured in DATABASES.  If READ_REPLICA_MAX_LAG is set, they don't while the
+# replica is more than that many seconds behind the primary, or while its lag
+# can't be measured; measuring it needs the REPLICATION CLIENT privilege on MySQL.
+DATABASE_ROUTERS = ['util.query.ReadReplicaRouter']
+READ_REPLICA_MAX_LAG = None
+
 ######################## PROGRESS SUCCESS BUTTON ##############################
 # The following fields are available in the URL: {course_id} {student_id}
 PROGRESS_SUCCESS_BUTTON_URL = 'http://<domain>/<path>/{course_id}'
@@ -6,7 +6,8 @@ forums, and to the cohort admin views.
 import logging
 import random
 
-from django.db.models.signals import post_save, m2m_changed
+from django.core.cache import cache
+from django.db.models.signals import post_save, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import ugettext as _
@@ -69,6 +70,68 @@ def _cohort_membership_changed(sender, **kwargs):
         tracker.emit(event_name, event)
 
 
+# Users' cohorts are cached per (course, user), so that the forums, the cohort partition
+# scheme and split tests can look a user's cohort up repeatedly without querying
+# membership. Entries are deleted whenever the user's membership or the cohort changes.
+COHORT_CACHE_KEY = u"cohorts.cohort.{course_id}.{user_id}"
+
+# The number of users whose cohorts get_cohorts_for_users looks up per query.
+COHORTS_FOR_USERS_BATCH_SIZE = 500
+
+
+def _cohort_cache_key(course_key, user_id):
+    """
+    Returns the key under which the cohort of the given user in the given course is cached.
+    """
+    return COHORT_CACHE_KEY.format(course_id=course_key, user_id=user_id)
+
+
+def _invalidate_cached_cohorts(course_keys, user_ids):
+    """
+    Forgets the cached cohorts of the given users in the given courses.
+    """
+    cache.delete_many([
+        _cohort_cache_key(course_key, user_id)
+        for course_key in set(course_keys)
+        for user_id in user_ids
+    ])
+
+
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+def _invalidate_cohort_membership(sender, **kwargs):  # pylint: disable=unused-argument
+    """Forgets the cached cohorts of users whose group membership is modified"""
+    action = kwargs["action"]
+    instance = kwargs["instance"]
+    pk_set = kwargs["pk_set"]
+
+    if action not in ["post_add", "post_remove", "pre_clear"]:
+        return
+
+    if kwargs["reverse"]:
+        user_ids = [instance.id]
+        if action == "pre_clear":
+            groups = instance.course_groups.all()
+        else:
+            groups = CourseUserGroup.objects.filter(pk__in=pk_set)
+        course_keys = [group.course_id for group in groups]
+    else:
+        course_keys = [instance.course_id]
+        if action == "pre_clear":
+            user_ids = list(instance.users.values_list('id', flat=True))
+        else:
+            user_ids = pk_set
+
+    _invalidate_cached_cohorts(course_keys, user_ids)
+
+
+@receiver(post_save, sender=CourseUserGroup)
+@receiver(pre_delete, sender=CourseUserGroup)
+def _invalidate_cohort(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Forgets the cached cohorts of the members of a cohort that is renamed or deleted"""
+    if not kwargs.get("created", False):
+        _invalidate_cached_cohorts([instance.course_id], list(instance.users.values_list('id', flat=True)))
+
+
 # A 'default cohort' is an auto-cohort that is automatically created for a course if no auto_cohort_groups have been
 # specified. It is intended to be used in a cohorted-course for users who have yet to be assigned to a cohort.
 # Note 1: If an administrator chooses to configure a cohort with the same name, the said cohort will be used as
@@ -222,12 +285,19 @@ def get_cohort(user, course_key):
     if not course.is_cohorted:
         return None
 
+    cache_key = _cohort_cache_key(course_key, user.id)
+    cohort = cache.get(cache_key)
+    if cohort is not None:
+        return cohort
+
     try:
-        return CourseUserGroup.objects.get(
+        cohort = CourseUserGroup.objects.get(
             course_id=course_key,
             group_type=CourseUserGroup.COHORT,
             users__id=user.id,
         )
+        cache.set(cache_key, cohort)
+        return cohort
     except CourseUserGroup.DoesNotExist:
         # Didn't find the group.  We'll go on to create one if needed.
         pass
@@ -249,6 +319,37 @@ def get_cohort(user, course_key):
     return group
 
 
+def get_cohorts_for_users(course_key, user_ids=None):
+    """
+    Get the cohorts of many users in a course at once, without assigning a
+    cohort to users who have none.
+
+    Arguments:
+        course_key: CourseKey
+        user_ids: the ids of the users to look up, or None for all the users
+            that are in a cohort in the course.
+
+    Returns:
+        A dict mapping user ids to CourseUserGroup objects.  Users who are not
+        in a cohort are left out.  Does not check whether the course is cohorted.
+    """
+    memberships = CourseUserGroup.users.through.objects.filter(
+        courseusergroup__course_id=course_key,
+        courseusergroup__group_type=CourseUserGroup.COHORT,
+    ).select_related('courseusergroup')
+
+    if user_ids is None:
+        return {membership.user_id: membership.courseusergroup for membership in memberships}
+
+    # Look the users up in batches, to keep the size of each query bounded.
+    user_ids = list(user_ids)
+    cohorts_by_user_id = {}
+    for start in xrange(0, len(user_ids), COHORTS_FOR_USERS_BATCH_SIZE):
+        batch = memberships.filter(user__in=user_ids[start:start + COHORTS_FOR_USERS_BATCH_SIZE])
+        cohorts_by_user_id.update((membership.user_id, membership.courseusergroup) for membership in batch)
+    return cohorts_by_user_id
+
+
 def get_course_cohorts(course):
     """
     Get a list of all the cohorts in the given course. This will include auto cohorts,
@@ -391,3 +492,18 @@ def get_partition_group_id_for_cohort(cohort):
     if len(res):
         return res[0].partition_id, res[0].group_id
     return None, None
+
+
+def get_partition_group_ids_for_cohorts(cohorts):
+    """
+    Get the ids of the partitions and groups to which each of the given cohorts
+    has been linked, in a single query.
+
+    Returns:
+        A dict mapping cohort ids to (int, int) tuples of partition id and
+        group id.  Cohorts that have not been linked are left out.
+    """
+    links = CourseUserGroupPartitionGroup.objects.filter(
+        course_user_group__in=[cohort.id for cohort in cohorts]
+    )
+    return {link.course_user_group_id: (link.partition_id, link.group_id) for link in links}
@@ -3,7 +3,12 @@ Provides a UserPartition driver for cohorts.
 """
 import logging
 
-from .cohorts import get_cohort, get_partition_group_id_for_cohort
+from .cohorts import (
+    get_cohort,
+    get_cohorts_for_users,
+    get_partition_group_id_for_cohort,
+    get_partition_group_ids_for_cohorts,
+)
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +41,36 @@ class CohortPartitionScheme(object):
             return None
 
         partition_id, group_id = get_partition_group_id_for_cohort(cohort)
+        return cls._get_linked_group(cohort, partition_id, group_id, user_partition)
+
+    @classmethod
+    def get_groups_for_users(cls, course_id, users, user_partition):
+        """
+        Returns a dict mapping the ids of the specified users to the Groups of
+        the specified user partition to which they are assigned via their
+        cohorts, looking all of the users up at once.
+
+        Unlike get_group_for_user, users who are not in a cohort are left out
+        rather than assigned to one, as are users whose cohort isn't mapped to
+        a group of the partition.
+        """
+        cohorts = get_cohorts_for_users(course_id, [user.id for user in users])
+        links = get_partition_group_ids_for_cohorts(set(cohorts.values()))
+        groups = {}
+        for user_id, cohort in cohorts.iteritems():
+            partition_id, group_id = links.get(cohort.id, (None, None))
+            group = cls._get_linked_group(cohort, partition_id, group_id, user_partition)
+            if group is not None:
+                groups[user_id] = group
+        return groups
+
+    @classmethod
+    def _get_linked_group(cls, cohort, partition_id, group_id, user_partition):
+        """
+        Returns the Group of user_partition identified by the partition and
+        group ids that cohort is linked to, or None if the link is missing or
+        doesn't match the partition.
+        """
         if partition_id is None:
             # cohort isn't mapped to any partition group.
             return None
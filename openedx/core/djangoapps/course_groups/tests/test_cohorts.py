@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import IntegrityError
 from django.http import Http404
 from django.test import TestCase
@@ -130,8 +131,10 @@ class TestCohorts(TestCase):
     def setUp(self):
         """
         Make sure that course is reloaded every time--clear out the modulestore.
+        Users' cached cohorts are cleared too, as user ids are reused between tests.
         """
         clear_existing_modulestores()
+        cache.clear()
         self.toy_course_key = SlashSeparatedCourseKey("edX", "toy", "2012_Fall")
 
     def test_is_course_cohorted(self):
@@ -207,6 +210,50 @@ class TestCohorts(TestCase):
             "other_user should be assigned to the default cohort"
         )
 
+    def test_get_cohort_cached(self):
+        """
+        Make sure cohorts.get_cohort() only queries membership until it is cached, and
+        notices membership changes made through either side of the relation.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, discussions=[], cohorted=True)
+        user = UserFactory(username="test", email="a@b.com")
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        first_cohort.users.add(user)
+
+        self.assertEqual(cohorts.get_cohort(user, course.id).id, first_cohort.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(cohorts.get_cohort_id(user, course.id), first_cohort.id)
+
+        first_cohort.users.remove(user)
+        User.objects.get(id=user.id).course_groups.add(second_cohort)
+        self.assertEqual(cohorts.get_cohort(user, course.id).id, second_cohort.id)
+
+        second_cohort.name = "RenamedCohort"
+        second_cohort.save()
+        self.assertEqual(cohorts.get_cohort(user, course.id).name, "RenamedCohort")
+
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() returns the cohorts of all the users at once,
+        without assigning cohorts to the users who have none.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, discussions=[], cohorted=True)
+        users = [UserFactory(username="test{}".format(i), email="a{}@b.com".format(i)) for i in range(3)]
+        cohort = CohortFactory(course_id=course.id, name="TestCohort")
+        cohort.users.add(users[0], users[1])
+        CohortFactory(course_id=SlashSeparatedCourseKey("other", "course", "run"), users=[users[2]])
+
+        with self.assertNumQueries(1):
+            cohorts_by_user_id = cohorts.get_cohorts_for_users(course.id, [user.id for user in users])
+        self.assertEqual(
+            {user_id: group.name for user_id, group in cohorts_by_user_id.items()},
+            {users[0].id: "TestCohort", users[1].id: "TestCohort"}
+        )
+        self.assertEqual(set(cohorts.get_cohorts_for_users(course.id)), {users[0].id, users[1].id})
+
     def test_auto_cohorting(self):
         """
         Make sure cohorts.get_cohort() does the right thing with auto_cohort_groups
@@ -4,6 +4,7 @@ Test the partitions and partitions service
 """
 
 from django.conf import settings
+from django.core.cache import cache
 import django.test
 from django.test.utils import override_settings
 from mock import patch
@@ -36,6 +37,7 @@ class TestCohortPartitionScheme(django.test.TestCase):
         Regenerate a course with cohort configuration, partition and groups,
         and a student for each test.
         """
+        cache.clear()
         self.course_key = SlashSeparatedCourseKey("edX", "toy", "2012_Fall")
         config_course_cohorts(modulestore().get_course(self.course_key), [], cohorted=True)
 
@@ -114,6 +116,29 @@ class TestCohortPartitionScheme(django.test.TestCase):
         second_cohort.users.remove(self.student)
         self.assert_student_in_group(None)
 
+    def test_get_groups_for_users(self):
+        """
+        Test that the CohortPartitionScheme looks up the groups of many
+        students at once, leaving out students without a linked cohort.
+        """
+        first_cohort, second_cohort, unlinked_cohort = [
+            CohortFactory(course_id=self.course_key) for _ in range(3)
+        ]
+        self.link_cohort_partition_group(first_cohort, self.user_partition, self.groups[0])
+        self.link_cohort_partition_group(second_cohort, self.user_partition, self.groups[1])
+        other_student, unlinked_student, uncohorted_student = [UserFactory.create() for _ in range(3)]
+        add_user_to_cohort(first_cohort, self.student.username)
+        add_user_to_cohort(second_cohort, other_student.username)
+        add_user_to_cohort(unlinked_cohort, unlinked_student.username)
+
+        with self.assertNumQueries(2):
+            groups = CohortPartitionScheme.get_groups_for_users(
+                self.course_key,
+                [self.student, other_student, unlinked_student, uncohorted_student],
+                self.user_partition,
+            )
+        self.assertEqual(groups, {self.student.id: self.groups[0], other_student.id: self.groups[1]})
+
     def test_cohort_partition_group_assignment(self):
         """
         Test that the CohortPartitionScheme returns the correct group for a
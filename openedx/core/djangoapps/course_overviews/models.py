@@ -0,0 +1,270 @@
+"""
+Declaration of CourseOverview model, a denormalized copy of the course-level
+metadata that the dashboard and other course listings need.
+
+Loading a course descriptor from the modulestore is expensive, and pages that
+list many courses only need a handful of fields from each one. A CourseOverview
+row holds those fields; it is created lazily from the modulestore the first
+time a course is asked for, and deleted whenever the course-level block of
+that course changes so that the next read rebuilds it.
+"""
+from datetime import datetime
+import logging
+
+from pytz import UTC
+
+from django.db import models, IntegrityError
+from django.dispatch import receiver
+from django.utils.translation import ugettext
+
+from util.date_utils import strftime_localized
+from xmodule.course_module import CourseFields
+from xmodule.error_module import ErrorDescriptor
+from xmodule.fields import Date
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore, course_published
+from xmodule_django.models import CourseKeyField
+
+log = logging.getLogger(__name__)
+
+
+class CourseOverview(models.Model):
+    """
+    Model for storing and caching basic information about a course.
+
+    Attribute and method names mirror those of CourseDescriptor, so that an
+    overview can stand in for a descriptor in code that only needs this
+    course-level metadata (e.g. the student dashboard).
+    """
+    # Course identification
+    id = CourseKeyField(db_index=True, primary_key=True, max_length=255)  # pylint: disable=invalid-name
+    display_name = models.TextField(null=True)
+    display_name_with_default = models.TextField()
+    display_number_with_default = models.TextField()
+    display_org_with_default = models.TextField()
+
+    # Start/end dates
+    start = models.DateTimeField(null=True)
+    end = models.DateTimeField(null=True)
+    advertised_start = models.TextField(null=True)
+
+    # URLs
+    course_image_url = models.TextField()
+    end_of_course_survey_url = models.TextField(null=True)
+
+    # Certification data
+    certificates_display_behavior = models.TextField(null=True)
+    certificates_show_before_end = models.BooleanField(default=False)
+    cert_name_short = models.TextField()
+    cert_name_long = models.TextField()
+    lowest_passing_grade = models.FloatField(null=True)
+
+    # Access and visibility, as used by courseware.access
+    visible_to_staff_only = models.BooleanField(default=False)
+    days_early_for_beta = models.FloatField(null=True)
+    mobile_available = models.BooleanField(default=False)
+    catalog_visibility = models.TextField(null=True)
+    ispublic = models.NullBooleanField()
+    invitation_only = models.BooleanField(default=False)
+
+    # Enrollment details
+    enrollment_start = models.DateTimeField(null=True)
+    enrollment_end = models.DateTimeField(null=True)
+    enrollment_domain = models.TextField(null=True)
+
+    @classmethod
+    def _create_from_course(cls, course):
+        """
+        Creates a CourseOverview object from a CourseDescriptor.
+
+        Does not touch the database, simply constructs and returns an overview
+        from the given course.
+        """
+        # Imported here because courseware is an LMS app, while this model is
+        # also loaded (for its invalidation receiver) in Studio.
+        from courseware.courses import course_image_url
+
+        return cls(
+            id=course.id,
+            display_name=course.display_name,
+            display_name_with_default=course.display_name_with_default,
+            display_number_with_default=course.display_number_with_default,
+            display_org_with_default=course.display_org_with_default,
+
+            start=course.start,
+            end=course.end,
+            advertised_start=course.advertised_start,
+
+            course_image_url=course_image_url(course),
+            end_of_course_survey_url=course.end_of_course_survey_url,
+
+            certificates_display_behavior=course.certificates_display_behavior,
+            certificates_show_before_end=course.certificates_show_before_end,
+            cert_name_short=course.cert_name_short,
+            cert_name_long=course.cert_name_long,
+            lowest_passing_grade=course.lowest_passing_grade,
+
+            visible_to_staff_only=course.visible_to_staff_only,
+            days_early_for_beta=course.days_early_for_beta,
+            mobile_available=course.mobile_available,
+            catalog_visibility=course.catalog_visibility,
+            ispublic=course.ispublic,
+            invitation_only=course.invitation_only,
+
+            enrollment_start=course.enrollment_start,
+            enrollment_end=course.enrollment_end,
+            enrollment_domain=course.enrollment_domain,
+        )
+
+    @classmethod
+    def _load_from_module_store(cls, course_key):
+        """
+        Load the course with course_key from the modulestore and return an
+        overview of it, saving it unless the course is XML-backed.
+
+        Returns None if the course does not exist or failed to load.
+        """
+        store = modulestore()
+        with store.bulk_operations(course_key):
+            course = store.get_course(course_key)
+            if course is None or isinstance(course, ErrorDescriptor):
+                return None
+            overview = cls._create_from_course(course)
+
+        # XML courses are held in memory and change only on deploy, when no
+        # publish signal is sent; build their overviews every time instead.
+        if store.get_modulestore_type(course_key) != ModuleStoreEnum.Type.xml:
+            try:
+                overview.save()
+            except IntegrityError:
+                # Another request created this overview first; ours is just as good.
+                log.info(u"CourseOverview for %s was created concurrently", course_key)
+        return overview
+
+    @classmethod
+    def get_from_id(cls, course_key):
+        """
+        Return a CourseOverview for the course with course_key, loading the
+        course from the modulestore if no overview has been stored yet.
+
+        Returns None if the course does not exist or failed to load.
+        """
+        try:
+            return cls.objects.get(id=course_key)
+        except cls.DoesNotExist:
+            return cls._load_from_module_store(course_key)
+
+    @classmethod
+    def get_from_ids(cls, course_keys):
+        """
+        Return a dict mapping each of course_keys to its CourseOverview, or to
+        None if the course does not exist or failed to load.
+
+        Stored overviews are fetched in a single query.
+        """
+        course_keys = list(course_keys)
+        overviews = {
+            overview.id: overview
+            for overview in cls.objects.filter(id__in=course_keys)
+        }
+        for course_key in course_keys:
+            if course_key not in overviews:
+                overviews[course_key] = cls._load_from_module_store(course_key)
+        return overviews
+
+    @property
+    def location(self):
+        """
+        Return the usage key of the course block, as access checks expect of a descriptor.
+        """
+        # Old-style course blocks are named after the course run
+        block_id = self.id.run if getattr(self.id, 'deprecated', False) else 'course'
+        return self.id.make_usage_key('course', block_id)
+
+    @property
+    def number(self):
+        """
+        Return the course number from the course key.
+        """
+        return self.id.course
+
+    @property
+    def org(self):
+        """
+        Return the organization from the course key.
+        """
+        return self.id.org
+
+    def has_started(self):
+        """
+        Returns True if the current time is after the course start date.
+        """
+        return datetime.now(UTC) > self.start
+
+    def has_ended(self):
+        """
+        Returns True if the current time is after the specified course end date.
+        Returns False if there is no end date specified.
+        """
+        return self.end is not None and datetime.now(UTC) > self.end
+
+    def may_certify(self):
+        """
+        Return True if it is acceptable to show the student a certificate download link
+        """
+        show_early = (
+            self.certificates_display_behavior in ('early_with_info', 'early_no_info') or
+            self.certificates_show_before_end
+        )
+        return show_early or self.has_ended()
+
+    @property
+    def start_date_is_still_default(self):
+        """
+        Checks if the start date set for the course is still default, i.e. .start has not been modified,
+        and .advertised_start has not been set.
+        """
+        return self.advertised_start is None and self.start == CourseFields.start.default
+
+    def start_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the desired text corresponding the course's start date and time in UTC.  Prefers .advertised_start,
+        then falls back to .start. See CourseDescriptor.start_datetime_text.
+        """
+        if self.advertised_start is not None:
+            try:
+                result = Date().from_json(self.advertised_start)
+            except ValueError:
+                result = None
+            if result is None:
+                return self.advertised_start.title()
+            when = result
+        elif self.start_date_is_still_default:
+            # Translators: TBD stands for 'To Be Determined' and is used when a course
+            # does not yet have an announced start date.
+            return ugettext('TBD')
+        else:
+            when = self.start
+
+        date_time = strftime_localized(when, format_string)
+        return date_time + u" UTC" if format_string == "DATE_TIME" else date_time
+
+    def end_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the end date or date_time for the course formatted as a string.
+
+        If the course does not have an end date set (course.end is None), an empty string will be returned.
+        """
+        if self.end is None:
+            return ''
+        date_time = strftime_localized(self.end, format_string)
+        return date_time if format_string == "SHORT_DATE" else date_time + u" UTC"
+
+
+@receiver(course_published)
+def _delete_course_overview(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Delete the stored overview of a course whose course-level block changed,
+    so that the next read rebuilds it from the modulestore.
+    """
+    CourseOverview.objects.filter(id=course_key).delete()
@@ -0,0 +1,60 @@
+"""
+Tests for the CourseOverview model.
+"""
+import datetime
+
+from mock import patch
+import pytz
+
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+from ..models import CourseOverview
+
+
+class CourseOverviewTestCase(ModuleStoreTestCase):
+    """
+    Tests for CourseOverview creation, reuse and invalidation.
+    """
+    def setUp(self):
+        super(CourseOverviewTestCase, self).setUp()
+        self.course = CourseFactory.create(
+            display_name="Test Course",
+            start=datetime.datetime(2014, 1, 1, tzinfo=pytz.UTC),
+            end=datetime.datetime(2015, 1, 1, tzinfo=pytz.UTC),
+            mobile_available=True,
+        )
+
+    def test_fields_match_course(self):
+        overview = CourseOverview.get_from_id(self.course.id)
+        for attribute in (
+                'id', 'location', 'display_name', 'display_name_with_default', 'display_number_with_default',
+                'display_org_with_default', 'number', 'org', 'start', 'end', 'advertised_start',
+                'cert_name_short', 'cert_name_long', 'lowest_passing_grade', 'mobile_available',
+                'start_date_is_still_default',
+        ):
+            self.assertEqual(getattr(self.course, attribute), getattr(overview, attribute))
+        for method in ('has_started', 'has_ended', 'may_certify'):
+            self.assertEqual(getattr(self.course, method)(), getattr(overview, method)())
+
+    def test_stored_overview_is_reused(self):
+        CourseOverview.get_from_id(self.course.id)
+        with patch.object(CourseOverview, '_create_from_course') as mock_create:
+            overview = CourseOverview.get_from_id(self.course.id)
+        self.assertFalse(mock_create.called)
+        self.assertEqual(overview.display_name, "Test Course")
+
+    def test_get_from_ids(self):
+        missing_key = SlashSeparatedCourseKey('no', 'such', 'course')
+        overviews = CourseOverview.get_from_ids([self.course.id, missing_key])
+        self.assertEqual(overviews[self.course.id].id, self.course.id)
+        self.assertIsNone(overviews[missing_key])
+
+    def test_course_update_invalidates_overview(self):
+        CourseOverview.get_from_id(self.course.id)
+        self.course.display_name = "Renamed Course"
+        self.update_course(self.course, self.user.id)
+
+        self.assertFalse(CourseOverview.objects.filter(id=self.course.id).exists())
+        self.assertEqual(CourseOverview.get_from_id(self.course.id).display_name, "Renamed Course")
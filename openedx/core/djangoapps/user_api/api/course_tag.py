@@ -14,6 +14,34 @@ from ..models import UserCourseTag
 # global tags (e.g. using the existing UserPreferences table))
 COURSE_SCOPE = 'course'
 
+# Number of users whose tags are looked up per query by get_course_tags_for_users.
+COURSE_TAGS_FOR_USERS_BATCH_SIZE = 500
+
+
+def get_course_tags(user, course_id):
+    """
+    Gets all of the user's course tags in the specified course_id.
+
+    The tags are fetched in a single query and kept on the user object, so that
+    later lookups made with the same object (typically for the rest of the
+    request) don't touch the database.
+
+    Args:
+        user: the User object for the course tags
+        course_id: course identifier (string)
+
+    Returns:
+        dict mapping keys to string values
+    """
+    cached_tags = getattr(user, '_course_tags', None)
+    if cached_tags is None:
+        cached_tags = user._course_tags = {}  # pylint: disable=protected-access
+    if course_id not in cached_tags:
+        cached_tags[course_id] = dict(
+            UserCourseTag.objects.filter(user=user, course_id=course_id).values_list('key', 'value')
+        )
+    return cached_tags[course_id]
+
 
 def get_course_tag(user, course_id, key):
     """
@@ -28,15 +56,30 @@ def get_course_tag(user, course_id, key):
     Returns:
         string value, or None if there is no value saved
     """
-    try:
-        record = UserCourseTag.objects.get(
-            user=user,
-            course_id=course_id,
-            key=key)
+    return get_course_tags(user, course_id).get(key)
+
+
+def get_course_tags_for_users(course_id, key, user_ids):
+    """
+    Gets the value of the course tag for the specified key in the specified
+    course_id for many users at once.
 
-        return record.value
-    except UserCourseTag.DoesNotExist:
-        return None
+    Args:
+        course_id: course identifier (string)
+        key: arbitrary (<=255 char string)
+        user_ids: the ids of the users to look up
+
+    Returns:
+        dict mapping user ids to string values.  Users without a value saved
+        are left out.
+    """
+    user_ids = list(user_ids)
+    records = UserCourseTag.objects.filter(course_id=course_id, key=key)
+    values_by_user_id = {}
+    for start in xrange(0, len(user_ids), COURSE_TAGS_FOR_USERS_BATCH_SIZE):
+        batch = records.filter(user__in=user_ids[start:start + COURSE_TAGS_FOR_USERS_BATCH_SIZE])
+        values_by_user_id.update(batch.values_list('user_id', 'value'))
+    return values_by_user_id
 
 
 def set_course_tag(user, course_id, key, value):
@@ -53,15 +96,40 @@ def set_course_tag(user, course_id, key, value):
         key: arbitrary (<=255 char string)
         value: arbitrary string
     """
+    set_course_tags(user, course_id, {key: value})
+
+
+def set_course_tags(user, course_id, tags):
+    """
+    Sets the values of the user's course tags for each of the keys in the tags
+    dict in the specified course_id, creating any missing tags in a single
+    query.  Overwrites any previous values.
+
+    Args:
+        user: the User object
+        course_id: course identifier (string)
+        tags: dict mapping keys (<=255 char strings) to arbitrary strings
+    """
     # pylint: disable=fixme
     # TODO: There is a risk of IntegrityErrors being thrown here given
     # simultaneous calls from many processes. Handle by retrying after
     # a short delay?
 
-    record, _ = UserCourseTag.objects.get_or_create(
-        user=user,
-        course_id=course_id,
-        key=key)
+    existing = {
+        record.key: record
+        for record in UserCourseTag.objects.filter(user=user, course_id=course_id, key__in=tags.keys())
+    }
+    created = []
+    for key, value in tags.iteritems():
+        record = existing.get(key)
+        if record is None:
+            created.append(UserCourseTag(user=user, course_id=course_id, key=key, value=value))
+        elif record.value != value:
+            record.value = value
+            record.save()
+    if created:
+        UserCourseTag.objects.bulk_create(created)
 
-    record.value = value
-    record.save()
+    cached_tags = getattr(user, '_course_tags', {})
+    if course_id in cached_tags:
+        cached_tags[course_id].update(tags)
@@ -164,8 +164,7 @@ def update_preferences(username, **kwargs):
     except User.DoesNotExist:
         raise ProfileUserNotFound
     else:
-        for key, value in kwargs.iteritems():
-            UserPreference.set_preference(user, key, value)
+        UserPreference.set_preferences(user, kwargs)
 
 
 @intercept_errors(ProfileInternalError, ignore_errors=[ProfileRequestError])
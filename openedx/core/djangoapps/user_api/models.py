@@ -13,6 +13,10 @@ from xmodule_django.models import CourseKeyField
 # create an alias in "user_api".
 from student.models import UserProfile, Registration, PendingEmailChange  # pylint: disable=unused-import
 
+# Number of users whose preferences are looked up per query by
+# UserPreference.get_preferences_for_users.
+PREFERENCES_FOR_USERS_BATCH_SIZE = 500
+
 
 class UserPreference(models.Model):
     """A user's preference, stored as generic text to be processed by client"""
@@ -29,9 +33,32 @@ class UserPreference(models.Model):
         """
         Sets the user preference for a given key
         """
-        user_pref, _ = cls.objects.get_or_create(user=user, key=preference_key)
-        user_pref.value = preference_value
-        user_pref.save()
+        cls.set_preferences(user, {preference_key: preference_value})
+
+    @classmethod
+    def set_preferences(cls, user, preferences):
+        """
+        Sets the user preferences for each of the keys in the preferences dict,
+        creating any missing preferences in a single query.
+        """
+        existing = {
+            user_pref.key: user_pref
+            for user_pref in cls.objects.filter(user=user, key__in=preferences.keys())
+        }
+        created = []
+        for preference_key, preference_value in preferences.iteritems():
+            user_pref = existing.get(preference_key)
+            if user_pref is None:
+                created.append(cls(user=user, key=preference_key, value=preference_value))
+            elif user_pref.value != preference_value:
+                user_pref.value = preference_value
+                user_pref.save()
+        if created:
+            cls.objects.bulk_create(created)
+
+        cached_preferences = getattr(user, '_user_preferences', None)
+        if cached_preferences is not None:
+            cached_preferences.update(preferences)
 
     @classmethod
     def get_preference(cls, user, preference_key, default=None):
@@ -40,12 +67,44 @@ class UserPreference(models.Model):
 
         Returns the given default if there isn't a preference for the given key
         """
+        return cls.get_all_preferences(user).get(preference_key, default)
+
+    @classmethod
+    def get_all_preferences(cls, user):
+        """
+        Gets a dict of all of the user's preference values, keyed by preference key
 
-        try:
-            user_pref = cls.objects.get(user=user, key=preference_key)
-            return user_pref.value
-        except cls.DoesNotExist:
-            return default
+        The preferences are fetched in a single query and kept on the user object,
+        so that later lookups made with the same object (typically for the rest
+        of the request) don't touch the database.
+        """
+        cached_preferences = getattr(user, '_user_preferences', None)
+        if cached_preferences is None:
+            cached_preferences = dict(cls.objects.filter(user=user).values_list('key', 'value'))
+            user._user_preferences = cached_preferences  # pylint: disable=protected-access
+        return cached_preferences
+
+    @classmethod
+    def get_preferences_for_users(cls, user_ids, preference_keys=None):
+        """
+        Gets the preference values of many users at once
+
+        If preference_keys is given, only preferences with those keys are returned.
+
+        Returns a dict mapping user ids to dicts of preference values keyed by
+        preference key.  Users without any of the preferences are left out.
+        """
+        user_ids = list(user_ids)
+        user_prefs = cls.objects.all()
+        if preference_keys is not None:
+            user_prefs = user_prefs.filter(key__in=preference_keys)
+
+        preferences_by_user_id = {}
+        for start in xrange(0, len(user_ids), PREFERENCES_FOR_USERS_BATCH_SIZE):
+            batch = user_prefs.filter(user__in=user_ids[start:start + PREFERENCES_FOR_USERS_BATCH_SIZE])
+            for user_id, preference_key, preference_value in batch.values_list('user_id', 'key', 'value'):
+                preferences_by_user_id.setdefault(user_id, {})[preference_key] = preference_value
+        return preferences_by_user_id
 
 
 class UserCourseTag(models.Model):
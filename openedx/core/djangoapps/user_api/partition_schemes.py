@@ -53,6 +53,26 @@ class RandomUserPartitionScheme(object):
 
         return group
 
+    @classmethod
+    def get_groups_for_users(cls, course_id, users, user_partition):
+        """
+        Returns a dict mapping the ids of the specified users to the groups of the
+        specified user partition to which they are assigned, looking all of the
+        users up at once.
+
+        Unlike get_group_for_user, users who have not yet been assigned (or whose
+        group no longer exists) are left out rather than assigned to a group.
+        """
+        group_ids = course_tag_api.get_course_tags_for_users(
+            course_id, cls._key_for_partition(user_partition), [user.id for user in users]
+        )
+        groups = {}
+        for user_id, group_id in group_ids.iteritems():
+            group = user_partition.get_group(int(group_id))
+            if group is not None:
+                groups[user_id] = group
+        return groups
+
     @classmethod
     def _key_for_partition(cls, user_partition):
         """
@@ -1,6 +1,7 @@
 """
 Test the user course tag API.
 """
+from django.contrib.auth.models import User
 from django.test import TestCase
 
 from student.tests.factories import UserFactory
@@ -33,3 +34,39 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_course_tags_fetched_once(self):
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(self.user, self.course_id, 'other_key', 'other_value')
+
+        # all of the user's tags in the course are fetched together, then reused
+        user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(course_tag_api.get_course_tag(user, self.course_id, self.test_key), 'value')
+            self.assertEqual(course_tag_api.get_course_tag(user, self.course_id, 'other_key'), 'other_value')
+            self.assertIsNone(course_tag_api.get_course_tag(user, self.course_id, 'missing_key'))
+
+        # setting a tag keeps the fetched tags up to date
+        course_tag_api.set_course_tag(user, self.course_id, 'missing_key', 'new_value')
+        with self.assertNumQueries(0):
+            self.assertEqual(course_tag_api.get_course_tag(user, self.course_id, 'missing_key'), 'new_value')
+
+    def test_get_course_tags_for_users(self):
+        other_user = UserFactory.create()
+        untagged_user = UserFactory.create()
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(other_user, self.course_id, self.test_key, 'other_value')
+        course_tag_api.set_course_tag(untagged_user, self.course_id, 'other_key', 'value')
+
+        with self.assertNumQueries(1):
+            values = course_tag_api.get_course_tags_for_users(
+                self.course_id, self.test_key, [self.user.id, other_user.id, untagged_user.id]
+            )
+        self.assertEqual(values, {self.user.id: 'value', other_user.id: 'other_value'})
+
+    def test_set_course_tags(self):
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tags(self.user, self.course_id, {self.test_key: 'value2', 'other_key': 'other_value'})
+
+        self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, self.test_key), 'value2')
+        self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, 'other_key'), 'other_value')
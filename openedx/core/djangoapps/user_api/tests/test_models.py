@@ -1,3 +1,4 @@
+from django.contrib.auth.models import User
 from django.db import IntegrityError
 from django.test import TestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -84,3 +85,41 @@ class UserPreferenceModelTest(TestCase):
         # get preference for key that doesn't exist for user
         pref = UserPreference.get_preference(user, 'testkey_none')
         self.assertIsNone(pref)
+
+    def test_preferences_fetched_once(self):
+        user = UserFactory.create()
+        UserPreference.set_preferences(user, {'testkey0': 'value0', 'testkey1': 'value1'})
+
+        # all of the user's preferences are fetched together, then reused
+        user = User.objects.get(id=user.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(UserPreference.get_preference(user, 'testkey0'), 'value0')
+            self.assertEqual(UserPreference.get_preference(user, 'testkey1'), 'value1')
+            self.assertEqual(UserPreference.get_preference(user, 'testkey_none', 'default'), 'default')
+
+        # setting preferences keeps the fetched preferences up to date
+        UserPreference.set_preferences(user, {'testkey1': 'new_value1', 'testkey2': 'value2'})
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                UserPreference.get_all_preferences(user),
+                {'testkey0': 'value0', 'testkey1': 'new_value1', 'testkey2': 'value2'}
+            )
+        self.assertEqual(
+            dict(UserPreference.objects.filter(user=user).values_list('key', 'value')),
+            {'testkey0': 'value0', 'testkey1': 'new_value1', 'testkey2': 'value2'}
+        )
+
+    def test_get_preferences_for_users(self):
+        user, other_user, unset_user = [UserFactory.create() for __ in range(3)]
+        UserPreference.set_preferences(user, {'testkey0': 'value0', 'testkey1': 'value1'})
+        UserPreference.set_preference(other_user, 'testkey1', 'other_value1')
+
+        with self.assertNumQueries(1):
+            preferences = UserPreference.get_preferences_for_users([user.id, other_user.id, unset_user.id])
+        self.assertEqual(preferences, {
+            user.id: {'testkey0': 'value0', 'testkey1': 'value1'},
+            other_user.id: {'testkey1': 'other_value1'},
+        })
+
+        preferences = UserPreference.get_preferences_for_users([user.id, other_user.id], ['testkey0'])
+        self.assertEqual(preferences, {user.id: {'testkey0': 'value0'}})
@@ -26,6 +26,11 @@ class MemoryCourseTagAPI(object):
         """Gets the value of ``key``"""
         self._tags[course_id][key] = value
 
+    def get_course_tags_for_users(self, course_id, key, user_ids):
+        """Gets the value of ``key`` for each of ``user_ids``"""
+        value = self._tags[course_id].get(key)
+        return {} if value is None else {user_id: value for user_id in user_ids}
+
 
 class TestRandomUserPartitionScheme(PartitionTestCase):
     """
@@ -58,6 +63,15 @@ class TestRandomUserPartitionScheme(PartitionTestCase):
             group2_id = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
             self.assertEqual(group1_id, group2_id)
 
+    def test_get_groups_for_users(self):
+        # nobody has been assigned yet, and the batch lookup doesn't assign anyone
+        groups = RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, [self.user], self.user_partition)
+        self.assertEqual(groups, {})
+
+        group = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
+        groups = RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, [self.user], self.user_partition)
+        self.assertEqual(groups, {self.user.id: group})
+
     def test_empty_partition(self):
         empty_partition = UserPartition(
             self.TEST_ID,